@@ -2,7 +2,9 @@ from application.exceptions.exceptions import (
     ApplicationLayerException,
     ChatCreationDeniedException,
     ChatUpdatingDeniedException,
+    InvalidCursorException,
     MessagesRetrievalDeniedException,
+    ProfileUpdateJobRetrievalDeniedException,
     UserInfoServiceUnavailableException,
     UserResponseInvalidException,
 )
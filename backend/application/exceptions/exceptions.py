@@ -43,3 +43,17 @@ class ChatUpdatingDeniedException(ApplicationLayerException):
     This exception is raisen if the requesting user is not the user
     whos information is being updated.
     """
+
+
+class InvalidCursorException(ApplicationLayerException):
+    """
+    This exception is raisen if a pagination cursor provided by a user
+    was not issued by this service.
+    """
+
+
+class ProfileUpdateJobRetrievalDeniedException(ApplicationLayerException):
+    """
+    This exception is raisen if a user requests the progress of a profile
+    update job that does not exist or was not started by such user.
+    """
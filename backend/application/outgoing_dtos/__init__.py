@@ -1 +1,3 @@
+from application.outgoing_dtos.chats import OutgoingChatsDTO
 from application.outgoing_dtos.messages import OutgoingMessagesDTO
+from application.outgoing_dtos.processed_message import ProcessedMessageDTO
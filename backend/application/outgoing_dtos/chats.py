@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class OutgoingChatsDTO:
+    """
+    A data transfer object representing a page of chats returned to the client.
+
+    The chats are ordered by their latest activity, the most recent first.
+
+    Attributes:
+        chats (list):
+            A list of chat representations that are ready to be sent to the client.
+
+        cursor (str):
+            The opaque position of the last chat in the current page. Used as
+            a pagination cursor to fetch the next page.
+
+        next_chats_exist (bool):
+            A flag that indicates whether there are chats after the ones
+            included in this page.
+    """
+    chats: list
+    cursor: str
+    next_chats_exist: bool
@@ -8,8 +8,8 @@ class OutgoingMessagesDTO:
 
     This DTO is used by the application layer to send formatted message data
     to the transport layer (e.g., WebSocket or HTTP handler). It contains the
-    list of messages, the cursor for pagination, and a flag indicating whether
-    older messages exist.
+    list of messages, the cursor for pagination, and the flags indicating whether
+    older and newer messages exist.
 
     Attributes:
         messages (list): 
@@ -17,13 +17,18 @@ class OutgoingMessagesDTO:
             to be sent to the client.
 
         cursor (str): 
-            The identifier of the latest message in the current batch. Used as
-            a pagination cursor to fetch earlier messages.
+            The identifier of the last message in the current batch. Used as
+            a pagination cursor to fetch the next batch in the same direction.
 
         previous_messages_exist (bool): 
             A flag that indicates whether there are messages older than the ones
             included in this batch.
+
+        next_messages_exist (bool):
+            A flag that indicates whether there are messages newer than the ones
+            included in this batch.
     """
     messages: list
     cursor: str
     previous_messages_exist: bool
+    next_messages_exist: bool
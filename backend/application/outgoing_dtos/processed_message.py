@@ -0,0 +1,30 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class ProcessedMessageDTO:
+    """
+    A data transfer object representing the outcome of the processing of a single message.
+
+    This DTO is used by the application layer to report back to the infrastructure
+    layer what has happened to a message, so that the incoming message can be
+    acknowledged only after its outcome has been safely handed over.
+
+    Attributes:
+        client_message_id (str):
+            The client-generated unique message ID of the processed message.
+
+        status (str):
+            The final status of the message (e.g., DELIVERED or REJECTED).
+
+        reject_reason (str | None):
+            The reason why the message was rejected, if it was.
+
+        delivered (bool):
+            A flag that indicates whether the outcome of the message was confirmed
+            by the broker and the message may be acknowledged.
+    """
+    client_message_id: str
+    status: str
+    reject_reason: str | None
+    delivered: bool
@@ -1,4 +1,7 @@
 from application.ports.chats_repository import ChatRepositoryPort
 from application.ports.get_users_info import GetUsersInfoPort
 from application.ports.messages_repository import MessagesRepositoryPort
+from application.ports.profile_update_jobs_repository import ProfileUpdateJobsRepositoryPort
+from application.ports.projections import CHAT_MEMBERSHIP_PROJECTION
 from application.ports.rabbitmq_manager import RabbitMQManagerPort
+from application.ports.users_repository import UsersRepositoryPort
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import AsyncIterator
 
 
 class ChatRepositoryPort(ABC):
@@ -15,7 +16,8 @@ class ChatRepositoryPort(ABC):
         """
         Retrieve a chat matching the given query or create a new one if it does not exist.
 
-        Args query (dict): A dictionary containing the search filter and update parameters.
+        Args:
+            query (dict): A dictionary containing the search filter and update parameters.
 
         Returns:
             dict: A dictionary representation of the chat that was found or created.
@@ -23,49 +25,123 @@ class ChatRepositoryPort(ABC):
         ...
 
     @abstractmethod
-    async def update_id(self, _id: str) -> None:
+    async def get_chat(self, id: str, projection: dict | None = None) -> dict | None:
         """
-        Assign the string identifier 'id' to an existing chat document.
+        Fetch a chat by its string identifier.
+
+        Args:
+            id (str): The identifier of the chat.
+            projection (dict | None): The fields of the chat to fetch, the whole document if omitted.
 
-        Args _id (str): The database-generated ObjectId (as a string) that should be copied
-                        into the 'id' field of the chat document.
+        Returns:
+            dict | None: The chat document if found, otherwise None.
         """
         ...
 
     @abstractmethod
-    async def get_chat(self, id: str) -> dict | None:
+    async def get_chats_by_ids(self, ids: list, projection: dict | None = None) -> list:
         """
-        Fetch a chat by its string identifier.
+        Fetch several chats by their string identifiers.
+
+        Args:
+            ids (list): The identifiers of the chats.
+            projection (dict | None): The fields of the chats to fetch, the whole documents if omitted.
+
+        Returns:
+            list: The chat documents that were found, the missing ones are skipped.
+        """
+        ...
+
+    @abstractmethod
+    async def get_chats(self, filters: dict, limit: int, projection: dict | None = None) -> list:
+        """
+        Retrieve up to limit chats that match the given filter criteria, the most recently active first.
+
+        The chats with the same last_activity_at are ordered by their ids descending,
+        so the order is stable for the keyset pagination.
+
+        Args:
+            filters (dict): A dictionary of filtering options (e.g., related user IDs).
+            limit (int): The maximum amount of chats to retrieve.
+            projection (dict | None): The fields of the chats to fetch, the whole documents if omitted.
+
+        Returns:
+            list: A list of chat documents matching the filter.
+        """
+        ...
 
-        Args id (str): The identifier of the chat.
+    @abstractmethod
+    def stream_chats(self, filters: dict, projection: dict | None = None) -> AsyncIterator[dict]:
+        """
+        Iterate over all the chats that match the given filter criteria in the order of get_chats.
+
+        The chats are fetched lazily, so the whole result set is never held in memory.
+
+        Args:
+            filters (dict): A dictionary of filtering options (e.g., related user IDs).
+            projection (dict | None): The fields of the chats to fetch, the whole documents if omitted.
+
+        Returns:
+            AsyncIterator[dict]: The asynchronous iterator over the chat documents.
+        """
+        ...
+
+    @abstractmethod
+    async def increment_messages_count(self, id: str, last_message: dict, last_activity_at: str) -> None:
+        """
+        Atomically increment the messages_count of a chat and update its last message.
+
+        The last message is only replaced if the chat has not been active later.
 
-        Returns (dict | None): The chat document if found, otherwise None.
+        Args:
+            id (str): The identifier of the chat whose messages_count should be increased.
+            last_message (dict): The summary of the stored message.
+            last_activity_at (str): The delivery time of the stored message.
         """
         ...
 
     @abstractmethod
-    async def get_chats(self, filters: dict) -> list:
+    async def increment_messages_counts(self, counts: dict, last_messages: dict, last_activity_at: str) -> None:
         """
-        Retrieve a list of chats that match the given filter criteria.
+        Atomically increment the messages_count of several chats at once and update their last messages.
 
-        Args filters (dict): A dictionary of filtering options (e.g., related user IDs).
+        The last messages are only replaced if the chats have not been active later.
 
-        Returns list: A list of chat documents matching the filter.
+        Args:
+            counts (dict): A mapping of chat identifiers to the amount their messages_count should be increased by.
+            last_messages (dict): A mapping of chat identifiers to the summaries of their latest stored messages.
+            last_activity_at (str): The delivery time of the stored messages.
         """
         ...
 
     @abstractmethod
-    async def increment_messages_count(self, id: str) -> None:
+    async def get_related_chat_ids(self, user_id: int, after_id: str | None, limit: int) -> list:
         """
-        Atomically increment the messages_count of a chat.
+        Fetch the identifiers of the chats that the user is related to in ascending order.
 
-        Args id (str): The identifier of the chat whose messages_count should be increased.
+        Args:
+            user_id (int): The id of the user.
+            after_id (str | None): The identifier after which the chats are fetched, from the first one if omitted.
+            limit (int): The maximum amount of identifiers to fetch.
+
+        Returns:
+            list: The identifiers of the chats.
         """
         ...
 
     @abstractmethod
-    async def update_related_user(self, user_id: int, user_data: dict) -> None:
+    async def update_related_user(self, user_id: int, user_data: dict, chat_ids: list) -> int:
         """
-        Updates all chats that the user with the provided user_id is related to.
+        Update the profile of the user in the given chats that the user is related to.
+
+        Only the provided fields of the profile are updated.
+
+        Args:
+            user_id (int): The id of the user.
+            user_data (dict): The fields of the profile to update.
+            chat_ids (list): The identifiers of the chats to update.
+
+        Returns:
+            int: The amount of updated chats.
         """
         ...
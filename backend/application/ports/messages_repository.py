@@ -8,66 +8,86 @@ class MessagesRepositoryPort(ABC):
     This interface belongs to the application layer and abstracts away
     message-storage logic (MongoDB, SQL, etc.). The infrastructure layer
     must provide an implementation that satisfies this contract.
+
+    A stored message is pending until its chat has been updated with it and it
+    is marked as such, so that a redelivered message whose chat update has failed
+    is applied to its chat once more and a completed one is not.
     """
 
     @abstractmethod
-    async def message_exists(self, filters: dict) -> bool:
+    async def create_message(self, message: dict) -> bool:
         """
-        Check whether a message exists matching the given criteria.
+        Persist a new message unless a message with the same client_message_id is already stored.
+
+        The message is expected to carry its identifier already, so the
+        document is written once with both the database and the string ids set.
+        Deduplication is enforced by the storage, so no separate existence check is required.
 
         Args:
-            filters (dict): Filter parameters (e.g., sender_id, client_message_id).
+            message (dict): A dictionary containing message data.
 
         Returns:
-            bool: True if a matching message exists, otherwise False.
+            bool: True if the message was stored, False if it is a duplicate.
         """
         ...
 
     @abstractmethod
-    async def create_message(self, message: dict) -> str:
+    async def create_messages(self, messages: list) -> set:
         """
-        Persist a new message and return its identifier.
+        Persist a batch of new messages skipping the ones whose client_message_id is already stored.
+
+        The messages are expected to carry their identifiers already. A duplicate
+        does not prevent the rest of the batch from being stored.
 
         Args:
-            message (dict): A dictionary containing message data.
+            messages (list): A list of dictionaries containing message data.
 
         Returns:
-            str: The string identifier of the newly created message.
+            set: The positions of the messages in the provided list that were not stored as duplicates.
         """
         ...
 
     @abstractmethod
-    async def update_id(self, _id: str) -> dict | None:
+    async def get_stored_messages(self, client_message_ids: list) -> list:
         """
-        Set the string 'id' field of an existing message.
+        Fetch the stored messages by their client_message_ids.
 
         Args:
-            _id (str): The database-generated identifier to assign to the message.
+            client_message_ids (list): The client_message_ids of the messages.
+
+        Returns:
+            list: The stored messages along with their 'chat_updated' flags.
         """
         ...
 
     @abstractmethod
-    async def get_chat_messages(self, filters: dict) -> list:
+    async def mark_chats_updated(self, ids: list) -> None:
         """
-        Retrieve all messages for a chat using given filters.
+        Mark the stored messages as applied to their chats.
 
         Args:
-            filters (dict): Filter parameters for message retrieval.
-
-        Returns:
-            list: A list of message documents.
+            ids (list): The identifiers of the messages.
         """
         ...
 
     @abstractmethod
-    async def previous_messages_exist(self, _id: str) -> bool:
+    async def get_chat_messages(
+        self,
+        filters: dict,
+        limit: int,
+        ascending: bool = False,
+        projection: dict | None = None,
+    ) -> list:
         """
-        Check whether a message with _id older than provided exists.
+        Retrieve up to limit messages for a chat using given filters, newest first by default.
 
         Args:
-            _id (str): An _id of a message.
-        
+            filters (dict): Filter parameters for message retrieval.
+            limit (int): The maximum amount of messages to retrieve.
+            ascending (bool): Whether the messages should be sorted oldest first.
+            projection (dict | None): The fields of the messages to fetch, the whole documents if omitted.
+
         Returns:
-            bool: True if at least a single message exists and False otherwise.
+            list: A list of message documents.
         """
         ...
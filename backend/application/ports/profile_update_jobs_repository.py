@@ -0,0 +1,79 @@
+from abc import ABC, abstractmethod
+
+from domain.value_objects import ProfileUpdateJobStatus
+
+
+class ProfileUpdateJobsRepositoryPort(ABC):
+    """
+    The port that defines the persistence operations for the jobs
+    that propagate the profiles of users to their chats.
+
+    A job is processed by a single worker at a time. The worker holds a lease
+    on the job that is renewed with every recorded chunk, so a job whose worker
+    has stopped is claimed again once its lease expires and resumes after the
+    last recorded chat.
+    """
+
+    @abstractmethod
+    async def create_job(self, user_id: int, user_data: dict, status: str = ProfileUpdateJobStatus.PENDING) -> dict:
+        """
+        Create a job and supersede the unfinished jobs of the same user.
+
+        Args:
+            user_id (int): The id of the user whose profile is propagated.
+            user_data (dict): The profile of the user.
+            status (str): The initial status, a job that needs no processing is created as completed.
+
+        Returns:
+            dict: The created job.
+        """
+        ...
+
+    @abstractmethod
+    async def get_job(self, id: str) -> dict | None:
+        """
+        Fetch a job by its identifier.
+
+        Args:
+            id (str): The identifier of the job.
+
+        Returns:
+            dict | None: The job if found, otherwise None.
+        """
+        ...
+
+    @abstractmethod
+    async def claim_job(self) -> dict | None:
+        """
+        Claim a pending job or a running job whose lease has expired.
+
+        Returns:
+            dict | None: The claimed job with its lease_owner set, or None if there is nothing to claim.
+        """
+        ...
+
+    @abstractmethod
+    async def record_progress(self, job: dict, last_chat_id: str, updated_chats_count: int) -> bool:
+        """
+        Record a processed chunk of a claimed job and renew its lease.
+
+        Args:
+            job (dict): The claimed job.
+            last_chat_id (str): The identifier of the last processed chat.
+            updated_chats_count (int): The amount of chats that were updated in the chunk.
+
+        Returns:
+            bool: True if the lease is still held, False if the job was superseded or claimed by another worker.
+        """
+        ...
+
+    @abstractmethod
+    async def finish_job(self, job: dict, status: str) -> None:
+        """
+        Mark a claimed job as finished.
+
+        Args:
+            job (dict): The claimed job.
+            status (str): The final status of the job.
+        """
+        ...
@@ -0,0 +1,6 @@
+CHAT_MEMBERSHIP_PROJECTION = {'_id': 0, 'id': 1, 'related_users.id': 1}
+"""
+The projection of a chat that is sufficient for the permission checks.
+
+Only the ids of the related users are fetched, their profiles are left out.
+"""
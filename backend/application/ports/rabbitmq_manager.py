@@ -9,8 +9,29 @@ class RabbitMQManagerPort(ABC):
     """
 
     @abstractmethod
-    async def send_message(self, message_data: dict, routing_key: str) -> None:
+    async def send_message(self, message_data: dict) -> bool:
         """
         A method that allows to send a message to RabbitMQ exchange.
+
+        Args:
+            message_data (dict): A message in the form of a dictionary.
+
+        Returns:
+            bool: True if the message was confirmed by the broker.
+        """
+        ...
+
+    @abstractmethod
+    async def send_messages(self, messages_data: list) -> list:
+        """
+        A method that allows to send a batch of messages to RabbitMQ exchange.
+
+        The messages are sent in the provided order.
+
+        Args:
+            messages_data (list): A list of messages in the form of dictionaries.
+
+        Returns:
+            list: A flag for every message that is True if the message was confirmed by the broker.
         """
         ...
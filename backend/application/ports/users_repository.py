@@ -0,0 +1,44 @@
+from abc import ABC, abstractmethod
+
+
+class UsersRepositoryPort(ABC):
+    """
+    The port that defines the persistence operations for the profiles of users.
+
+    When the profiles are normalized the chats keep only the ids of their related
+    users and the profiles are stored once per user, so a profile update is a single write.
+    """
+
+    @abstractmethod
+    async def get_users(self, ids: list) -> list:
+        """
+        Fetch several profiles by the ids of their users.
+
+        Args:
+            ids (list): The ids of the users.
+
+        Returns:
+            list: The profiles that were found.
+        """
+        ...
+
+    @abstractmethod
+    async def save_users(self, users: list) -> None:
+        """
+        Store the profiles of the users that are not stored yet.
+
+        Args:
+            users (list): The profiles of the users.
+        """
+        ...
+
+    @abstractmethod
+    async def update_user(self, user_id: int, user_data: dict) -> None:
+        """
+        Update or store the profile of a user.
+
+        Args:
+            user_id (int): The id of the user.
+            user_data (dict): The profile of the user.
+        """
+        ...
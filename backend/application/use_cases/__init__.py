@@ -1,5 +1,9 @@
 from application.use_cases.create_chat import CreateChatUseCase
 from application.use_cases.get_chats import GetChatsUseCase
 from application.use_cases.get_messages import GetMessagesUseCase
+from application.use_cases.get_profile_update_job import GetProfileUpdateJobUseCase
+from application.use_cases.hydrate_related_users import HydrateRelatedUsersUseCase
 from application.use_cases.process_message import ProcessMessageUseCase
+from application.use_cases.process_messages_batch import ProcessMessagesBatchUseCase
+from application.use_cases.run_profile_update_job import RunProfileUpdateJobUseCase
 from application.use_cases.update_chat_related_user import UpdateChatUserUseCase
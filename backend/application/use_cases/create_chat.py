@@ -1,15 +1,20 @@
 from logging import getLogger
 
+from bson import ObjectId
+
 from settings import settings
 
 from application.exceptions import ChatCreationDeniedException
-from application.ports import ChatRepositoryPort, GetUsersInfoPort
+from application.ports import ChatRepositoryPort, GetUsersInfoPort, UsersRepositoryPort
 from domain.entities import Chat
 
 
 class CreateChatUseCase:
     """
     The use case to create a chat.
+
+    If the users repository is provided the profiles are normalized, they are
+    stored in the users repository and the chat keeps only the ids of its users.
     """
 
     def __init__(
@@ -18,6 +23,7 @@ class CreateChatUseCase:
         create_chat_data: dict,
         database_repo: ChatRepositoryPort,
         users_info_port: GetUsersInfoPort,
+        users_repo: UsersRepositoryPort | None = None,
     ) -> None:
         """
         Initialize the use case.
@@ -27,11 +33,13 @@ class CreateChatUseCase:
             create_chat_data (dict): The data that is required to create a chat.
             database_repo (ChatRepositoryPort): The port for chats collection database repository.
             users_info_port (GetUsersInfoPort): The port for the service that gets information about users.
+            users_repo (UsersRepositoryPort | None): The port for the profiles of users, None if the profiles are embedded.
         """
         self.user_id = user_id
         self.create_chat_data = create_chat_data
         self.database_repo = database_repo
         self.users_info_port = users_info_port
+        self.users_repo = users_repo
         self.logger = getLogger(settings.chats_logger_name)
 
     def enforce_permission_policy(self) -> None:
@@ -57,18 +65,20 @@ class CreateChatUseCase:
         """
         Prepare the query to get or create an instance of the Chat in MongoDB.
 
+        The chat is matched by the canonical key of its related users, which is
+        uniquely indexed, so the profiles of the users do not affect the match.
+        The ObjectId of a new chat is allocated on the client side so that
+        the document is inserted with both _id and id already set.
+
         Args:
             chat: An instance of Chat.
         Returns:
             dict: A prepared query to forward to the chats repository.
         """
-        related_users = sorted(chat.related_users, key=lambda related_user: related_user.get('id'))
-
         return {
-            'filter': {'related_users': related_users},
-            'update': {'$setOnInsert': chat.representation},
+            'filter': {'participants_key': chat.participants_key},
+            'update': {'$setOnInsert': {'_id': ObjectId(chat.id), **chat.representation}},
             'upsert': True,
-            'return_document': 2,
         }
         
     async def get_users_information(self) -> list:
@@ -78,6 +88,20 @@ class CreateChatUseCase:
         """
         return await self.users_info_port.execute(user_ids=self.create_chat_data.get('user_ids'))
 
+    async def normalize_related_users(self, related_users: list) -> list:
+        """
+        Store the profiles of the related users and keep only their ids.
+
+        Args:
+            related_users (list): The profiles of the users that are related to a chat.
+
+        Returns:
+            list: The related users reduced to their ids.
+        """
+        await self.users_repo.save_users(users=related_users)
+
+        return [{'id': related_user.get('id')} for related_user in related_users]
+
     async def execute(self) -> dict:
         """
         Chat creation executor.
@@ -93,15 +117,12 @@ class CreateChatUseCase:
 
         related_users = await self.get_users_information()
 
+        if self.users_repo is not None:
+            related_users = await self.normalize_related_users(related_users=related_users)
+
         chat_entity = Chat.create(related_users=related_users)
+        chat_entity.id = str(ObjectId())
 
         query = self.prepare_query(chat=chat_entity)
 
-        chat = await self.database_repo.get_or_create_chat(query=query)
-
-        if chat.get('id') is None:
-            _id = str(chat.get('_id'))
-            await self.database_repo.update_id(_id=_id)
-            chat.update({'id': _id})
-
-        return chat
+        return await self.database_repo.get_or_create_chat(query=query)
@@ -1,3 +1,13 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as DecodingError
+from json import dumps, loads
+from logging import getLogger
+from typing import AsyncIterator
+
+from settings import settings
+
+from application.exceptions import InvalidCursorException
+from application.outgoing_dtos import OutgoingChatsDTO
 from application.ports import ChatRepositoryPort
 
 
@@ -7,31 +17,150 @@ class GetChatsUseCase:
 
     This use case is responsible for retrieving the chats
     that the requesting user is related to.
+
+    Keyset pagination is implemented. The chats are ordered by their last_activity_at
+    and their ids, both descending, and the cursor holds both values of the last
+    chat of a page. The chats that have no last_activity_at are ordered last.
     """
 
-    def __init__(self, user_id: int, database_repo: ChatRepositoryPort) -> None:
+    def __init__(
+        self,
+        user_id: int,
+        database_repo: ChatRepositoryPort,
+        cursor: str | None = None,
+        limit: int = settings.chats_limit,
+        projection: dict | None = None,
+    ) -> None:
         """
         Initialize the use case.
 
         Args:
             user_id (int): The id of a user.
             database_repo (ChatRepositoryPort): The port for chats collection database repository.
+            cursor (str | None): The cursor of the previous page.
+            limit (int): The maximum amount of chats in a page.
+            projection (dict | None): The fields of the chats to fetch, 'id' and 'last_activity_at' must be included.
         """
         self.user_id = user_id
         self.database_repo = database_repo
+        self.cursor = cursor
+        self.limit = limit
+        self.projection = projection
+        self.logger = getLogger(settings.chats_logger_name)
 
-    async def execute(self) -> list:
+    async def execute(self) -> OutgoingChatsDTO:
         """
         Execute the retrieval process.
+
+        Returns:
+            OutgoingChatsDTO: The dataclass that presents the page in the appropriate format.
         """
         filters = await self.create_filters()
 
-        return await self.database_repo.get_chats(filters=filters)
-    
+        chats = await self.database_repo.get_chats(filters=filters, limit=self.limit + 1, projection=self.projection)
+
+        return self.make_outgoing_data(chats=chats)
+
+    async def stream(self) -> AsyncIterator[dict]:
+        """
+        Stream all the chats of the user after the cursor, if any, without pagination.
+
+        The cursor is validated right away, so an invalid cursor is reported
+        before the first chat is requested.
+
+        Returns:
+            AsyncIterator[dict]: The chats in the order of the pages.
+
+        Raises:
+            InvalidCursorException: Raisen if the cursor was not issued by encode_cursor.
+        """
+        filters = await self.create_filters()
+
+        return self.database_repo.stream_chats(filters=filters, projection=self.projection)
+
     async def create_filters(self) -> dict:
         """
         Create filters for the database query.
+
+        The chats after the cursor are either less recently active, or as recently active
+        with a lesser id, or have never been active.
         """
         filters = {'related_users.id': self.user_id, 'messages_count': {'$gt': 0}}
 
+        if self.cursor is not None:
+            last_activity_at, id = self.decode_cursor()
+
+            if last_activity_at is None:
+                filters.update({'last_activity_at': None, 'id': {'$lt': id}})
+            else:
+                filters.update({
+                    '$or': [
+                        {'last_activity_at': {'$lt': last_activity_at}},
+                        {'last_activity_at': last_activity_at, 'id': {'$lt': id}},
+                        {'last_activity_at': None},
+                    ],
+                })
+
         return filters
+
+    def encode_cursor(self, chat: dict) -> str:
+        """
+        Encode the position of a chat as an opaque cursor.
+
+        Args:
+            chat (dict): The last chat of a page.
+
+        Returns:
+            str: The cursor.
+        """
+        position = dumps([chat.get('last_activity_at'), chat.get('id')], separators=(',', ':'))
+        return urlsafe_b64encode(position.encode('utf-8')).decode('ascii')
+
+    def decode_cursor(self) -> tuple:
+        """
+        Decode the cursor provided by the user.
+
+        Returns:
+            tuple: The last_activity_at and the id of the last chat of the previous page.
+
+        Raises:
+            InvalidCursorException: Raisen if the cursor was not issued by encode_cursor.
+        """
+        try:
+            last_activity_at, id = loads(urlsafe_b64decode(self.cursor.encode('ascii')))
+        except (DecodingError, UnicodeError, ValueError, TypeError):
+            last_activity_at, id = None, None
+
+        if not isinstance(id, str) or not isinstance(last_activity_at, str | None):
+            self.logger.error(
+                'An attempt to retrieve chats with an invalid cursor.',
+                extra={'user_id': self.user_id, 'event_type': 'Chats requested with invalid cursor.'},
+            )
+            raise InvalidCursorException(
+                title='Chats retrieval is denied.',
+                details={'Pagination error': 'The cursor is invalid.'},
+            )
+
+        return last_activity_at, id
+
+    def make_outgoing_data(self, chats: list) -> OutgoingChatsDTO:
+        """
+        Prepare the outgoing data.
+
+        The chats are fetched with a single extra chat beyond the page,
+        its presence means that more chats exist and it is dropped from the page.
+
+        Args:
+            chats (list): Up to limit + 1 chats of the user.
+
+        Returns:
+            OutgoingChatsDTO: The dataclass that presents the page in the appropriate format.
+        """
+        next_chats_exist = len(chats) > self.limit
+        chats = chats[:self.limit]
+
+        return OutgoingChatsDTO(
+            chats=chats,
+            cursor=self.encode_cursor(chat=chats[-1]) if chats else '',
+            next_chats_exist=next_chats_exist,
+        )
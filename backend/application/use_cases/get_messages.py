@@ -1,11 +1,13 @@
-from bson import ObjectId
 from logging import getLogger
 
+from bson import ObjectId
+
 from settings import settings
 
 from application.exceptions import MessagesRetrievalDeniedException
 from application.outgoing_dtos import OutgoingMessagesDTO
-from application.ports import ChatRepositoryPort, MessagesRepositoryPort
+from application.ports import CHAT_MEMBERSHIP_PROJECTION, ChatRepositoryPort, MessagesRepositoryPort
+from domain.value_objects import PaginationDirection
 
 
 class GetMessagesUseCase:
@@ -20,6 +22,9 @@ class GetMessagesUseCase:
         cursor: str,
         chats_repo: ChatRepositoryPort, 
         messages_repo: MessagesRepositoryPort,
+        limit: int = settings.messages_limit,
+        direction: PaginationDirection = PaginationDirection.BEFORE,
+        projection: dict | None = None,
     ) -> None:
         """
         Initialize the use case.
@@ -30,12 +35,18 @@ class GetMessagesUseCase:
             cursor (str | None): An id of a messaget that is used as a filter.
             chats_repo (ChatRepositoryPort): The port for chats collection database repository.
             messages_repo (MessagesRepositoryPort): The port for messages collection database repository.
+            limit (int): The maximum amount of messages in a page.
+            direction (PaginationDirection): Whether the messages older or newer than the cursor are requested.
+            projection (dict | None): The fields of the messages to fetch, the string 'id' must be included.
         """
         self.chat_id = chat_id
         self.user_id = user_id
         self.cursor = cursor
         self.chats_repo = chats_repo
         self.messages_repo = messages_repo
+        self.limit = limit
+        self.direction = direction
+        self.projection = projection
         self.logger = getLogger(settings.chats_logger_name)
 
     def make_filters(self) -> dict:
@@ -54,7 +65,8 @@ class GetMessagesUseCase:
         }
 
         if self.cursor is not None:
-            filters.update({'_id': {'$lt': ObjectId(self.cursor)}})
+            operator = '$lt' if self.direction == PaginationDirection.BEFORE else '$gt'
+            filters.update({'_id': {operator: ObjectId(self.cursor)}})
 
         return filters
         
@@ -63,9 +75,10 @@ class GetMessagesUseCase:
         Enforce the authorization.
 
         If the requesting user is not related to the requested chat - deny messages retrieval.
+        Only the ids of the related users are fetched.
         """
-        requested_chat = await self.chats_repo.get_chat(id=self.chat_id)
-        related_users = requested_chat and requested_chat.get('related_users')
+        requested_chat = await self.chats_repo.get_chat(id=self.chat_id, projection=CHAT_MEMBERSHIP_PROJECTION)
+        related_users = requested_chat and requested_chat.get('related_users') or []
 
         if not any({related_user.get('id') == self.user_id for related_user in related_users}):
             self.logger.error(
@@ -77,7 +90,7 @@ class GetMessagesUseCase:
                 details={'Authorization error': 'You are not permitted to retrieve the messages of this chat.'},
             )
         
-    async def make_outgoing_data(self, messages: list) -> OutgoingMessagesDTO:
+    def make_outgoing_data(self, messages: list) -> OutgoingMessagesDTO:
         """
         Prepare the outgoing data.
 
@@ -85,16 +98,32 @@ class GetMessagesUseCase:
         The outgoing data should contain the cursor and the flag
         that is used to check if there are more messages in the requested chat.
 
+        The messages before the cursor are returned newest first and the messages
+        after the cursor are returned oldest first, so the cursor is always the last
+        message of the page. The messages are fetched with a single extra message
+        beyond the page, its presence means that more messages exist in the requested
+        direction and it is dropped from the page. The cursor message itself proves
+        that messages exist in the opposite direction.
+
         Args:
-            messages (list): A list of messages that belong to the requested chat.
+            messages (list): Up to limit + 1 messages that belong to the requested chat.
 
         Returns:
             OutfoinfMessagesDTO: The dataclass that presents the data in the appropriate format.
         """
+        more_messages_exist = len(messages) > self.limit
+        messages = messages[:self.limit]
+
+        if self.direction == PaginationDirection.BEFORE:
+            previous_messages_exist, next_messages_exist = more_messages_exist, self.cursor is not None
+        else:
+            previous_messages_exist, next_messages_exist = self.cursor is not None, more_messages_exist
+
         messages_data = {
             'messages': messages,
             'cursor': '',
-            'previous_messages_exist': False,
+            'previous_messages_exist': previous_messages_exist,
+            'next_messages_exist': next_messages_exist,
         }
 
         try:
@@ -102,10 +131,9 @@ class GetMessagesUseCase:
         except IndexError:
             return OutgoingMessagesDTO(**messages_data)
         else:
-            cursor = str(latest_message.get('_id'))
-            previous_messages_exist = await self.messages_repo.previous_messages_exist(_id=cursor)
+            cursor = latest_message.get('id')
 
-            messages_data.update({'cursor': cursor, 'previous_messages_exist': previous_messages_exist})
+            messages_data.update({'cursor': cursor})
 
             return OutgoingMessagesDTO(**messages_data)
 
@@ -123,6 +151,11 @@ class GetMessagesUseCase:
 
         filters = self.make_filters()
 
-        messages = await self.messages_repo.get_chat_messages(filters=filters)
+        messages = await self.messages_repo.get_chat_messages(
+            filters=filters,
+            limit=self.limit + 1,
+            ascending=self.direction == PaginationDirection.AFTER,
+            projection=self.projection,
+        )
 
-        return await self.make_outgoing_data(messages=messages)
+        return self.make_outgoing_data(messages=messages)
@@ -0,0 +1,51 @@
+from logging import getLogger
+
+from settings import settings
+
+from application.exceptions import ProfileUpdateJobRetrievalDeniedException
+from application.ports import ProfileUpdateJobsRepositoryPort
+
+
+class GetProfileUpdateJobUseCase:
+    """
+    The use case that retrieves the progress of a profile update job.
+    """
+
+    def __init__(self, job_id: str, user_id: int, jobs_repo: ProfileUpdateJobsRepositoryPort) -> None:
+        """
+        Initialize the use case.
+
+        Args:
+            job_id (str): The id of the job.
+            user_id (int): The id of requesting user.
+            jobs_repo (ProfileUpdateJobsRepositoryPort): The port that defines operations with the profile update jobs.
+        """
+        self.job_id = job_id
+        self.user_id = user_id
+        self.jobs_repo = jobs_repo
+        self.logger = getLogger(settings.chats_logger_name)
+
+    async def execute(self) -> dict:
+        """
+        Execute the retrieval process.
+
+        Returns:
+            dict: The requested job.
+
+        Raises:
+            ProfileUpdateJobRetrievalDeniedException: Raisen if the job does not exist
+            or was not started by the requesting user.
+        """
+        job = await self.jobs_repo.get_job(id=self.job_id)
+
+        if job is None or job.get('user_id') != self.user_id:
+            self.logger.error(
+                'A user attempted to retrieve a profile update job of another user.',
+                extra={'user_id': self.user_id, 'event_type': 'Profile update job requested by another user.'},
+            )
+            raise ProfileUpdateJobRetrievalDeniedException(
+                title='Profile update job retrieval is denied.',
+                details={'Authorization error': 'You are not permitted to retrieve such profile update job.'},
+            )
+
+        return job
@@ -0,0 +1,47 @@
+from application.ports import UsersRepositoryPort
+
+
+class HydrateRelatedUsersUseCase:
+    """
+    The use case that replaces the related users of chats by the stored profiles of such users.
+
+    The profiles of all the chats are fetched at once, so a page of chats costs
+    a single lookup and every chat of the page shares the profile object of a user.
+    A related user whose profile is not stored, e.g. of a chat that was created
+    before the profiles were normalized, is kept as it is embedded in the chat.
+    """
+
+    def __init__(self, chats: list, users_repo: UsersRepositoryPort) -> None:
+        """
+        Initialize the use case.
+
+        Args:
+            chats (list): The chats whose related users should be hydrated.
+            users_repo (UsersRepositoryPort): The port that defines operations with the profiles of users.
+        """
+        self.chats = chats
+        self.users_repo = users_repo
+
+    async def execute(self) -> list:
+        """
+        Execute the process.
+
+        Returns:
+            list: The chats with the profiles of their related users.
+        """
+        user_ids = [related_user.get('id') for chat in self.chats for related_user in chat.get('related_users', [])]
+
+        if not user_ids:
+            return self.chats
+
+        users = {user.get('id'): user for user in await self.users_repo.get_users(ids=user_ids)}
+
+        return [
+            {
+                **chat,
+                'related_users': [
+                    users.get(related_user.get('id'), related_user) for related_user in chat.get('related_users', [])
+                ],
+            }
+            for chat in self.chats
+        ]
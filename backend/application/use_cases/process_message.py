@@ -1,4 +1,12 @@
-from application.ports import ChatRepositoryPort, MessagesRepositoryPort, RabbitMQManagerPort
+from bson import ObjectId
+
+from application.outgoing_dtos import ProcessedMessageDTO
+from application.ports import (
+    CHAT_MEMBERSHIP_PROJECTION,
+    ChatRepositoryPort,
+    MessagesRepositoryPort,
+    RabbitMQManagerPort,
+)
 from domain.entities import Message
 from domain.value_objects import RejectReason
 
@@ -10,8 +18,11 @@ class ProcessMessageUseCase:
     This use case is responsible for the processing of a single message.
     It executes following procedures:
     - Attempts to create a domain entity of the Message.
-    - Stores an instance of the Message to the database.
-    - Increments the count of related messages for the respectful chat.
+    - Stores an instance of the Message to the database, a duplicate of the same sender and
+    chat is replaced by the stored message, so a redelivered message is sent once more instead
+    of being rejected.
+    - Increments the count of related messages for the respectful chat unless it has
+    been incremented for the stored message before.
     - Sends a message back to the RabbitMQ so that it can be later dispatched
     back to a user.
     """
@@ -34,22 +45,34 @@ class ProcessMessageUseCase:
         """
         self.message = message
         self.chat = None
+        self.stored_representation = None
+        self.pending_message = None
         self.chats_repo = chats_repo
         self.messages_repo = messages_repo
         self.rabbitmq_manager = rabbitmq_manager
 
-    async def execute(self) -> None:
+    async def execute(self) -> ProcessedMessageDTO:
         """
         Execute the processing process.
+
+        Returns:
+            ProcessedMessageDTO: The outcome of the processing of the message.
         """
         self.prepare()
 
-        if await self.validate():
+        if await self.validate_chat():
             if await self.enforce_permission_policy():
-                await self.create_message()
-                await self.increment_messages_count()
+                if await self.create_message():
+                    await self.increment_messages_count()
+
+        delivered = await self.send_message()
 
-        await self.send_message()
+        return ProcessedMessageDTO(
+            client_message_id=self.message.client_message_id,
+            status=self.message.status,
+            reject_reason=self.message.reject_reason,
+            delivered=delivered,
+        )
 
     def prepare(self) -> None:
         """
@@ -57,33 +80,11 @@ class ProcessMessageUseCase:
         """
         self.message = Message.create(message_data=self.message)
 
-    async def validate(self) -> bool:
-        message_accepted = await self.validate_message()
-        chat_accepted = await self.validate_chat()
-
-        return all({message_accepted, chat_accepted})
-
-    async def validate_message(self) -> bool:
-        """
-        Validate the message.
-
-        If message is considered invalid it's status will be changed to rejected
-        with a valid reject reason and it will be afterwards sent to the sender.
-        """
-        message_filters = {'client_message_id': self.message.client_message_id}
-        message_exists = await self.messages_repo.message_exists(filters=message_filters)
-
-        if message_exists:
-            self.message.reject(reject_reason=RejectReason.DUPLICATED)
-            return False
-        
-        return True
-    
     async def validate_chat(self) -> bool:
         """
         Validate the chat that is specified in the message.
         """
-        chat = await self.chats_repo.get_chat(id=self.message.chat_id)
+        chat = await self.chats_repo.get_chat(id=self.message.chat_id, projection=CHAT_MEMBERSHIP_PROJECTION)
 
         if chat is None:
             self.message.reject(reject_reason=RejectReason.INVALID_CHAT_ID)
@@ -107,24 +108,80 @@ class ProcessMessageUseCase:
             return False
         return True
 
-    async def create_message(self) -> None:
+    async def create_message(self) -> bool:
+        """
+        Allocate the id of a message on the client side and store the message to the database.
+
+        Duplicates are detected by the storage itself. If a message with the same
+        client_message_id is already stored the stored message is recovered instead.
+        The representation of the stored message is kept to be sent as it is.
+
+        Returns:
+            bool: True if the chat of the message has to be updated with it.
+        """
+        self.message.id = str(ObjectId())
+        representation = self.message.representation
+
+        if not await self.messages_repo.create_message(message=representation):
+            return await self.recover_stored_message()
+
+        self.stored_representation = representation
+        self.pending_message = self.message
+        return True
+
+    async def recover_stored_message(self) -> bool:
         """
-        Store a message to the database and update it's id based on MongoDB auto generated _id.
+        Replace the duplicate by the message that is already stored.
+
+        A duplicate of the same sender and chat is a redelivery of a message that was stored
+        before its processing failed, so the stored message is sent instead of a rejection, and
+        if its chat has not been updated with it the update is applied once more.
+        Any other duplicate is rejected.
+
+        Returns:
+            bool: True if the chat of the stored message has not been updated with it.
         """
-        inserted_id = await self.messages_repo.create_message(message=self.message.representation)
+        stored_messages = await self.messages_repo.get_stored_messages(
+            client_message_ids=[self.message.client_message_id],
+        )
 
-        processed_message_data = await self.messages_repo.update_id(_id=inserted_id)
+        if not stored_messages or not self.message.is_redelivery_of(message_data=stored_messages[0]):
+            self.message.id = None
+            self.message.reject(reject_reason=RejectReason.DUPLICATED)
+            return False
+
+        stored_message = stored_messages[0]
+        recovered_message = Message.create(message_data=stored_message, delivered_at=stored_message.get('delivered_at'))
 
-        self.message = Message.create(message_data=processed_message_data)
+        self.message.id = recovered_message.id
+        self.stored_representation = recovered_message.representation
+
+        if stored_message.get('chat_updated'):
+            return False
+
+        self.pending_message = recovered_message
+        return True
 
     async def increment_messages_count(self) -> None:
         """
-        Increment the count of messages of a chat that a message belongs to.
+        Increment the count of messages of a chat that a message belongs to,
+        make the message the last message of the chat and mark the message
+        as applied to its chat.
         """
-        await self.chats_repo.increment_messages_count(id=self.message.chat_id)
+        await self.chats_repo.increment_messages_count(
+            id=self.pending_message.chat_id,
+            last_message=self.pending_message.summary,
+            last_activity_at=self.pending_message.delivered_at,
+        )
+        await self.messages_repo.mark_chats_updated(ids=[self.pending_message.id])
 
-    async def send_message(self) -> None:
+    async def send_message(self) -> bool:
         """
         Send a message to the RabbitMQ exchange for further dispatching.
+
+        Returns:
+            bool: True if the message was confirmed by the broker.
         """
-        await self.rabbitmq_manager.send_message(message_data=self.message.representation)
+        return await self.rabbitmq_manager.send_message(
+            message_data=self.stored_representation or self.message.representation,
+        )
@@ -0,0 +1,267 @@
+from collections import Counter, defaultdict
+
+from bson import ObjectId
+
+from application.outgoing_dtos import ProcessedMessageDTO
+from application.ports import (
+    CHAT_MEMBERSHIP_PROJECTION,
+    ChatRepositoryPort,
+    MessagesRepositoryPort,
+    RabbitMQManagerPort,
+)
+from domain.entities import Message
+from domain.value_objects import MessageStatus, RejectReason
+
+
+class ProcessMessagesBatchUseCase:
+    """
+    Process messages in batches use case.
+
+    This use case is responsible for the processing of a batch of messages.
+    The accept/reject rules are the same as for a single message, but the
+    database round trips are shared by the whole batch:
+    - Attempts to create domain entities of the Messages.
+    - Looks up the related chats with a single query.
+    - Stores the accepted Messages to the database with a single insert, duplicates
+    are reported back by the storage. A duplicate of the same sender and chat is replaced
+    by the stored message, so a redelivered message is sent once more instead of being
+    rejected, any other duplicate is rejected. A repeated client_message_id within the
+    batch is resolved in the same way against the message stored for it.
+    - Increments the count of related messages for every affected chat with a single bulk write,
+    including the stored messages whose chat update has not been completed before.
+    - Sends the messages back to the RabbitMQ so that they can be later dispatched
+    back to users.
+    """
+
+    def __init__(
+        self,
+        messages: list,
+        chats_repo: ChatRepositoryPort,
+        messages_repo: MessagesRepositoryPort,
+        rabbitmq_manager: RabbitMQManagerPort,
+    ) -> None:
+        """
+        Initialize the use case.
+
+        Args:
+            messages (list): A list of messages data in the form of dictionaries.
+            chats_repo (ChatRepositoryPort): The port for a repository responsible for database actions with chats.
+            messages_repo (MessagesRepositoryPort): The port for a repository responsible for actions with messages.
+            rabbitmq_manager (RabbitMQManagerPort): The port for RabbitMQ manager.
+        """
+        self.messages = messages
+        self.accepted_messages = []
+        self.accepted_client_message_ids = set()
+        self.repeated_messages = []
+        self.duplicated_messages = []
+        self.pending_messages = []
+        self.stored_representations = {}
+        self.chats = {}
+        self.chats_repo = chats_repo
+        self.messages_repo = messages_repo
+        self.rabbitmq_manager = rabbitmq_manager
+
+    async def execute(self) -> list:
+        """
+        Execute the processing process.
+
+        Returns:
+            list: The outcomes of the processing of the messages as ProcessedMessageDTO in the order of the batch.
+        """
+        self.prepare()
+
+        await self.fetch_chats()
+
+        for message in self.messages:
+            if self.validate_chat(message=message):
+                if self.enforce_permission_policy(message=message):
+                    self.accept(message=message)
+
+        if self.accepted_messages:
+            await self.create_messages()
+            await self.recover_stored_messages()
+            await self.increment_messages_counts()
+
+        delivered = await self.send_messages()
+
+        return [
+            ProcessedMessageDTO(
+                client_message_id=message.client_message_id,
+                status=message.status,
+                reject_reason=message.reject_reason,
+                delivered=message_delivered,
+            )
+            for message, message_delivered in zip(self.messages, delivered)
+        ]
+
+    def prepare(self) -> None:
+        """
+        Create an instance of a Message entity for every message of the batch.
+
+        The messages of a batch are delivered at once, so they share a single timestamp.
+        """
+        delivered_at = Message.get_current_timestamp()
+
+        self.messages = [
+            Message.create(message_data=message, delivered_at=delivered_at) for message in self.messages
+        ]
+
+    async def fetch_chats(self) -> None:
+        """
+        Fetch all the chats that are specified in the messages of the batch with a single query.
+        """
+        chat_ids = list({message.chat_id for message in self.messages})
+        chats = await self.chats_repo.get_chats_by_ids(ids=chat_ids, projection=CHAT_MEMBERSHIP_PROJECTION)
+
+        self.chats = {chat.get('id'): chat for chat in chats}
+
+    def validate_chat(self, message: Message) -> bool:
+        """
+        Validate the chat that is specified in the message.
+        """
+        if message.chat_id not in self.chats:
+            message.reject(reject_reason=RejectReason.INVALID_CHAT_ID)
+            return False
+
+        return True
+
+    def enforce_permission_policy(self, message: Message) -> bool:
+        """
+        Enforce the authorization policy.
+
+        A message will be accepted if only both sender and recipient related to the
+        chat specified in message.
+        """
+        chat = self.chats.get(message.chat_id)
+
+        related_chat_users = {user.get('id') for user in chat.get('related_users')}
+        related_message_users = {message.sender_id, message.recipient_id}
+
+        if related_chat_users != related_message_users:
+            message.reject(reject_reason=RejectReason.NOT_RELATED_TO_CHAT)
+            return False
+        return True
+
+    def accept(self, message: Message) -> None:
+        """
+        Accept the message to be stored.
+
+        A message whose client_message_id has been accepted earlier in this batch is not
+        stored, it is resolved as a duplicate once the batch is stored, the same way as
+        if it was processed after the earlier message.
+        """
+        if message.client_message_id in self.accepted_client_message_ids:
+            self.repeated_messages.append(message)
+            return
+
+        self.accepted_messages.append(message)
+        self.accepted_client_message_ids.add(message.client_message_id)
+
+    async def create_messages(self) -> None:
+        """
+        Allocate the ids of the accepted messages on the client side and store them to the database.
+
+        The messages that turn out to be duplicates of already stored ones and the repeated
+        messages of the batch are recovered afterwards.
+        The representations of the stored messages are kept to be sent as they are.
+        """
+        for message in self.accepted_messages:
+            message.id = str(ObjectId())
+
+        representations = [message.representation for message in self.accepted_messages]
+        duplicated_positions = await self.messages_repo.create_messages(messages=representations)
+
+        for position, (message, representation) in enumerate(zip(self.accepted_messages, representations)):
+            if position in duplicated_positions:
+                self.duplicated_messages.append(message)
+            else:
+                self.pending_messages.append(message)
+                self.stored_representations[message.client_message_id] = representation
+
+        self.duplicated_messages.extend(self.repeated_messages)
+
+    async def recover_stored_messages(self) -> None:
+        """
+        Replace the duplicates by the messages that are already stored with a single query.
+
+        A duplicate of the same sender and chat is a redelivery of a message whose batch has
+        failed after the message was stored, so the stored message is sent instead of a rejection,
+        and if its chat has not been updated with it the update is applied once more, but only
+        once per stored message. Any other duplicate is rejected.
+        """
+        if not self.duplicated_messages:
+            return
+
+        stored_messages = {
+            stored_message.get('client_message_id'): stored_message
+            for stored_message in await self.messages_repo.get_stored_messages(
+                client_message_ids=[message.client_message_id for message in self.duplicated_messages],
+            )
+        }
+
+        pending_ids = {message.id for message in self.pending_messages}
+
+        for message in self.duplicated_messages:
+            stored_message = stored_messages.get(message.client_message_id)
+
+            if stored_message is None or not message.is_redelivery_of(message_data=stored_message):
+                message.id = None
+                message.reject(reject_reason=RejectReason.DUPLICATED)
+                continue
+
+            recovered_message = Message.create(
+                message_data=stored_message,
+                delivered_at=stored_message.get('delivered_at'),
+            )
+            message.id = recovered_message.id
+            self.stored_representations[message.client_message_id] = recovered_message.representation
+
+            if not stored_message.get('chat_updated') and recovered_message.id not in pending_ids:
+                self.pending_messages.append(recovered_message)
+                pending_ids.add(recovered_message.id)
+
+    async def increment_messages_counts(self) -> None:
+        """
+        Increment the count of messages of every chat that the pending messages belong to,
+        make the latest pending message of every chat its last message and mark the pending
+        messages as applied to their chats.
+
+        The newly stored messages keep the order of the batch and share a single delivery time,
+        the recovered ones are grouped by their own delivery times, so a single bulk write is
+        issued unless the batch contains redelivered messages.
+        """
+        if not self.pending_messages:
+            return
+
+        messages_by_delivery = defaultdict(list)
+
+        for message in self.pending_messages:
+            messages_by_delivery[message.delivered_at].append(message)
+
+        for delivered_at, messages in messages_by_delivery.items():
+            await self.chats_repo.increment_messages_counts(
+                counts=dict(Counter(message.chat_id for message in messages)),
+                last_messages={message.chat_id: message.summary for message in messages},
+                last_activity_at=delivered_at,
+            )
+
+        await self.messages_repo.mark_chats_updated(ids=[message.id for message in self.pending_messages])
+
+    async def send_messages(self) -> list:
+        """
+        Send the messages to the RabbitMQ exchange for further dispatching.
+
+        The whole batch is sent at once, so the broker confirmations are awaited concurrently.
+        The stored messages are sent in the same representation they were stored in.
+
+        Returns:
+            list: A flag for every message that is True if the message was confirmed by the broker.
+        """
+        return await self.rabbitmq_manager.send_messages(
+            messages_data=[
+                message.representation
+                if message.status == MessageStatus.REJECTED
+                else self.stored_representations.get(message.client_message_id)
+                for message in self.messages
+            ],
+        )
@@ -0,0 +1,81 @@
+from asyncio import sleep
+
+from settings import settings
+
+from application.ports import ChatRepositoryPort, ProfileUpdateJobsRepositoryPort
+from domain.value_objects import ProfileUpdateJobStatus
+
+
+class RunProfileUpdateJobUseCase:
+    """
+    The use case that propagates the profile of a user to the chats that such user is related to.
+
+    The chats are updated in chunks of profile_update_chunk_size in the order of their ids
+    and at most profile_update_chunks_per_second chunks are updated per second, so the
+    database is not hit by a single burst. The progress is recorded after every chunk,
+    so a job that was interrupted resumes after the last recorded chat. The job is
+    abandoned as soon as its lease is lost, e.g. once a newer profile update is requested.
+    """
+
+    def __init__(self, job: dict, jobs_repo: ProfileUpdateJobsRepositoryPort, chats_repo: ChatRepositoryPort) -> None:
+        """
+        Initialize the use case.
+
+        Args:
+            job (dict): A claimed profile update job.
+            jobs_repo (ProfileUpdateJobsRepositoryPort): The port that defines operations with the profile update jobs.
+            chats_repo (ChatRepositoryPort): The port that defines operations with the chats.
+        """
+        self.job = job
+        self.jobs_repo = jobs_repo
+        self.chats_repo = chats_repo
+
+    async def update_chunk(self, chat_ids: list) -> bool:
+        """
+        Update a chunk of chats and record the progress.
+
+        Args:
+            chat_ids (list): The identifiers of the chats of the chunk in ascending order.
+
+        Returns:
+            bool: True if the lease on the job is still held.
+        """
+        updated_chats_count = await self.chats_repo.update_related_user(
+            user_id=self.job.get('user_id'),
+            user_data=self.job.get('user_data'),
+            chat_ids=chat_ids,
+        )
+
+        return await self.jobs_repo.record_progress(
+            job=self.job,
+            last_chat_id=chat_ids[-1],
+            updated_chats_count=updated_chats_count,
+        )
+
+    async def execute(self) -> None:
+        """
+        Execute the process.
+        """
+        last_chat_id = self.job.get('last_chat_id')
+
+        while True:
+            chat_ids = await self.chats_repo.get_related_chat_ids(
+                user_id=self.job.get('user_id'),
+                after_id=last_chat_id,
+                limit=settings.profile_update_chunk_size,
+            )
+
+            if not chat_ids:
+                break
+
+            if not await self.update_chunk(chat_ids=chat_ids):
+                return
+
+            if len(chat_ids) < settings.profile_update_chunk_size:
+                break
+
+            last_chat_id = chat_ids[-1]
+
+            await sleep(1 / settings.profile_update_chunks_per_second)
+
+        await self.jobs_repo.finish_job(job=self.job, status=ProfileUpdateJobStatus.COMPLETED)
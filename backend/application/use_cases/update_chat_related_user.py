@@ -11,26 +11,41 @@ from logging import getLogger
 from settings import settings
 
 from application.exceptions import ChatUpdatingDeniedException
-from application.ports import ChatRepositoryPort
+from application.ports import ProfileUpdateJobsRepositoryPort, UsersRepositoryPort
+from domain.value_objects import ProfileUpdateJobStatus
 
 
 class UpdateChatUserUseCase:
     """
     The use case that updates the chats which user that triggered the action is related to.
+
+    The chats are not updated right away, a profile update job is created instead
+    and the chats are updated in the background by RunProfileUpdateJobUseCase.
+
+    If the users repository is provided the profiles are normalized, so the profile
+    is updated with a single write and the created job is already completed.
     """
 
-    def __init__(self, user_data: dict, user_id: int, database_repo: ChatRepositoryPort) -> None:
+    def __init__(
+        self,
+        user_data: dict,
+        user_id: int,
+        jobs_repo: ProfileUpdateJobsRepositoryPort,
+        users_repo: UsersRepositoryPort | None = None,
+    ) -> None:
         """
         Initialize the use case.
 
         Args:
             user_data (dict): A dictionary containing the data that is needed to update chats.
             user_id (int): The id of requesting user.
-            database_repo (ChatRepositoryPort): The port that defines operations with the chats.
+            jobs_repo (ProfileUpdateJobsRepositoryPort): The port that defines operations with the profile update jobs.
+            users_repo (UsersRepositoryPort | None): The port for the profiles of users, None if the profiles are embedded.
         """
         self.user_data = user_data
         self.user_id = user_id
-        self.database_repo = database_repo
+        self.jobs_repo = jobs_repo
+        self.users_repo = users_repo
         self.logger = getLogger(settings.chats_logger_name)
 
     def enforce_authorization_policy(self) -> None:
@@ -51,11 +66,22 @@ class UpdateChatUserUseCase:
                 details={'Chat updating is denied.': 'You are not permitted to update the chats with such info.'}
             )
 
-    async def execute(self) -> None:
+    async def execute(self) -> dict:
         """
         Execute the process.
+
+        Returns:
+            dict: The created profile update job.
         """
         self.enforce_authorization_policy()
 
-        user_id = self.user_data.get('id')
-        await self.database_repo.update_related_user(user_id=user_id, user_data=self.user_data)
+        if self.users_repo is None:
+            return await self.jobs_repo.create_job(user_id=self.user_data.get('id'), user_data=self.user_data)
+
+        await self.users_repo.update_user(user_id=self.user_data.get('id'), user_data=self.user_data)
+
+        return await self.jobs_repo.create_job(
+            user_id=self.user_data.get('id'),
+            user_data=self.user_data,
+            status=ProfileUpdateJobStatus.COMPLETED,
+        )
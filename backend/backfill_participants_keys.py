@@ -0,0 +1,25 @@
+from asyncio import run
+
+from infrastructure.database import DatabaseManager, ParticipantsKeyBackfill
+
+
+async def backfill_participants_keys() -> None:
+    """
+    Create the required indexes and set the participants_key of the chats
+    that were created before it was introduced.
+
+    Usage: python backfill_participants_keys.py
+    """
+    database_manager = DatabaseManager()
+
+    await database_manager.start()
+    updated_count, duplicated_chat_ids = await ParticipantsKeyBackfill(database_manager=database_manager).execute()
+
+    print(f'{updated_count} chats were updated.')
+
+    if duplicated_chat_ids:
+        print(f'{len(duplicated_chat_ids)} duplicated chats were left without the key: {", ".join(duplicated_chat_ids)}')
+
+
+if __name__ == '__main__':
+    run(backfill_participants_keys())
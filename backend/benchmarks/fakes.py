@@ -0,0 +1,342 @@
+from asyncio import Condition, Event, sleep
+from collections import deque
+from time import monotonic
+from typing import AsyncIterator
+
+from pymongo import UpdateOne
+
+from application.ports import ChatRepositoryPort, MessagesRepositoryPort, RabbitMQManagerPort
+
+
+class InMemoryIncomingMessage:
+    """
+    An in-memory stand-in of an incoming RabbitMQ message.
+
+    Reports its acknowledgement back to the broker that has delivered it.
+    """
+
+    def __init__(self, broker: 'InMemoryBroker', body: bytes) -> None:
+        """
+        Initialize the message.
+
+        Args:
+            broker (InMemoryBroker): The broker the message is published to.
+            body (bytes): The body of the message.
+        """
+        self.broker = broker
+        self.body = body
+        self.headers = {}
+        self.published_at = monotonic()
+
+    async def ack(self) -> None:
+        await self.broker.settle(message=self, latency=monotonic() - self.published_at)
+
+    async def nack(self, requeue: bool = True) -> None:
+        if requeue:
+            await self.broker.requeue(message=self)
+        else:
+            await self.broker.settle(message=self, latency=None)
+
+    async def reject(self, requeue: bool = False) -> None:
+        await self.nack(requeue=requeue)
+
+
+class InMemoryBroker:
+    """
+    An in-memory stand-in of a RabbitMQ queue.
+
+    Delivers the published messages while the amount of unacknowledged
+    messages is below the prefetch count and records the time from the
+    publication till the acknowledgement of every message.
+    """
+
+    def __init__(self, prefetch_count: int) -> None:
+        """
+        Initialize the broker.
+
+        Args:
+            prefetch_count (int): The initial prefetch count.
+        """
+        self.prefetch_count = prefetch_count
+        self.ready_messages = deque()
+        self.unacknowledged_count = 0
+        self.max_unacknowledged_count = 0
+        self.expected_count = 0
+        self.publishing_finished = False
+        self.settled_count = 0
+        self.redelivered_count = 0
+        self.latencies = []
+        self.condition = Condition()
+        self.finished = Event()
+
+    async def publish(self, body: bytes) -> None:
+        async with self.condition:
+            self.ready_messages.append(InMemoryIncomingMessage(broker=self, body=body))
+            self.expected_count += 1
+            self.condition.notify_all()
+
+    def finish_publishing(self) -> None:
+        self.publishing_finished = True
+
+        if self.settled_count == self.expected_count:
+            self.finished.set()
+
+    async def deliver(self) -> InMemoryIncomingMessage:
+        async with self.condition:
+            await self.condition.wait_for(
+                lambda: self.ready_messages and self.unacknowledged_count < self.prefetch_count,
+            )
+            self.unacknowledged_count += 1
+            self.max_unacknowledged_count = max(self.max_unacknowledged_count, self.unacknowledged_count)
+
+            return self.ready_messages.popleft()
+
+    async def settle(self, message: InMemoryIncomingMessage, latency: float | None) -> None:
+        async with self.condition:
+            self.unacknowledged_count -= 1
+            self.settled_count += 1
+
+            if latency is not None:
+                self.latencies.append(latency)
+
+            if self.settled_count == self.expected_count and self.publishing_finished:
+                self.finished.set()
+
+            self.condition.notify_all()
+
+    async def requeue(self, message: InMemoryIncomingMessage) -> None:
+        async with self.condition:
+            self.unacknowledged_count -= 1
+            self.redelivered_count += 1
+            self.ready_messages.appendleft(message)
+            self.condition.notify_all()
+
+    async def set_prefetch_count(self, prefetch_count: int) -> None:
+        async with self.condition:
+            self.prefetch_count = prefetch_count
+            self.condition.notify_all()
+
+    def iterator(self) -> 'InMemoryQueueIterator':
+        return InMemoryQueueIterator(broker=self)
+
+
+class InMemoryQueueIterator:
+    """
+    An in-memory stand-in of the iterator of a RabbitMQ queue.
+    """
+
+    def __init__(self, broker: InMemoryBroker) -> None:
+        self.broker = broker
+
+    async def __aenter__(self) -> 'InMemoryQueueIterator':
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        ...
+
+    def __aiter__(self) -> 'InMemoryQueueIterator':
+        return self
+
+    async def __anext__(self) -> InMemoryIncomingMessage:
+        return await self.broker.deliver()
+
+
+class InMemoryRabbitMQManager(RabbitMQManagerPort):
+    """
+    An in-memory implementation of the RabbitMQ manager.
+
+    Consumes from an InMemoryBroker and confirms every publication after
+    an artificial latency. A batch is confirmed after a single latency,
+    since its confirmations are awaited concurrently.
+    """
+
+    def __init__(self, broker: InMemoryBroker, latency: float) -> None:
+        """
+        Initialize the manager.
+
+        Args:
+            broker (InMemoryBroker): The broker to consume from.
+            latency (float): The amount of seconds a publication takes to be confirmed.
+        """
+        self.broker = broker
+        self.latency = latency
+        self.published_count = 0
+
+    @property
+    def prefetch_count(self) -> int:
+        return self.broker.prefetch_count
+
+    async def get_queue(self) -> InMemoryBroker:
+        return self.broker
+
+    async def set_prefetch_count(self, prefetch_count: int) -> None:
+        await self.broker.set_prefetch_count(prefetch_count=prefetch_count)
+
+    async def send_message(self, message_data: dict) -> bool:
+        await sleep(self.latency)
+        self.published_count += 1
+        return True
+
+    async def send_messages(self, messages_data: list) -> list:
+        await sleep(self.latency)
+        self.published_count += len(messages_data)
+        return [True] * len(messages_data)
+
+
+class InMemoryChatsRepository(ChatRepositoryPort):
+    """
+    An in-memory implementation of the chats repository with an artificial latency of every call.
+
+    The projections are ignored and the whole chats are returned.
+    """
+
+    def __init__(self, chats: list, latency: float) -> None:
+        """
+        Initialize the repository.
+
+        Args:
+            chats (list): The chats in the form of dictionaries.
+            latency (float): The amount of seconds every call takes.
+        """
+        self.chats = {chat.get('id'): chat for chat in chats}
+        self.latency = latency
+
+    async def get_or_create_chat(self, query: dict) -> dict:
+        await sleep(self.latency)
+        chat = query.get('update').get('$setOnInsert')
+        return self.chats.setdefault(chat.get('id'), chat)
+
+    async def get_chat(self, id: str, projection: dict | None = None) -> dict | None:
+        await sleep(self.latency)
+        return self.chats.get(id)
+
+    async def get_chats_by_ids(self, ids: list, projection: dict | None = None) -> list:
+        await sleep(self.latency)
+        return [self.chats.get(id) for id in ids if id in self.chats]
+
+    async def get_chats(self, filters: dict, limit: int, projection: dict | None = None) -> list:
+        await sleep(self.latency)
+        return list(self.chats.values())[:limit]
+
+    async def stream_chats(self, filters: dict, projection: dict | None = None) -> AsyncIterator[dict]:
+        await sleep(self.latency)
+
+        for chat in list(self.chats.values()):
+            yield chat
+
+    async def increment_messages_count(self, id: str, last_message: dict, last_activity_at: str) -> None:
+        await self.increment_messages_counts(
+            counts={id: 1},
+            last_messages={id: last_message},
+            last_activity_at=last_activity_at,
+        )
+
+    async def increment_messages_counts(self, counts: dict, last_messages: dict, last_activity_at: str) -> None:
+        await sleep(self.latency)
+
+        for id, count in counts.items():
+            chat = self.chats.get(id)
+            chat['messages_count'] += count
+
+            if last_activity_at >= (chat.get('last_activity_at') or ''):
+                chat.update({'last_message': last_messages.get(id), 'last_activity_at': last_activity_at})
+
+    async def get_related_chat_ids(self, user_id: int, after_id: str | None, limit: int) -> list:
+        await sleep(self.latency)
+        return sorted(
+            id for id, chat in self.chats.items()
+            if (after_id is None or id > after_id) and any(user.get('id') == user_id for user in chat.get('related_users'))
+        )[:limit]
+
+    async def update_related_user(self, user_id: int, user_data: dict, chat_ids: list) -> int:
+        await sleep(self.latency)
+        return len(chat_ids)
+
+
+class InMemoryMessagesRepository(MessagesRepositoryPort):
+    """
+    An in-memory implementation of the messages repository with an artificial latency of every call.
+
+    The projections are ignored and the whole messages are returned.
+    """
+
+    def __init__(self, latency: float) -> None:
+        """
+        Initialize the repository.
+
+        Args:
+            latency (float): The amount of seconds every call takes.
+        """
+        self.messages = {}
+        self.client_message_ids = {}
+        self.latency = latency
+
+    async def create_message(self, message: dict) -> bool:
+        return not await self.create_messages(messages=[message])
+
+    async def create_messages(self, messages: list) -> set:
+        await sleep(self.latency)
+        duplicated_positions = set()
+
+        for position, message in enumerate(messages):
+            if message.get('client_message_id') in self.messages:
+                duplicated_positions.add(position)
+            else:
+                self.messages[message.get('client_message_id')] = {**message, 'chat_updated': False}
+                self.client_message_ids[message.get('id')] = message.get('client_message_id')
+
+        return duplicated_positions
+
+    async def get_stored_messages(self, client_message_ids: list) -> list:
+        await sleep(self.latency)
+        return [
+            dict(self.messages[client_message_id])
+            for client_message_id in client_message_ids
+            if client_message_id in self.messages
+        ]
+
+    async def mark_chats_updated(self, ids: list) -> None:
+        await sleep(self.latency)
+
+        for id in ids:
+            self.messages[self.client_message_ids[id]]['chat_updated'] = True
+
+    async def get_chat_messages(
+        self,
+        filters: dict,
+        limit: int,
+        ascending: bool = False,
+        projection: dict | None = None,
+    ) -> list:
+        await sleep(self.latency)
+        messages = [message for message in self.messages.values() if message.get('chat_id') == filters.get('chat_id')]
+        return messages[:limit] if ascending else messages[::-1][:limit]
+
+
+class MongoMockCollection:
+    """
+    A mongomock-motor collection that runs the bulk writes operation by operation.
+
+    mongomock 4.3 does not support the bulk writes of pymongo 4.15, so every UpdateOne
+    of a bulk write is issued as a separate update_one. The rest of the calls are passed
+    to the wrapped collection as they are.
+    """
+
+    def __init__(self, collection) -> None:
+        """
+        Initialize the collection.
+
+        Args:
+            collection: The mongomock-motor collection to wrap.
+        """
+        self.collection = collection
+
+    def __getattr__(self, name: str):
+        return getattr(self.collection, name)
+
+    async def bulk_write(self, requests: list, ordered: bool = True) -> None:
+        for request in requests:
+            if not isinstance(request, UpdateOne):
+                raise TypeError(f'{type(request).__name__} is not supported in a bulk write on mongomock.')
+
+            await self.collection.update_one(request._filter, request._doc, upsert=request._upsert)
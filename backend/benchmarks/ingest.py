@@ -0,0 +1,207 @@
+from argparse import ArgumentParser, Namespace
+from asyncio import create_task, gather, run, sleep
+from statistics import quantiles
+from time import monotonic
+from tracemalloc import get_traced_memory, start, stop
+
+from settings import settings
+
+from domain.entities import Chat
+from benchmarks.fakes import (
+    InMemoryBroker,
+    InMemoryChatsRepository,
+    InMemoryMessagesRepository,
+    InMemoryRabbitMQManager,
+    MongoMockCollection,
+)
+from infrastructure.cache import LRUCache
+from infrastructure.codecs import json_codec
+from infrastructure.database.indexes import INDEXES
+from infrastructure.database.repositories import CachedChatsRepository, ChatsRepository, MessagesRepository
+from infrastructure.rabbitmq import PrefetchController
+from infrastructure.tasks import consume_from_rabbitmq, dispatch_messages
+from infrastructure.tasks.process_messages import process_partitions
+from infrastructure.transport import QueueManager
+
+
+def parse_arguments() -> Namespace:
+    parser = ArgumentParser(description='Benchmark the ingestion of messages end to end.')
+    parser.add_argument('--messages', type=int, default=20000, help='The amount of messages to ingest.')
+    parser.add_argument('--chats', type=int, default=200, help='The amount of chats the messages are spread over.')
+    parser.add_argument('--workers', type=int, default=settings.processing_workers_count,
+                        help='The amount of processing workers.')
+    parser.add_argument('--database-latency-ms', type=float, default=2, help='The latency of every repository call.')
+    parser.add_argument('--rate', type=int, default=0, help='Messages published per second, 0 publishes all at once.')
+    parser.add_argument('--publish-latency-ms', type=float, default=5, help='The latency of a publisher confirm.')
+    parser.add_argument('--no-batching', action='store_true', help='Process the messages one by one.')
+    parser.add_argument('--mongomock', action='store_true', help='Use the real repositories on mongomock-motor. '
+                        'The bulk writes are issued operation by operation, since mongomock does not support them.')
+    parser.add_argument('--trace-memory', action='store_true', help='Trace the memory allocations, slows the run down.')
+    return parser.parse_args()
+
+
+def create_chats(chats_count: int) -> list:
+    return [
+        {
+            'id': f'{index:024x}',
+            'related_users': [{'id': index * 2 + 1}, {'id': index * 2 + 2}],
+            'participants_key': Chat.make_participants_key(user_ids=[index * 2 + 1, index * 2 + 2]),
+            'messages_count': 0,
+        }
+        for index in range(chats_count)
+    ]
+
+
+def create_bodies(messages_count: int, chats: list) -> list:
+    return [
+        json_codec.encode({
+            'client_message_id': f'benchmark-{index}',
+            'chat_id': chats[index % len(chats)].get('id'),
+            'sender_id': chats[index % len(chats)].get('related_users')[0].get('id'),
+            'recipient_id': chats[index % len(chats)].get('related_users')[1].get('id'),
+            'sent_at': '2026-01-01T12:00:00.000000Z',
+            'body': 'Hello there! ' * 8,
+        })
+        for index in range(messages_count)
+    ]
+
+
+async def publish_bodies(broker: InMemoryBroker, bodies: list, rate: int) -> None:
+    """
+    Publish the bodies to the broker, either all at once or at a steady rate.
+
+    Args:
+        broker (InMemoryBroker): The broker to publish to.
+        bodies (list): The bodies of the messages.
+        rate (int): The amount of messages per second, 0 publishes all at once.
+    """
+    chunk_size = max(1, rate // 100) if rate else len(bodies)
+    started_at = monotonic()
+
+    for position in range(0, len(bodies), chunk_size):
+        if rate and (delay := started_at + position / rate - monotonic()) > 0:
+            await sleep(delay)
+
+        for body in bodies[position:position + chunk_size]:
+            await broker.publish(body=body)
+
+    broker.finish_publishing()
+
+
+async def create_repositories(arguments: Namespace, chats: list) -> tuple:
+    """
+    Create the chats and messages repositories for the selected mode.
+
+    Args:
+        arguments (Namespace): The command line arguments.
+        chats (list): The chats to seed the repository with.
+
+    Returns:
+        tuple: The chats repository and the messages repository.
+    """
+    chats_cache = LRUCache(name='chats', max_size=settings.chats_cache_max_size, ttl=settings.chats_cache_ttl)
+
+    if not arguments.mongomock:
+        latency = arguments.database_latency_ms / 1000
+        chats_repo = InMemoryChatsRepository(chats=chats, latency=latency)
+        return CachedChatsRepository(repository=chats_repo, cache=chats_cache), InMemoryMessagesRepository(latency=latency)
+
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError:
+        raise SystemExit('The mongomock mode requires mongomock-motor: pip install mongomock-motor')
+
+    database = AsyncMongoMockClient()['benchmark']
+
+    for collection_name, indexes in INDEXES.items():
+        await database[collection_name].create_indexes(indexes)
+
+    await database[settings.chats_collection_name].insert_many([dict(chat) for chat in chats])
+
+    chats_repo = ChatsRepository(collection=MongoMockCollection(collection=database[settings.chats_collection_name]))
+    messages_repo = MessagesRepository(
+        collection=MongoMockCollection(collection=database[settings.messages_collection_name]),
+    )
+
+    return CachedChatsRepository(repository=chats_repo, cache=chats_cache), messages_repo
+
+
+async def benchmark_ingest(arguments: Namespace) -> None:
+    """
+    Drive consume_from_rabbitmq, dispatch_messages and process_partitions end to end
+    and report the throughput, the latency from publication till acknowledgement
+    and the memory that is allocated per message in flight.
+
+    By default all the messages are published at once, so the throughput shows how fast
+    a backlog is drained. Use --rate to measure the latency under a steady load.
+
+    Usage: python -m benchmarks.ingest [--help]
+    """
+    settings.messages_batching_enabled = not arguments.no_batching
+
+    chats = create_chats(chats_count=arguments.chats)
+    bodies = create_bodies(messages_count=arguments.messages, chats=chats)
+    chats_repo, messages_repo = await create_repositories(arguments=arguments, chats=chats)
+
+    broker = InMemoryBroker(prefetch_count=settings.channel_prefetch_messages_count)
+    rabbitmq_manager = InMemoryRabbitMQManager(broker=broker, latency=arguments.publish_latency_ms / 1000)
+    queue_manager = QueueManager()
+    prefetch_controller = PrefetchController(rabbitmq_manager=rabbitmq_manager, queue_manager=queue_manager)
+    failed_deliveries = LRUCache(
+        name='failed_deliveries',
+        max_size=settings.failed_deliveries_cache_max_size,
+        ttl=settings.failed_deliveries_cache_ttl,
+    )
+
+    if arguments.trace_memory:
+        start()
+
+    started_at = monotonic()
+
+    tasks = [
+        create_task(publish_bodies(broker=broker, bodies=bodies, rate=arguments.rate)),
+        create_task(consume_from_rabbitmq(queue_manager=queue_manager, rabbitmq_manager=rabbitmq_manager)),
+        create_task(dispatch_messages(queue_manager=queue_manager)),
+        create_task(prefetch_controller.execute()),
+        *[
+            create_task(process_partitions(
+                queue_manager=queue_manager,
+                chats_repo=chats_repo,
+                messages_repo=messages_repo,
+                rabbitmq_manager=rabbitmq_manager,
+                prefetch_controller=prefetch_controller,
+                failed_deliveries=failed_deliveries,
+            ))
+            for _ in range(arguments.workers)
+        ],
+    ]
+
+    await broker.finished.wait()
+    elapsed = monotonic() - started_at
+
+    if arguments.trace_memory:
+        _, peak_memory = get_traced_memory()
+        stop()
+
+    for task in tasks:
+        task.cancel()
+
+    await gather(*tasks, return_exceptions=True)
+
+    percentiles = quantiles(broker.latencies, n=100)
+
+    print(f'mode:             {"mongomock" if arguments.mongomock else "in-memory"}, '
+          f'{"serial" if arguments.no_batching else "batched"}, {arguments.workers} workers')
+    print(f'messages:         {broker.settled_count} settled, {broker.redelivered_count} redelivered')
+    print(f'throughput:       {broker.settled_count / elapsed:.0f} msg/s')
+    print(f'latency p50:      {percentiles[49] * 1000:.1f} ms')
+    print(f'latency p99:      {percentiles[98] * 1000:.1f} ms')
+    print(f'max in flight:    {broker.max_unacknowledged_count} messages, prefetch {broker.prefetch_count} at the end')
+
+    if arguments.trace_memory:
+        print(f'peak memory:      {peak_memory / 1024:.0f} KB, '
+              f'{peak_memory / broker.max_unacknowledged_count:.0f} B per message in flight')
+
+
+if __name__ == '__main__':
+    run(benchmark_ingest(arguments=parse_arguments()))
@@ -0,0 +1,84 @@
+from json import dumps, loads
+from timeit import repeat
+
+from domain.entities import Message
+from infrastructure.codecs import MsgspecCodec, OrjsonCodec, StandardJSONCodec
+
+
+NUMBER = 20000
+REPEAT = 5
+
+
+def get_sample_message() -> tuple:
+    """
+    Get a typical incoming message body and the representation of the processed message.
+
+    Returns:
+        tuple: The incoming message body in the bytes form and the outgoing message in the form of a dictionary.
+    """
+    message_data = {
+        'client_message_id': '5f0e4c1b-1f0a-4a57-9a3c-3f7f9d1c2b6e',
+        'chat_id': '6710b5b4f1d3c2a1e0f9d8c7',
+        'sender_id': 1,
+        'recipient_id': 2,
+        'sent_at': '2026-01-01 12:00:00',
+        'body': 'Hello there! ' * 8,
+    }
+    message = Message.create(message_data=message_data)
+    message.id = '6710b5b4f1d3c2a1e0f9d8c8'
+
+    return dumps(message_data).encode('utf-8'), message.representation
+
+
+def measure(statement: callable) -> float:
+    """
+    Measure the best time of a single call.
+
+    Args:
+        statement (callable): The statement to measure.
+
+    Returns:
+        float: The amount of microseconds a single call takes.
+    """
+    return min(repeat(statement, number=NUMBER, repeat=REPEAT)) / NUMBER * 1_000_000
+
+
+def benchmark_json_codecs() -> None:
+    """
+    Compare the per-message decoding and encoding time of the available JSON codecs
+    with the former str round trip of the standard library.
+
+    Usage: python -m benchmarks.json_codec
+    """
+    body, representation = get_sample_message()
+
+    results = [(
+        'json (str round trip)',
+        measure(lambda: loads(body.decode('utf-8'))),
+        measure(lambda: dumps(representation).encode('utf-8')),
+    )]
+
+    for codec_class in (StandardJSONCodec, OrjsonCodec, MsgspecCodec):
+        try:
+            codec = codec_class()
+        except ImportError:
+            print(f'{codec_class.name} is not installed, skipping.')
+            continue
+
+        results.append((
+            codec.name,
+            measure(lambda: codec.decode(body)),
+            measure(lambda: codec.encode(representation)),
+        ))
+
+    baseline_decode, baseline_encode = results[0][1], results[0][2]
+
+    print(f'{"codec":<24}{"decode, us":>12}{"encode, us":>12}{"speedup":>10}')
+
+    for name, decode_time, encode_time in results:
+        speedup = (baseline_decode + baseline_encode) / (decode_time + encode_time)
+        print(f'{name:<24}{decode_time:>12.2f}{encode_time:>12.2f}{speedup:>9.1f}x')
+
+
+if __name__ == '__main__':
+    benchmark_json_codecs()
@@ -0,0 +1,121 @@
+from json import dumps, loads
+from timeit import repeat
+from tracemalloc import get_traced_memory, reset_peak, start, stop
+
+from bson import ObjectId
+from pydantic import BaseModel
+
+from domain.entities import Message
+from infrastructure.rabbitmq import RabbitMQDecoder
+
+
+NUMBER = 10000
+REPEAT = 5
+
+
+class LegacyIncomingMessageDTO(BaseModel):
+    """
+    The former pydantic model of an incoming message.
+    """
+    client_message_id: str
+    chat_id: str
+    sender_id: int
+    recipient_id: int
+    sent_at: str
+    body: str
+
+
+BODY = dumps({
+    'client_message_id': '5f0e4c1b-1f0a-4a57-9a3c-3f7f9d1c2b6e',
+    'chat_id': '6710b5b4f1d3c2a1e0f9d8c7',
+    'sender_id': 1,
+    'recipient_id': 2,
+    'sent_at': '2026-01-01 12:00:00',
+    'body': 'Hello there! ' * 8,
+}).encode('utf-8')
+
+
+def process_legacy() -> tuple:
+    """
+    Decode and validate a message the former way and build its document and its payload.
+
+    Returns:
+        tuple: The document to insert and the payload to publish.
+    """
+    decoded_message = loads(BODY.decode('utf-8'))
+    validated_message = LegacyIncomingMessageDTO(**decoded_message).model_dump()
+    message = Message.create(message_data=validated_message)
+    message.id = str(ObjectId())
+
+    return message.representation, message.representation
+
+
+decoder = RabbitMQDecoder()
+
+
+def process_lean() -> tuple:
+    """
+    Decode and validate a message in a single pass and build its document and its payload once.
+
+    Returns:
+        tuple: The document to insert and the payload to publish.
+    """
+    message = Message.create(message_data=decoder.execute(message=BODY))
+    message.id = str(ObjectId())
+    representation = message.representation
+
+    return representation, representation
+
+
+def measure_time(path: callable) -> float:
+    """
+    Measure the best time of processing a single message.
+
+    Args:
+        path (callable): The processing path.
+
+    Returns:
+        float: The amount of microseconds a single message takes.
+    """
+    return min(repeat(path, number=NUMBER, repeat=REPEAT)) / NUMBER * 1_000_000
+
+
+def measure_memory(path: callable) -> float:
+    """
+    Measure the peak of the memory that is allocated while processing a single message.
+
+    Args:
+        path (callable): The processing path.
+
+    Returns:
+        float: The average amount of bytes allocated at the peak per message.
+    """
+    path()
+    start()
+    total = 0
+
+    for _ in range(1000):
+        reset_peak()
+        current, _ = get_traced_memory()
+        path()
+        _, peak = get_traced_memory()
+        total += peak - current
+
+    stop()
+    return total / 1000
+
+
+def benchmark_message_decoding() -> None:
+    """
+    Compare the former and the lean message decoding paths.
+
+    Usage: python -m benchmarks.message_decoding
+    """
+    print(f'{"path":<10}{"time, us":>12}{"peak allocated, B":>20}')
+
+    for name, path in (('legacy', process_legacy), ('lean', process_lean)):
+        print(f'{name:<10}{measure_time(path):>12.2f}{measure_memory(path):>20.0f}')
+
+
+if __name__ == '__main__':
+    benchmark_message_decoding()
@@ -0,0 +1,356 @@
+from argparse import ArgumentParser, Namespace
+from asyncio import gather, run
+from collections import defaultdict
+from inspect import getattr_static, iscoroutinefunction
+from random import Random
+from statistics import quantiles
+from time import perf_counter
+
+from bson import ObjectId
+from dependency_injector.providers import Object
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from jwt import encode
+
+from settings import settings
+
+from domain.entities import Chat, Message
+from infrastructure.database.indexes import INDEXES
+from infrastructure.database.repositories import (
+    CachedChatsRepository,
+    CachedUsersRepository,
+    ChatsRepository,
+    MessagesRepository,
+)
+from infrastructure.dependency_injector import DependenciesContainer
+from infrastructure.exception_handlers import setup_exception_handlers
+from infrastructure.handlers import setup_routers
+from infrastructure.security import JWTManager
+from interface_adapters.controllers import GetMessagesController
+from interface_adapters.outgoing_dtos import ChatOUTDTO
+
+
+class BenchmarkDatabaseManager:
+    """
+    The stand-in of the DatabaseManager that serves the collections of a seeded database.
+    """
+
+    def __init__(self, database) -> None:
+        self.database = database
+
+    async def get_collection(self, collection_name: str):
+        return self.database[collection_name]
+
+
+class StageTimer:
+    """
+    Measures the time that is spent in the stages of the read path.
+
+    The methods of the stages are replaced by wrappers that accumulate the
+    amount of calls and the time spent in them.
+    """
+
+    def __init__(self) -> None:
+        self.stages = defaultdict(lambda: [0, 0.0])
+
+    def record(self, stage: str, elapsed: float) -> None:
+        self.stages[stage][0] += 1
+        self.stages[stage][1] += elapsed
+
+    def instrument(self, owner: type, name: str, stage: str) -> None:
+        """
+        Replace a method of a class by a wrapper that measures its time.
+
+        Args:
+            owner (type): The class that owns the method.
+            name (str): The name of the method.
+            stage (str): The name of the stage the time is accounted to.
+        """
+        descriptor = getattr_static(owner, name)
+        original = getattr(owner, name)
+
+        if iscoroutinefunction(original):
+            async def wrapper(*args, **kwargs):
+                started_at = perf_counter()
+                try:
+                    return await original(*args, **kwargs)
+                finally:
+                    self.record(stage=stage, elapsed=perf_counter() - started_at)
+        else:
+            def wrapper(*args, **kwargs):
+                started_at = perf_counter()
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    self.record(stage=stage, elapsed=perf_counter() - started_at)
+
+        setattr(owner, name, staticmethod(wrapper) if isinstance(descriptor, classmethod) else wrapper)
+
+
+def parse_arguments() -> Namespace:
+    parser = ArgumentParser(description='Benchmark the read path of the HTTP API in-process.')
+    parser.add_argument('--users', type=int, default=100, help='The amount of seeded users.')
+    parser.add_argument('--chats-per-user', type=int, default=10, help='The amount of chats every user starts.')
+    parser.add_argument('--messages-per-chat', type=int, default=50, help='The amount of messages in every chat.')
+    parser.add_argument('--requests', type=int, default=2000, help='The amount of requests per endpoint.')
+    parser.add_argument('--concurrency', type=int, default=32, help='The amount of concurrent clients.')
+    parser.add_argument('--limit', type=int, default=settings.messages_limit, help='The page size of get-messages.')
+    parser.add_argument('--mongo-url', help='Seed a real MongoDB instead of mongomock-motor, e.g. mongodb://localhost.')
+    parser.add_argument('--seed', type=int, default=0, help='The seed of the random requests.')
+    parser.add_argument('--normalized-profiles', action='store_true', help='Store the profiles in the users '
+                        'collection and only the user ids in the chats.')
+    return parser.parse_args()
+
+
+async def create_database(arguments: Namespace):
+    """
+    Create an empty database with the required indexes.
+
+    Args:
+        arguments (Namespace): The command line arguments.
+
+    Returns:
+        The Motor or mongomock-motor database.
+    """
+    if arguments.mongo_url:
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        client = AsyncIOMotorClient(host=arguments.mongo_url)
+        await client.drop_database('read_path_benchmark')
+        database = client['read_path_benchmark']
+    else:
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            raise SystemExit('The benchmark requires mongomock-motor or --mongo-url: pip install mongomock-motor')
+
+        database = AsyncMongoMockClient()['read_path_benchmark']
+
+    for collection_name, indexes in INDEXES.items():
+        await database[collection_name].create_indexes(indexes)
+
+    return database
+
+
+def create_profile(user_id: int) -> dict:
+    return {'id': user_id, 'username': f'user-{user_id}', 'avatar_url': ''}
+
+
+async def seed_database(database, arguments: Namespace) -> list:
+    """
+    Seed the chats and the messages.
+
+    Every user starts chats with the next chats_per_user users, so every user
+    is related to about twice as many chats. A pair of users that already has
+    a chat is skipped. With --normalized-profiles the profiles are seeded into
+    the users collection and the chats keep only the ids of their users.
+
+    Args:
+        database: The database to seed.
+        arguments (Namespace): The command line arguments.
+
+    Returns:
+        list: The pairs of the chat id and the ids of its related users.
+    """
+    chats, messages, chat_users = [], [], []
+    participants_keys = set()
+
+    for user_id in range(1, arguments.users + 1):
+        for offset in range(1, arguments.chats_per_user + 1):
+            recipient_id = (user_id + offset - 1) % arguments.users + 1
+            participants_key = Chat.make_participants_key(user_ids=[user_id, recipient_id])
+
+            if recipient_id == user_id or participants_key in participants_keys:
+                continue
+
+            participants_keys.add(participants_key)
+            chat_id = ObjectId()
+            chats.append({
+                '_id': chat_id,
+                'id': str(chat_id),
+                'related_users': [
+                    {'id': related_user_id} if arguments.normalized_profiles else create_profile(user_id=related_user_id)
+                    for related_user_id in sorted((user_id, recipient_id))
+                ],
+                'participants_key': participants_key,
+                'messages_count': arguments.messages_per_chat,
+            })
+            chat_users.append((str(chat_id), (user_id, recipient_id)))
+
+            for index in range(arguments.messages_per_chat):
+                message = Message.create(message_data={
+                    'client_message_id': f'{chat_id}-{index}',
+                    'chat_id': str(chat_id),
+                    'sender_id': (user_id, recipient_id)[index % 2],
+                    'recipient_id': (recipient_id, user_id)[index % 2],
+                    'sent_at': '2026-01-01T12:00:00.000000Z',
+                    'body': 'Hello there! ' * 8,
+                })
+                message.id = str(ObjectId())
+                messages.append({'_id': ObjectId(message.id), **message.representation})
+                chats[-1].update({'last_message': message.summary, 'last_activity_at': message.delivered_at})
+
+    if arguments.normalized_profiles:
+        await database[settings.users_collection_name].insert_many(
+            [create_profile(user_id=user_id) for user_id in range(1, arguments.users + 1)],
+        )
+
+    await database[settings.chats_collection_name].insert_many(chats)
+    await database[settings.messages_collection_name].insert_many(messages)
+
+    return chat_users
+
+
+def create_application(database) -> FastAPI:
+    """
+    Create the application with the routers wired to the seeded database.
+
+    The lifespan is not run, so no RabbitMQ connection and no background tasks are started.
+
+    Args:
+        database: The seeded database.
+
+    Returns:
+        FastAPI: An instance of FastAPI application.
+    """
+    dependencies_container = DependenciesContainer()
+    dependencies_container.database_manager.override(Object(BenchmarkDatabaseManager(database=database)))
+    dependencies_container.wire(modules=['infrastructure.handlers.chats', 'infrastructure.handlers.messages'])
+
+    application = FastAPI()
+
+    setup_exception_handlers(application=application)
+    setup_routers(application=application)
+
+    return application
+
+
+def instrument_stages() -> StageTimer:
+    """
+    Instrument the stages of the read path.
+
+    The time of get_chat includes the chats cache and the time of get_users includes
+    the profiles cache. The previous_messages_exist
+    query no longer exists, since get_chat_messages fetches an extra message instead.
+
+    Returns:
+        StageTimer: The timer that accumulates the time of the stages.
+    """
+    stage_timer = StageTimer()
+
+    stage_timer.instrument(owner=JWTManager, name='retrieve_user_id', stage='auth')
+    stage_timer.instrument(owner=CachedChatsRepository, name='get_chat', stage='get_chat')
+    stage_timer.instrument(owner=ChatsRepository, name='get_chats', stage='get_chats')
+    stage_timer.instrument(owner=CachedUsersRepository, name='get_users', stage='get_users')
+    stage_timer.instrument(owner=MessagesRepository, name='get_chat_messages', stage='get_chat_messages')
+    stage_timer.instrument(owner=GetMessagesController, name='transform_messages', stage='dto_conversion')
+    stage_timer.instrument(owner=ChatOUTDTO, name='from_dict', stage='dto_conversion')
+
+    return stage_timer
+
+
+async def drive(client: AsyncClient, requests: list, concurrency: int) -> tuple:
+    """
+    Send the requests from concurrent clients.
+
+    Args:
+        client (AsyncClient): The client bound to the application.
+        requests (list): The pairs of the url parameters and the headers of the requests.
+        concurrency (int): The amount of concurrent clients.
+
+    Returns:
+        tuple: The latencies of the requests, the amount of failed requests and the elapsed time.
+    """
+    latencies, failures = [], 0
+    pending = iter(requests)
+
+    async def drive_client() -> None:
+        nonlocal failures
+
+        for url, params, headers in pending:
+            started_at = perf_counter()
+            response = await client.get(url, params=params, headers=headers)
+            latencies.append(perf_counter() - started_at)
+            failures += response.status_code != 200
+
+    started_at = perf_counter()
+    await gather(*[drive_client() for _ in range(concurrency)])
+
+    return latencies, failures, perf_counter() - started_at
+
+
+def report(endpoint: str, latencies: list, failures: int, elapsed: float, stage_timer: StageTimer) -> None:
+    """
+    Print the throughput, the latency percentiles and the time spent in every stage.
+
+    The requests share a single event loop, so the share of the wall time that is spent
+    in a stage is what the stage costs the throughput. The time of the asynchronous stages
+    includes the time they were waiting for the event loop.
+    """
+    percentiles = quantiles(latencies, n=100)
+
+    print(f'{endpoint}: {len(latencies) / elapsed:.0f} rps, {failures} failed')
+    print(f'  latency p50 {percentiles[49] * 1000:.2f} ms, p90 {percentiles[89] * 1000:.2f} ms, '
+          f'p99 {percentiles[98] * 1000:.2f} ms')
+
+    for stage, (calls, total) in sorted(stage_timer.stages.items()):
+        print(f'  {stage:<20}{calls:>8} calls{total / calls * 1_000_000:>10.0f} us/call'
+              f'{total / elapsed * 100:>8.1f}% of wall time')
+
+
+async def benchmark_read_path(arguments: Namespace) -> None:
+    """
+    Seed a database, drive /chats/get-chats and /messages/get-messages through ASGI
+    and report the throughput, the latency percentiles and the time spent in every stage.
+
+    Usage: python -m benchmarks.read_path [--help]
+    """
+    settings.normalized_user_profiles_enabled = arguments.normalized_profiles
+
+    database = await create_database(arguments=arguments)
+    chat_users = await seed_database(database=database, arguments=arguments)
+    application = create_application(database=database)
+    random = Random(arguments.seed)
+
+    def authorize(user_id: int) -> dict:
+        token = encode({'user_id': user_id}, key=settings.key, algorithm=settings.algorithm)
+        return {'Authorization': f'Bearer {token}'}
+
+    headers = {user_id: authorize(user_id=user_id) for user_id in range(1, arguments.users + 1)}
+
+    get_chats_requests = [
+        ('/chats/get-chats', {}, headers.get(random.randint(1, arguments.users)))
+        for _ in range(arguments.requests)
+    ]
+    get_messages_requests = []
+
+    for _ in range(arguments.requests):
+        chat_id, users = random.choice(chat_users)
+        get_messages_requests.append((
+            '/messages/get-messages',
+            {'chat_id': chat_id, 'limit': arguments.limit},
+            headers.get(random.choice(users)),
+        ))
+
+    print(f'seeded {len(chat_users)} chats and {len(chat_users) * arguments.messages_per_chat} messages, '
+          f'{"normalized" if arguments.normalized_profiles else "embedded"} profiles, '
+          f'{arguments.concurrency} concurrent clients')
+
+    stage_timer = instrument_stages()
+
+    async with AsyncClient(transport=ASGITransport(app=application), base_url='http://benchmark') as client:
+        for endpoint, requests in (('get-chats', get_chats_requests), ('get-messages', get_messages_requests)):
+            await drive(client=client, requests=requests[:arguments.concurrency], concurrency=arguments.concurrency)
+            stage_timer.stages.clear()
+
+            latencies, failures, elapsed = await drive(
+                client=client,
+                requests=requests,
+                concurrency=arguments.concurrency,
+            )
+
+            report(endpoint=endpoint, latencies=latencies, failures=failures, elapsed=elapsed, stage_timer=stage_timer)
+
+
+if __name__ == '__main__':
+    run(benchmark_read_path(arguments=parse_arguments()))
@@ -0,0 +1,84 @@
+from argparse import ArgumentParser
+from asyncio import run, sleep
+
+from aio_pika import Message
+from aio_pika.abc import AbstractIncomingMessage
+
+from settings import settings
+
+from infrastructure.rabbitmq import RabbitMQManager
+
+
+async def measure_prefetch_count(deliveries: list, wait: float) -> int:
+    """
+    Acknowledge the delivered messages and count the messages the broker delivers ahead.
+
+    Args:
+        deliveries (list): The messages delivered to the consumer so far.
+        wait (float): The amount of seconds to wait for the deliveries.
+
+    Returns:
+        int: The amount of the unacknowledged messages, that is the live prefetch count.
+    """
+    delivered_messages = deliveries[:]
+    deliveries.clear()
+
+    for delivered_message in delivered_messages:
+        await delivered_message.ack()
+
+    await sleep(wait)
+
+    return len(deliveries)
+
+
+async def check_prefetch(prefetch_count: int, wait: float) -> None:
+    """
+    Check that a prefetch count change is applied to the consumer that is already started.
+
+    The consumption channel is set up the same way as on startup and a consumer is started
+    on a temporary queue filled with enough messages. The amount of messages the broker
+    delivers ahead is measured before and after the prefetch count is changed.
+
+    Usage: python check_prefetch.py [--prefetch-count N] [--wait SECONDS]
+    """
+    rabbitmq_manager = RabbitMQManager()
+    deliveries = []
+
+    async def consume(message: AbstractIncomingMessage) -> None:
+        deliveries.append(message)
+
+    await rabbitmq_manager.start()
+
+    try:
+        queue = await rabbitmq_manager.consumption_channel.declare_queue(exclusive=True, auto_delete=True)
+
+        for _ in range(rabbitmq_manager.prefetch_count * 2 + prefetch_count * 2):
+            await rabbitmq_manager.publishing_channel.default_exchange.publish(
+                message=Message(body=b'{}'),
+                routing_key=queue.name,
+            )
+
+        await queue.consume(consume)
+
+        initial_prefetch_count = rabbitmq_manager.prefetch_count
+        live_initial_prefetch_count = await measure_prefetch_count(deliveries=deliveries, wait=wait)
+
+        await rabbitmq_manager.set_prefetch_count(prefetch_count=prefetch_count)
+        live_prefetch_count = await measure_prefetch_count(deliveries=deliveries, wait=wait)
+    finally:
+        await rabbitmq_manager.connection.close()
+
+    print(f'Prefetch count {initial_prefetch_count}, live prefetch count {live_initial_prefetch_count}.')
+    print(f'Prefetch count {prefetch_count}, live prefetch count {live_prefetch_count}.')
+
+    if live_prefetch_count != prefetch_count:
+        raise SystemExit('The prefetch count change is not applied to the started consumer.')
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Check that the prefetch count changes reach the started consumer.')
+    parser.add_argument('--prefetch-count', type=int, default=settings.min_prefetch_messages_count,
+                        help='The prefetch count to change to.')
+    parser.add_argument('--wait', type=float, default=1, help='The amount of seconds to wait for the deliveries.')
+    arguments = parser.parse_args()
+    run(check_prefetch(prefetch_count=arguments.prefetch_count, wait=arguments.wait))
@@ -0,0 +1,34 @@
+from argparse import ArgumentParser
+from asyncio import run
+
+from infrastructure.database import DatabaseManager, UniqueIndexesCleanup
+
+
+async def check_unique_indexes(fix: bool) -> None:
+    """
+    Find the documents that prevent the unique indexes from being created on startup
+    and optionally fix them. The indexes are not created, so the check can run
+    against the data of the previous version before the upgrade.
+
+    Usage: python check_unique_indexes.py [--fix]
+    """
+    database_manager = DatabaseManager()
+
+    await database_manager.connect()
+    report = await UniqueIndexesCleanup(database_manager=database_manager).execute(fix=fix)
+
+    action = 'fixed' if fix else 'found'
+
+    print(f'{report.get("duplicated_messages")} duplicated messages {action}.')
+    print(f'{report.get("messages_without_client_message_id")} messages without client_message_id {action}.')
+    print(f'{report.get("chats_without_id")} chats without id {action}.')
+
+    if duplicated_chat_ids := report.get('duplicated_chat_ids'):
+        print(f'{len(duplicated_chat_ids)} chat ids are shared by several chats and have to be merged manually: '
+              f'{", ".join(duplicated_chat_ids)}')
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Check the data for the documents that violate the unique indexes.')
+    parser.add_argument('--fix', action='store_true', help='Delete the duplicated messages and set the missing ids.')
+    run(check_unique_indexes(fix=parser.parse_args().fix))
@@ -1,7 +1,7 @@
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Chat:
     """
     The domain entity of Chat.
@@ -13,23 +13,36 @@ class Chat:
         id: The id of a Chat.
         related_user_ids: A list of ids of the users that are communicating through this chat.
         related_users: A list of user ids which are going to be communicating through this chat.
+        participants_key: The canonical key of the set of the related users.
         messages_count: The amount of messages that are related to this chat.
+        last_message: The summary of the latest message of this chat.
+        last_activity_at: The delivery time of the latest message of this chat.
     """
     id: int | None
     related_users: list
+    participants_key: str
     messages_count: int
+    last_message: dict | None
+    last_activity_at: str | None
 
     @property
     def representation(self) -> dict:
         """
         Convert the chat entity into a serializable dictionary.
 
-        Used for JSON serialization.
+        Used for JSON serialization. The related users are not copied.
 
         Returns:
             dict: The serializible representation of the Chat entity.
         """
-        return asdict(self)
+        return {
+            'id': self.id,
+            'related_users': self.related_users,
+            'participants_key': self.participants_key,
+            'messages_count': self.messages_count,
+            'last_message': self.last_message,
+            'last_activity_at': self.last_activity_at,
+        }
 
     @classmethod
     def create(cls, related_users: list) -> 'Chat':
@@ -47,5 +60,24 @@ class Chat:
         return Chat(
             id=None,
             related_users=related_users,
+            participants_key=cls.make_participants_key(user_ids=[user.get('id') for user in related_users]),
             messages_count=0,
+            last_message=None,
+            last_activity_at=None,
         )
+
+    @staticmethod
+    def make_participants_key(user_ids: list) -> str:
+        """
+        Make the canonical key of a set of users.
+
+        The key only depends on the ids of the users, so it does not change
+        when the profiles of the users are updated.
+
+        Args:
+            user_ids (list): The ids of the related users in any order.
+
+        Returns:
+            str: The sorted ids joined with colons, e.g. '3:17'.
+        """
+        return ':'.join(str(user_id) for user_id in sorted(user_ids))
@@ -1,4 +1,4 @@
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass
 from datetime import datetime
 
 from settings import settings
@@ -6,7 +6,7 @@ from settings import settings
 from domain.value_objects import MessageStatus, RejectReason
 
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     """
     Domain entity representing a chat message.
@@ -43,12 +43,41 @@ class Message:
         Convert the message entity into a serializable dictionary.
 
         Used for JSON serialization and sending through RabbitMQ.
+        All the fields are scalars, so nothing is copied.
 
         Returns:
             dict: The serializible representation of the Message entity.
         """
-        return asdict(self)
+        return {
+            'id': self.id,
+            'client_message_id': self.client_message_id,
+            'chat_id': self.chat_id,
+            'sender_id': self.sender_id,
+            'recipient_id': self.recipient_id,
+            'status': self.status,
+            'sent_at': self.sent_at,
+            'delivered_at': self.delivered_at,
+            'body': self.body,
+            'is_edited': self.is_edited,
+            'is_deleted': self.is_deleted,
+            'reject_reason': self.reject_reason,
+        }
     
+    @property
+    def summary(self) -> dict:
+        """
+        Get the summary of the message that is kept on its chat as the last message.
+
+        Returns:
+            dict: The id, the snippet of the body, the sender and the sending time of the message.
+        """
+        return {
+            'id': self.id,
+            'snippet': self.body[:settings.last_message_snippet_length],
+            'sender_id': self.sender_id,
+            'sent_at': self.sent_at,
+        }
+
     @property
     def related_users(self) -> dict:
         """
@@ -60,12 +89,14 @@ class Message:
         return [self.sender_id, self.recipient_id]
 
     @classmethod
-    def create(cls, message_data: dict) -> 'Message':
+    def create(cls, message_data: dict, delivered_at: str | None = None) -> 'Message':
         """
         Factory method for constructing a new Message entity.
 
         Args:
             message_data (dict): Clean validated data from the application layer.
+            delivered_at (str | None): The formatted delivery timestamp. It is taken at the
+                moment of creation if not provided, so a batch can share a single timestamp.
 
         Returns:
             Message: A new Message object.
@@ -78,13 +109,38 @@ class Message:
             recipient_id=message_data.get('recipient_id'),
             status=MessageStatus.DELIVERED,
             sent_at=message_data.get('sent_at'),
-            delivered_at=datetime.strftime(datetime.now(), settings.default_datetime_format),
+            delivered_at=delivered_at or cls.get_current_timestamp(),
             body=message_data.get('body'),
             is_edited=False,
             is_deleted=False,
             reject_reason=None,
         )
 
+    @staticmethod
+    def get_current_timestamp() -> str:
+        """
+        Get the current time formatted as a message timestamp.
+
+        Returns:
+            str: The formatted current time.
+        """
+        return datetime.now().strftime(settings.default_datetime_format)
+
+    def is_redelivery_of(self, message_data: dict) -> bool:
+        """
+        Check whether the message is a redelivery of a stored message with the same client_message_id.
+
+        The client_message_id is unique across all the chats and can be reused by another
+        sender, so only a message of the same sender to the same chat is a redelivery.
+
+        Args:
+            message_data (dict): The stored message.
+
+        Returns:
+            bool: True if the stored message has the same sender and chat.
+        """
+        return message_data.get('sender_id') == self.sender_id and message_data.get('chat_id') == self.chat_id
+
     def reject(self, reject_reason: str) -> None:
         self.status = MessageStatus.REJECTED
         self.reject_reason = reject_reason
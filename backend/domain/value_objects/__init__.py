@@ -1,2 +1,4 @@
 from domain.value_objects.message_status import MessageStatus
+from domain.value_objects.profile_update_job_status import ProfileUpdateJobStatus
+from domain.value_objects.pagination_direction import PaginationDirection
 from domain.value_objects.reject_reason import RejectReason
@@ -0,0 +1,9 @@
+from enum import Enum
+
+
+class PaginationDirection(str, Enum):
+    """
+    Represent the direction a cursor paginates in.
+    """
+    BEFORE = 'before'
+    AFTER = 'after'
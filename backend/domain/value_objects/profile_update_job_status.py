@@ -0,0 +1,13 @@
+from enum import Enum
+
+
+class ProfileUpdateJobStatus(str, Enum):
+    """
+    Represents the state of a job that propagates the profile
+    of a user to the chats that such user is related to.
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    COMPLETED = 'completed'
+    SUPERSEDED = 'superseded'
+    FAILED = 'failed'
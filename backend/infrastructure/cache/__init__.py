@@ -0,0 +1 @@
+from infrastructure.cache.lru_cache import LRUCache
@@ -0,0 +1,117 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Hashable
+
+from opentelemetry import metrics
+
+
+meter = metrics.get_meter(__name__)
+
+hits_counter = meter.create_counter(name='cache.hits', description='The amount of cache hits.')
+misses_counter = meter.create_counter(name='cache.misses', description='The amount of cache misses.')
+evictions_counter = meter.create_counter(name='cache.evictions', description='The amount of evicted cache entries.')
+
+
+class LRUCache:
+    """
+    A bounded in-process cache with the least recently used eviction policy
+    and a time to live for every entry.
+
+    An entry can be put with a tag, e.g. the id of the document it is a
+    projection of, so that all the entries of the tag can be removed at once
+    without scanning the cache.
+
+    Hits, misses and evictions are reported as OpenTelemetry counters
+    labeled with the name of the cache.
+    """
+
+    def __init__(self, name: str, max_size: int, ttl: float) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            name (str): The name of the cache that is used to label the metrics.
+            max_size (int): The maximum amount of entries.
+            ttl (float): The amount of seconds an entry stays valid for.
+        """
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.tags = {}
+        self.attributes = {'cache': name}
+
+    def get(self, key: Hashable) -> Any | None:
+        """
+        Get a value by its key.
+
+        Args:
+            key (Hashable): The key of an entry.
+
+        Returns:
+            Any | None: The cached value or None if there is no valid entry for the key.
+        """
+        entry = self.entries.get(key)
+
+        if entry is None:
+            misses_counter.add(1, self.attributes)
+            return None
+
+        value, expires_at, _ = entry
+
+        if expires_at <= monotonic():
+            self.invalidate(key=key)
+            misses_counter.add(1, self.attributes)
+            evictions_counter.add(1, {**self.attributes, 'reason': 'expired'})
+            return None
+
+        self.entries.move_to_end(key)
+        hits_counter.add(1, self.attributes)
+        return value
+
+    def put(self, key: Hashable, value: Any, tag: Hashable | None = None) -> None:
+        """
+        Put a value to the cache evicting the least recently used entry if the cache is full.
+
+        Args:
+            key (Hashable): The key of an entry.
+            value (Any): The value to cache.
+            tag (Hashable | None): The tag the entry can be removed by.
+        """
+        self.invalidate(key=key)
+        self.entries[key] = (value, monotonic() + self.ttl, tag)
+
+        if tag is not None:
+            self.tags.setdefault(tag, set()).add(key)
+
+        while len(self.entries) > self.max_size:
+            self.invalidate(key=next(iter(self.entries)))
+            evictions_counter.add(1, {**self.attributes, 'reason': 'size'})
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Remove an entry by its key.
+
+        Args:
+            key (Hashable): The key of an entry.
+        """
+        entry = self.entries.pop(key, None)
+
+        if entry is None or entry[2] is None:
+            return
+
+        keys = self.tags.get(entry[2])
+        keys.discard(key)
+
+        if not keys:
+            del self.tags[entry[2]]
+
+    def invalidate_tag(self, tag: Hashable) -> None:
+        """
+        Remove all the entries that were put with the tag.
+
+        Args:
+            tag (Hashable): The tag of the entries.
+        """
+        for key in self.tags.pop(tag, ()):
+            self.entries.pop(key, None)
@@ -0,0 +1 @@
+from infrastructure.codecs.json_codec import get_json_codec, json_codec, MsgspecCodec, OrjsonCodec, StandardJSONCodec
@@ -0,0 +1,151 @@
+from json import dumps, JSONDecodeError, loads
+from logging import getLogger
+from typing import Any, Callable
+
+from pydantic import TypeAdapter, ValidationError
+
+from settings import settings
+
+
+class StandardJSONCodec:
+    """
+    The JSON codec that is based on the standard library.
+
+    It is always available and is used as a fallback if none of the faster
+    libraries is installed.
+    """
+    name = 'json'
+    decode_errors = (JSONDecodeError, UnicodeDecodeError)
+    schema_decode_errors = (ValidationError,)
+
+    def decode(self, data: bytes) -> Any:
+        """
+        Parse a JSON document.
+
+        Args:
+            data (bytes): The JSON document in the bytes form.
+
+        Returns:
+            Any: The parsed object.
+        """
+        return loads(data.decode('utf-8'))
+
+    def encode(self, data: Any) -> bytes:
+        """
+        Serialize an object to a JSON document.
+
+        Args:
+            data (Any): The object to serialize.
+
+        Returns:
+            bytes: The JSON document in the bytes form.
+        """
+        return dumps(data).encode('utf-8')
+
+    def create_schema_decoder(self, schema: type) -> Callable[[bytes], Any]:
+        """
+        Create a function that parses a JSON document and validates it against a schema in a single pass.
+
+        The document is parsed and validated by pydantic directly from bytes.
+
+        Args:
+            schema (type): The schema to validate against, e.g. a TypedDict.
+
+        Returns:
+            Callable[[bytes], Any]: The function that raises one of schema_decode_errors if the document is invalid.
+        """
+        return TypeAdapter(schema).validate_json
+
+
+class OrjsonCodec(StandardJSONCodec):
+    """
+    The JSON codec that is based on orjson.
+
+    Parses directly from bytes and serializes directly to bytes.
+    """
+    name = 'orjson'
+
+    def __init__(self) -> None:
+        """
+        Initialize the codec.
+
+        Raises:
+            ImportError: Raisen if orjson is not installed.
+        """
+        import orjson
+
+        self.orjson = orjson
+        self.decode_errors = (orjson.JSONDecodeError,)
+
+    def decode(self, data: bytes) -> Any:
+        return self.orjson.loads(data)
+
+    def encode(self, data: Any) -> bytes:
+        return self.orjson.dumps(data)
+
+
+class MsgspecCodec(StandardJSONCodec):
+    """
+    The JSON codec that is based on msgspec.
+
+    Parses directly from bytes and serializes directly to bytes.
+    """
+    name = 'msgspec'
+
+    def __init__(self) -> None:
+        """
+        Initialize the codec.
+
+        Raises:
+            ImportError: Raisen if msgspec is not installed.
+        """
+        import msgspec
+
+        self.msgspec = msgspec
+        self.decoder = msgspec.json.Decoder()
+        self.encoder = msgspec.json.Encoder()
+        self.decode_errors = (msgspec.DecodeError,)
+        self.schema_decode_errors = (msgspec.DecodeError,)
+
+    def decode(self, data: bytes) -> Any:
+        return self.decoder.decode(data)
+
+    def encode(self, data: Any) -> bytes:
+        return self.encoder.encode(data)
+
+    def create_schema_decoder(self, schema: type) -> Callable[[bytes], Any]:
+        return self.msgspec.json.Decoder(schema, strict=False).decode
+
+
+CODECS = {
+    codec.name: codec
+    for codec in (OrjsonCodec, MsgspecCodec, StandardJSONCodec)
+}
+
+
+def get_json_codec(name: str) -> StandardJSONCodec:
+    """
+    Get the JSON codec by its name.
+
+    If the library of the requested codec is not installed, the first available
+    of orjson, msgspec and the standard library is used instead.
+
+    Args:
+        name (str): The name of the codec: orjson, msgspec or json.
+
+    Returns:
+        StandardJSONCodec: An instance of the codec.
+    """
+    preferred_codecs = [CODECS.get(name, StandardJSONCodec), *CODECS.values()]
+
+    for codec in preferred_codecs:
+        try:
+            return codec()
+        except ImportError:
+            getLogger(settings.chats_logger_name).warning(
+                f'The {codec.name} JSON codec is not available, falling back.',
+                extra={'user_id': None, 'event_type': 'JSON codec fallback.'},
+            )
+
+
+json_codec = get_json_codec(name=settings.json_codec)
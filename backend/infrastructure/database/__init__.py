@@ -1 +1,4 @@
 from infrastructure.database.main import DatabaseManager
+from infrastructure.database.query_plan_verifier import QueryPlanVerifier
+from infrastructure.database.participants_key_backfill import ParticipantsKeyBackfill
+from infrastructure.database.unique_indexes_cleanup import UniqueIndexesCleanup
@@ -0,0 +1,64 @@
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+
+INDEXES = {
+    'messages': [
+        IndexModel(
+            [('client_message_id', ASCENDING)],
+            name='client_message_id_unique',
+            unique=True,
+        ),
+        IndexModel(
+            [('chat_id', ASCENDING), ('_id', DESCENDING)],
+            name='chat_id_id',
+        ),
+    ],
+    'chats': [
+        IndexModel(
+            [('id', ASCENDING)],
+            name='id_unique',
+            unique=True,
+        ),
+        IndexModel(
+            [('participants_key', ASCENDING)],
+            name='participants_key_unique',
+            unique=True,
+            partialFilterExpression={'participants_key': {'$exists': True}},
+        ),
+        IndexModel(
+            [
+                ('related_users.id', ASCENDING),
+                ('last_activity_at', DESCENDING),
+                ('id', DESCENDING),
+                ('messages_count', ASCENDING),
+            ],
+            name='related_users_id_last_activity_at_id',
+        ),
+        IndexModel(
+            [('related_users.id', ASCENDING), ('id', ASCENDING)],
+            name='related_users_id_id',
+        ),
+    ],
+    'profile_update_jobs': [
+        IndexModel(
+            [('id', ASCENDING)],
+            name='id_unique',
+            unique=True,
+        ),
+        IndexModel(
+            [('status', ASCENDING), ('lease_expires_at', ASCENDING)],
+            name='status_lease_expires_at',
+        ),
+        IndexModel(
+            [('user_id', ASCENDING), ('status', ASCENDING)],
+            name='user_id_status',
+        ),
+    ],
+    'users': [
+        IndexModel(
+            [('id', ASCENDING)],
+            name='id_unique',
+            unique=True,
+        ),
+    ],
+}
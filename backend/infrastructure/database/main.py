@@ -2,6 +2,8 @@ from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
 
 from settings import settings
 
+from infrastructure.database.indexes import INDEXES
+
 
 class DatabaseManager:
 
@@ -11,9 +13,18 @@ class DatabaseManager:
         self.collections = {
             'messages': None,
             'chats': None,
+            'profile_update_jobs': None,
+            'users': None,
         }
 
     async def start(self) -> None:
+        await self.connect()
+        await self.create_indexes()
+
+    async def connect(self) -> None:
+        """
+        Connect to the database and create the missing collections without creating the indexes.
+        """
         self.client = AsyncIOMotorClient(host=settings.mongo_url)
         self.database = self.client[settings.mongo_database_name]
 
@@ -25,5 +36,14 @@ class DatabaseManager:
             else:
                 self.collections[collection_name] = self.database[collection_name]
 
+    async def create_indexes(self) -> None:
+        """
+        Create the indexes that are required by the repositories queries.
+
+        Index creation is idempotent, so existing indexes are left as they are.
+        """
+        for collection_name, indexes in INDEXES.items():
+            await self.collections[collection_name].create_indexes(indexes)
+
     async def get_collection(self, collection_name) -> AsyncIOMotorCollection:
         return self.collections.get(collection_name)
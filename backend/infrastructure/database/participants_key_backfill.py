@@ -0,0 +1,64 @@
+from logging import getLogger
+
+from pymongo.errors import DuplicateKeyError
+
+from settings import settings
+
+from domain.entities import Chat
+from infrastructure.database.main import DatabaseManager
+
+
+class ParticipantsKeyBackfill:
+    """
+    The backfill of the participants_key of the chats that were created before it was introduced.
+
+    The chats are read in batches and updated one by one, so the backfill can be
+    interrupted and run again. The chats that turn out to duplicate an already keyed
+    chat of the same users are left without the key and reported, since their
+    messages have to be merged manually.
+    """
+
+    def __init__(self, database_manager: DatabaseManager) -> None:
+        """
+        Initialize the backfill.
+
+        Args:
+            database_manager (DatabaseManager): A started database manager.
+        """
+        self.database_manager = database_manager
+        self.logger = getLogger(settings.chats_logger_name)
+
+    async def execute(self) -> tuple:
+        """
+        Set the participants_key of every chat that has none.
+
+        Returns:
+            tuple: The amount of updated chats and the ids of the duplicated chats.
+        """
+        collection = await self.database_manager.get_collection(collection_name=settings.chats_collection_name)
+
+        updated_count = 0
+        duplicated_chat_ids = []
+
+        cursor = collection.find({'participants_key': {'$exists': False}}, {'_id': 1, 'id': 1, 'related_users.id': 1})
+
+        async for chat in cursor.batch_size(settings.chats_stream_batch_size):
+            participants_key = Chat.make_participants_key(
+                user_ids=[related_user.get('id') for related_user in chat.get('related_users', [])],
+            )
+
+            try:
+                result = await collection.update_one(
+                    {'_id': chat.get('_id'), 'participants_key': {'$exists': False}},
+                    {'$set': {'participants_key': participants_key}},
+                )
+            except DuplicateKeyError:
+                duplicated_chat_ids.append(chat.get('id'))
+                self.logger.error(
+                    f'The chat {chat.get("id")} duplicates the chat of the users {participants_key}.',
+                    extra={'user_id': None, 'event_type': 'Duplicated chat found.'},
+                )
+            else:
+                updated_count += result.modified_count
+
+        return updated_count, duplicated_chat_ids
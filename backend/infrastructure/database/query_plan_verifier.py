@@ -0,0 +1,208 @@
+from datetime import datetime, timezone
+
+from bson import ObjectId
+
+from settings import settings
+
+from domain.entities import Chat, Message
+from domain.value_objects import ProfileUpdateJobStatus
+
+from infrastructure.database.main import DatabaseManager
+from infrastructure.exceptions import QueryPlanException
+
+
+class QueryPlanVerifier:
+    """
+    The verifier of the query plans of the repositories queries.
+
+    Runs explain() for every query shape that the repositories issue and
+    fails if any of them is planned as a collection scan or sorts in memory.
+    """
+
+    def __init__(self, database_manager: DatabaseManager) -> None:
+        """
+        Initialize the verifier.
+
+        Args:
+            database_manager (DatabaseManager): A started database manager.
+        """
+        self.database_manager = database_manager
+
+    def make_queries(self) -> list:
+        """
+        Make the queries to verify.
+
+        The queries mirror the ones issued by the repositories, the values are placeholders.
+
+        Returns:
+            list: A list of (collection name, query name, filter, sort) tuples.
+        """
+        user_id = 0
+        chat_id = str(ObjectId())
+        last_activity_at = Message.get_current_timestamp()
+        participants_key = Chat.make_participants_key(user_ids=[user_id, user_id + 1])
+
+        return [
+            (
+                settings.messages_collection_name,
+                'MessagesRepository.get_chat_messages',
+                {
+                    'chat_id': chat_id,
+                    '$or': [{'sender_id': user_id}, {'recipient_id': user_id}],
+                    '_id': {'$lt': ObjectId()},
+                },
+                {'_id': -1},
+            ),
+            (
+                settings.messages_collection_name,
+                'MessagesRepository.get_chat_messages (after)',
+                {
+                    'chat_id': chat_id,
+                    '$or': [{'sender_id': user_id}, {'recipient_id': user_id}],
+                    '_id': {'$gt': ObjectId()},
+                },
+                {'_id': 1},
+            ),
+            (
+                settings.messages_collection_name,
+                'MessagesRepository.get_stored_messages',
+                {'client_message_id': {'$in': [str(ObjectId())]}},
+                None,
+            ),
+            (
+                settings.chats_collection_name,
+                'ChatsRepository.get_or_create_chat',
+                {'participants_key': participants_key},
+                None,
+            ),
+            (
+                settings.chats_collection_name,
+                'ChatsRepository.get_chat',
+                {'id': chat_id},
+                None,
+            ),
+            (
+                settings.chats_collection_name,
+                'ChatsRepository.get_chats_by_ids',
+                {'id': {'$in': [chat_id]}},
+                None,
+            ),
+            (
+                settings.chats_collection_name,
+                'ChatsRepository.get_chats',
+                {'related_users.id': user_id, 'messages_count': {'$gt': 0}},
+                {'last_activity_at': -1, 'id': -1},
+            ),
+            (
+                settings.chats_collection_name,
+                'ChatsRepository.get_chats (cursor)',
+                {
+                    'related_users.id': user_id,
+                    'messages_count': {'$gt': 0},
+                    '$or': [
+                        {'last_activity_at': {'$lt': last_activity_at}},
+                        {'last_activity_at': last_activity_at, 'id': {'$lt': chat_id}},
+                        {'last_activity_at': None},
+                    ],
+                },
+                {'last_activity_at': -1, 'id': -1},
+            ),
+            (
+                settings.chats_collection_name,
+                'ChatsRepository.get_related_chat_ids',
+                {'related_users.id': user_id, 'id': {'$gt': chat_id}},
+                {'id': 1},
+            ),
+            (
+                settings.chats_collection_name,
+                'ChatsRepository.update_related_user',
+                {'id': {'$in': [chat_id]}, 'related_users.id': user_id},
+                None,
+            ),
+            (
+                settings.profile_update_jobs_collection_name,
+                'ProfileUpdateJobsRepository.claim_job',
+                {
+                    'status': {'$in': [ProfileUpdateJobStatus.PENDING, ProfileUpdateJobStatus.RUNNING]},
+                    'lease_expires_at': {'$lte': datetime.now(timezone.utc)},
+                },
+                None,
+            ),
+            (
+                settings.profile_update_jobs_collection_name,
+                'ProfileUpdateJobsRepository.create_job',
+                {
+                    'user_id': user_id,
+                    'status': {'$in': [ProfileUpdateJobStatus.PENDING, ProfileUpdateJobStatus.RUNNING]},
+                },
+                None,
+            ),
+            (
+                settings.users_collection_name,
+                'UsersRepository.get_users',
+                {'id': {'$in': [user_id]}},
+                None,
+            ),
+        ]
+
+    async def explain(self, collection_name: str, filters: dict, sort: dict | None) -> dict:
+        """
+        Explain a single query.
+
+        Returns:
+            dict: The winning plan of the query.
+        """
+        collection = await self.database_manager.get_collection(collection_name=collection_name)
+
+        cursor = collection.find(filters)
+
+        if sort is not None:
+            cursor = cursor.sort(sort)
+
+        explanation = await cursor.explain()
+        return explanation.get('queryPlanner', {}).get('winningPlan', {})
+
+    def contains_stage(self, plan: dict | list, stage_name: str) -> bool:
+        """
+        Check whether any stage of a plan is of the given kind.
+
+        Args:
+            plan (dict | list): A plan or a part of a plan.
+            stage_name (str): The name of the stage, e.g. COLLSCAN.
+
+        Returns:
+            bool: True if such a stage was found, otherwise False.
+        """
+        if isinstance(plan, list):
+            return any(self.contains_stage(plan=stage, stage_name=stage_name) for stage in plan)
+
+        if isinstance(plan, dict):
+            if plan.get('stage') == stage_name:
+                return True
+            return any(self.contains_stage(plan=value, stage_name=stage_name) for value in plan.values())
+
+        return False
+
+    async def execute(self) -> None:
+        """
+        Verify the query plans.
+
+        Raises:
+            QueryPlanException: Raisen if at least a single query is planned as a collection scan
+                or sorts in memory.
+        """
+        unindexed_queries = {}
+
+        for collection_name, query_name, filters, sort in self.make_queries():
+            plan = await self.explain(collection_name=collection_name, filters=filters, sort=sort)
+
+            if self.contains_stage(plan=plan, stage_name='COLLSCAN'):
+                unindexed_queries[query_name] = 'The query is planned as a collection scan.'
+            elif self.contains_stage(plan=plan, stage_name='SORT'):
+                unindexed_queries[query_name] = 'The query is sorted in memory.'
+
+        if unindexed_queries:
+            raise QueryPlanException(
+                title='Unindexed queries were found.',
+                details=unindexed_queries,
+            )
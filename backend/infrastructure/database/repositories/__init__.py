@@ -1,2 +1,6 @@
+from infrastructure.database.repositories.cached_chats import CachedChatsRepository
+from infrastructure.database.repositories.cached_users import CachedUsersRepository
 from infrastructure.database.repositories.chats import ChatsRepository
 from infrastructure.database.repositories.messages import MessagesRepository
+from infrastructure.database.repositories.profile_update_jobs import ProfileUpdateJobsRepository
+from infrastructure.database.repositories.users import UsersRepository
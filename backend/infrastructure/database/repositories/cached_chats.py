@@ -0,0 +1,150 @@
+from typing import AsyncIterator
+
+from application.ports import ChatRepositoryPort
+from infrastructure.cache import LRUCache
+
+
+class CachedChatsRepository(ChatRepositoryPort):
+    """
+    The caching decorator of a ChatRepositoryPort implementation.
+
+    Chat membership never changes once a chat is created, so the chats that are
+    looked up by their ids are kept in a bounded in-process cache and reused by
+    the permission checks of both the messages ingestion and the messages retrieval.
+
+    The cached documents are shared between callers and must not be mutated.
+    Counters such as messages_count are not kept up to date in the cache, so the
+    cached chats should only be relied upon for their membership.
+
+    The chats are cached per projection, so a projected chat is never served
+    to a caller that has requested other fields. Every cached copy is tagged
+    with the id of its chat, so all the copies of a chat are dropped at once.
+    """
+
+    def __init__(self, repository: ChatRepositoryPort, cache: LRUCache) -> None:
+        """
+        Initialize the repository.
+
+        Args:
+            repository (ChatRepositoryPort): The repository that is being cached.
+            cache (LRUCache): The cache of chats keyed by their ids.
+        """
+        self.repository = repository
+        self.cache = cache
+
+    async def get_or_create_chat(self, query: dict) -> dict:
+        """
+        Retrieve a chat matching the query or create one.
+
+        The chats that are not found are not cached and the membership of an existing
+        chat does not change, so there is no cached copy to drop.
+        """
+        return await self.repository.get_or_create_chat(query=query)
+
+    def make_cache_key(self, id: str, projection: dict | None) -> tuple:
+        """
+        Make the cache key of a chat fetched with a projection.
+
+        Args:
+            id (str): The identifier of the chat.
+            projection (dict | None): The projection the chat is fetched with.
+
+        Returns:
+            tuple: The identifier of the chat and the hashable form of the projection.
+        """
+        return id, tuple(sorted(projection.items())) if projection else None
+
+    async def get_chat(self, id: str, projection: dict | None = None) -> dict | None:
+        """
+        Retrieve a chat by its string identifier from the cache or from the repository.
+        """
+        key = self.make_cache_key(id=id, projection=projection)
+
+        if (chat := self.cache.get(key=key)) is not None:
+            return chat
+
+        chat = await self.repository.get_chat(id=id, projection=projection)
+
+        if chat is not None:
+            self.cache.put(key=key, value=chat, tag=id)
+
+        return chat
+
+    async def get_chats_by_ids(self, ids: list, projection: dict | None = None) -> list:
+        """
+        Retrieve several chats by their string identifiers.
+
+        Only the chats that are missing in the cache are requested from the repository.
+        """
+        chats = []
+        missing_ids = []
+
+        for id in ids:
+            if (chat := self.cache.get(key=self.make_cache_key(id=id, projection=projection))) is not None:
+                chats.append(chat)
+            else:
+                missing_ids.append(id)
+
+        if missing_ids:
+            for chat in await self.repository.get_chats_by_ids(ids=missing_ids, projection=projection):
+                self.cache.put(
+                    key=self.make_cache_key(id=chat.get('id'), projection=projection),
+                    value=chat,
+                    tag=chat.get('id'),
+                )
+                chats.append(chat)
+
+        return chats
+
+    async def get_chats(self, filters: dict, limit: int, projection: dict | None = None) -> list:
+        """
+        Retrieve up to limit chats matching the given filter criteria, the results are not cached.
+        """
+        return await self.repository.get_chats(filters=filters, limit=limit, projection=projection)
+
+    def stream_chats(self, filters: dict, projection: dict | None = None) -> AsyncIterator[dict]:
+        """
+        Iterate over all the chats matching the given filter criteria, the results are not cached.
+        """
+        return self.repository.stream_chats(filters=filters, projection=projection)
+
+    async def increment_messages_count(self, id: str, last_message: dict, last_activity_at: str) -> None:
+        """
+        Atomically increase the messages_count field of a chat and update its last message.
+        """
+        await self.repository.increment_messages_count(
+            id=id,
+            last_message=last_message,
+            last_activity_at=last_activity_at,
+        )
+
+    async def increment_messages_counts(self, counts: dict, last_messages: dict, last_activity_at: str) -> None:
+        """
+        Atomically increase the messages_count field of several chats at once and update their last messages.
+        """
+        await self.repository.increment_messages_counts(
+            counts=counts,
+            last_messages=last_messages,
+            last_activity_at=last_activity_at,
+        )
+
+    async def get_related_chat_ids(self, user_id: int, after_id: str | None, limit: int) -> list:
+        """
+        Retrieve the identifiers of the chats that the user is related to, the results are not cached.
+        """
+        return await self.repository.get_related_chat_ids(user_id=user_id, after_id=after_id, limit=limit)
+
+    async def update_related_user(self, user_id: int, user_data: dict, chat_ids: list) -> int:
+        """
+        Update the profile of the user in the given chats and drop their cached copies.
+        """
+        updated_chats_count = await self.repository.update_related_user(
+            user_id=user_id,
+            user_data=user_data,
+            chat_ids=chat_ids,
+        )
+
+        for chat_id in chat_ids:
+            self.cache.invalidate_tag(tag=chat_id)
+
+        return updated_chats_count
@@ -0,0 +1,66 @@
+from application.ports import UsersRepositoryPort
+from infrastructure.cache import LRUCache
+
+
+class CachedUsersRepository(UsersRepositoryPort):
+    """
+    The caching decorator of a UsersRepositoryPort implementation.
+
+    The profiles are kept in a bounded in-process cache, so the chats of a page
+    share a single profile object per user and only the missing profiles are
+    requested with a single $in query.
+
+    The cached profiles are shared between callers and must not be mutated.
+    A written profile is dropped from the cache of the instance that has written it,
+    the other instances serve a stale profile for user_profiles_cache_ttl seconds at most.
+    """
+
+    def __init__(self, repository: UsersRepositoryPort, cache: LRUCache) -> None:
+        """
+        Initialize the repository.
+
+        Args:
+            repository (UsersRepositoryPort): The repository that is being cached.
+            cache (LRUCache): The cache of profiles keyed by the ids of their users.
+        """
+        self.repository = repository
+        self.cache = cache
+
+    async def get_users(self, ids: list) -> list:
+        """
+        Retrieve several profiles by the ids of their users.
+
+        Only the profiles that are missing in the cache are requested from the repository.
+        """
+        users = []
+        missing_ids = []
+
+        for id in dict.fromkeys(ids):
+            if (user := self.cache.get(key=id)) is not None:
+                users.append(user)
+            else:
+                missing_ids.append(id)
+
+        if missing_ids:
+            for user in await self.repository.get_users(ids=missing_ids):
+                self.cache.put(key=user.get('id'), value=user)
+                users.append(user)
+
+        return users
+
+    async def save_users(self, users: list) -> None:
+        """
+        Store the profiles of the users that are not stored yet and drop their cached copies.
+        """
+        await self.repository.save_users(users=users)
+
+        for user in users:
+            self.cache.invalidate(key=user.get('id'))
+
+    async def update_user(self, user_id: int, user_data: dict) -> None:
+        """
+        Update or store the profile of a user and drop its cached copy.
+        """
+        await self.repository.update_user(user_id=user_id, user_data=user_data)
+
+        self.cache.invalidate(key=user_id)
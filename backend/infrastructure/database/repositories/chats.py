@@ -1,8 +1,16 @@
-from bson import ObjectId
+from typing import AsyncIterator
 
 from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from settings import settings
 
 from application.ports import ChatRepositoryPort
+from infrastructure.monitoring import measure_stage
+
+
+RECENT_CHATS_SORT = {'last_activity_at': -1, 'id': -1}
 
 
 class ChatsRepository(ChatRepositoryPort):
@@ -27,59 +35,209 @@ class ChatsRepository(ChatRepositoryPort):
         """
         Retrieve a chat matching the query or create one using upsert semantics.
 
+        The query is expected to match by the uniquely indexed participants_key.
+        The document is returned as it is after the upsert, so a created chat is returned as well.
+        If a concurrent upsert has inserted the same chat first, the insert fails
+        with a duplicate key error and the retry finds the inserted chat.
+
         Args:
             query (dict): The parameters passed to find_one_and_update (filter, update, upsert).
 
         Returns:
             dict: The chat document that was found or created.
         """
-        return await self.collection.find_one_and_update(**query)
+        try:
+            return await self.collection.find_one_and_update(**query, return_document=ReturnDocument.AFTER)
+        except DuplicateKeyError:
+            return await self.collection.find_one_and_update(**query, return_document=ReturnDocument.AFTER)
 
-    async def update_id(self, _id: str) -> None:
+    @measure_stage(stage='chat_lookup')
+    async def get_chat(self, id: str, projection: dict | None = None) -> dict | None:
         """
-        Set the string 'id' field on a chat document.
+        Retrieve a chat by its string identifier.
 
         Args:
-            _id (str): The ObjectId (as string) that should be written into the 'id' field.
+            id (str): The chat identifier stored in the 'id' field.
+            projection (dict | None): The fields of the chat to fetch, the whole document if omitted.
+
+        Returns:
+            dict | None: The chat document if found, otherwise None.
         """
-        await self.collection.update_one({'_id': ObjectId(_id)}, {'$set': {'id': _id}})
+        return await self.collection.find_one({'id': id}, projection)
 
-    async def get_chat(self, id: str) -> dict | None:
+    @measure_stage(stage='chat_lookup')
+    async def get_chats_by_ids(self, ids: list, projection: dict | None = None) -> list:
         """
-        Retrieve a chat by its string identifier.
+        Retrieve several chats by their string identifiers with a single query.
 
         Args:
-            id (str): The chat identifier stored in the 'id' field.
+            ids (list): The chat identifiers stored in the 'id' field.
+            projection (dict | None): The fields of the chats to fetch, the whole documents if omitted.
 
         Returns:
-            dict | None: The chat document if found, otherwise None.
+            list: The chat documents that were found.
         """
-        return await self.collection.find_one({'id': id})
+        cursor = self.collection.find({'id': {'$in': ids}}, projection)
+        return await cursor.to_list(length=None)
 
-    async def get_chats(self, filters: dict) -> list:
+    @measure_stage(stage='get_chats')
+    async def get_chats(self, filters: dict, limit: int, projection: dict | None = None) -> list:
         """
-        Retrieve all chats matching the given filter criteria.
+        Retrieve up to limit chats matching the given filter criteria, the most recently active first.
+
+        The chats are sorted by the related_users_id_last_activity_at_id index.
 
         Args:
             filters (dict): The filter parameters for the MongoDB query.
+            limit (int): The maximum amount of chats to retrieve.
+            projection (dict | None): The fields of the chats to fetch, the whole documents if omitted.
 
         Returns:
             list: A list of chat documents.
         """
-        cursor = self.collection.find(filters)
+        cursor = self.collection.find(filters, projection).sort(RECENT_CHATS_SORT).limit(limit)
         return await cursor.to_list(length=None)
-    
-    async def increment_messages_count(self, id: str) -> None:
+
+    async def stream_chats(self, filters: dict, projection: dict | None = None) -> AsyncIterator[dict]:
+        """
+        Iterate over all the chats matching the given filter criteria in the order of get_chats.
+
+        The chats are fetched from the server in batches of chats_stream_batch_size,
+        so only a single batch is held in memory at a time.
+
+        Args:
+            filters (dict): The filter parameters for the MongoDB query.
+            projection (dict | None): The fields of the chats to fetch, the whole documents if omitted.
+
+        Yields:
+            dict: A chat document.
+        """
+        cursor = self.collection.find(filters, projection).sort(RECENT_CHATS_SORT)
+
+        async for chat in cursor.batch_size(settings.chats_stream_batch_size):
+            yield chat
+
+    def make_messages_update(self, count: int, last_message: dict, last_activity_at: str) -> list:
+        """
+        Make the update that increases the messages_count of a chat and updates its last message.
+
+        The update is a pipeline, so the last message is compared with the current
+        last_activity_at of the chat within the same atomic write. A message that is
+        stored after a more recent one does not overwrite it. The summary is passed
+        as a literal, so a snippet starting with a $ is not read as a field path.
+
+        Args:
+            count (int): The amount the messages_count should be increased by.
+            last_message (dict): The summary of the latest stored message.
+            last_activity_at (str): The delivery time of the latest stored message.
+
+        Returns:
+            list: The update pipeline.
         """
-        Atomically increase the messages_count field of a chat.
+        current_last_activity_at = {'$ifNull': ['$last_activity_at', '']}
+
+        return [
+            {
+                '$set': {
+                    'messages_count': {'$add': [{'$ifNull': ['$messages_count', 0]}, count]},
+                    'last_message': {
+                        '$cond': {
+                            'if': {'$gte': [last_activity_at, current_last_activity_at]},
+                            'then': {'$literal': last_message},
+                            'else': '$last_message',
+                        },
+                    },
+                    'last_activity_at': {'$max': [current_last_activity_at, last_activity_at]},
+                },
+            },
+        ]
+
+    @measure_stage(stage='increment_counts')
+    async def increment_messages_count(self, id: str, last_message: dict, last_activity_at: str) -> None:
+        """
+        Atomically increase the messages_count field of a chat and update its last message.
 
         Args:
             id (str): The identifier of the chat whose message counter should be incremented.
+            last_message (dict): The summary of the stored message.
+            last_activity_at (str): The delivery time of the stored message.
+        """
+        await self.collection.update_one(
+            {'id': id},
+            self.make_messages_update(count=1, last_message=last_message, last_activity_at=last_activity_at),
+        )
+
+    @measure_stage(stage='increment_counts')
+    async def increment_messages_counts(self, counts: dict, last_messages: dict, last_activity_at: str) -> None:
+        """
+        Atomically increase the messages_count field of several chats and update their
+        last messages with a single bulk_write.
+
+        Args:
+            counts (dict): A mapping of chat identifiers to the amount their counters should be increased by.
+            last_messages (dict): A mapping of chat identifiers to the summaries of their latest stored messages.
+            last_activity_at (str): The delivery time of the stored messages.
+        """
+        operations = [
+            UpdateOne(
+                {'id': id},
+                self.make_messages_update(
+                    count=count,
+                    last_message=last_messages.get(id),
+                    last_activity_at=last_activity_at,
+                ),
+            )
+            for id, count in counts.items()
+        ]
+
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+
+    async def get_related_chat_ids(self, user_id: int, after_id: str | None, limit: int) -> list:
+        """
+        Retrieve the identifiers of the chats that the user is related to in ascending order.
+
+        The query is served by the related_users_id_id index.
+
+        Args:
+            user_id (int): The id of the user.
+            after_id (str | None): The identifier after which the chats are retrieved, from the first one if omitted.
+            limit (int): The maximum amount of identifiers to retrieve.
+
+        Returns:
+            list: The identifiers of the chats.
         """
-        await self.collection.update_one({'id': id}, {'$inc': {'messages_count': 1}})
+        filters = {'related_users.id': user_id}
 
-    async def update_related_user(self, user_id: int, user_data: dict) -> None:
+        if after_id is not None:
+            filters.update({'id': {'$gt': after_id}})
+
+        cursor = self.collection.find(filters, {'_id': 0, 'id': 1}).sort({'id': 1}).limit(limit)
+        return [chat.get('id') for chat in await cursor.to_list(length=None)]
+
+    async def update_related_user(self, user_id: int, user_data: dict, chat_ids: list) -> int:
         """
-        Updates all chats that the user with the provided user_id is related to.
+        Update the profile of the user in the given chats with a single update_many.
+
+        The embedded user is matched with arrayFilters and only the provided fields
+        are set, so the rest of the embedded document is left intact.
+
+        Args:
+            user_id (int): The id of the user.
+            user_data (dict): The fields of the profile to update, the id is not updated.
+            chat_ids (list): The identifiers of the chats to update.
+
+        Returns:
+            int: The amount of updated chats.
         """
-        await self.collection.update_many({'related_users.id': user_id}, {'$set': {'related_users.$': user_data}})
+        update = {
+            f'related_users.$[user].{field}': value for field, value in user_data.items() if field != 'id'
+        }
+
+        result = await self.collection.update_many(
+            {'id': {'$in': chat_ids}, 'related_users.id': user_id},
+            {'$set': update},
+            array_filters=[{'user.id': user_id}],
+        )
+
+        return result.modified_count
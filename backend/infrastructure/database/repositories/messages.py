@@ -1,11 +1,13 @@
 from bson import ObjectId
 
 from motor.motor_asyncio import AsyncIOMotorCollection
-from pymongo import ReturnDocument
-
-from settings import settings
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 
 from application.ports import MessagesRepositoryPort
+from infrastructure.monitoring import measure_stage
+
+
+DUPLICATE_KEY_ERROR_CODE = 11000
 
 
 class MessagesRepository(MessagesRepositoryPort):
@@ -26,70 +28,128 @@ class MessagesRepository(MessagesRepositoryPort):
         """
         self.collection = collection
 
-    async def message_exists(self, filters: dict) -> bool:
+    @measure_stage(stage='insert')
+    async def create_message(self, message: dict) -> bool:
         """
-        Check whether a message matching the given filters exists.
+        Insert a new message into the collection.
+
+        The _id of the document is derived from the client-side allocated 'id'
+        of the message, so no follow-up write is required. Duplicates are rejected
+        by the unique index on client_message_id.
 
         Args:
-            filters (dict): Filter parameters used to locate the message.
+            message (dict): The message document to be persisted.
 
         Returns:
-            bool: True if a matching message exists, otherwise False.
+            bool: True if the message was inserted, False if it is a duplicate.
         """
-        if await self.collection.find_one(filters, projection={'_id': 1}) is not None:
-            return True
-        return False
-
-    async def create_message(self, message: dict) -> str:
+        try:
+            await self.collection.insert_one(document=self.make_document(message=message))
+        except DuplicateKeyError:
+            return False
+        return True
+
+    @measure_stage(stage='insert')
+    async def create_messages(self, messages: list) -> set:
         """
-        Insert a new message into the collection.
+        Insert a batch of new messages into the collection with a single unordered insert_many.
+
+        The _ids of the documents are derived from the client-side allocated 'id'
+        of the messages, so no follow-up write is required. Duplicates are rejected
+        by the unique index on client_message_id and reported back by their positions,
+        the rest of the batch is inserted regardless.
 
         Args:
-            message (dict): The message document to be persisted.
+            messages (list): The message documents to be persisted.
 
         Returns:
-            str: The identifier of the newly created message.
+            set: The positions of the messages that were not inserted as duplicates.
+
+        Raises:
+            BulkWriteError: Raisen if any document failed for a reason other than a duplicate key.
         """
-        result = await self.collection.insert_one(document=message)
-        return str(result.inserted_id)
+        documents = [self.make_document(message=message) for message in messages]
+
+        try:
+            await self.collection.insert_many(documents=documents, ordered=False)
+        except BulkWriteError as exception:
+            write_errors = exception.details.get('writeErrors', [])
 
-    async def update_id(self, _id: str) -> dict | None:
+            if exception.details.get('writeConcernErrors') or any(
+                error.get('code') != DUPLICATE_KEY_ERROR_CODE for error in write_errors
+            ):
+                raise
+
+            return {error.get('index') for error in write_errors}
+        return set()
+
+    def make_document(self, message: dict) -> dict:
         """
-        Set the string 'id' field on a message document.
+        Make a MongoDB document out of a message.
 
         Args:
-            _id (str): The ObjectId (as string) that will be written into the 'id' field.
+            message (dict): A message with the string 'id' already set.
+
+        Returns:
+            dict: The pending message document with the matching ObjectId as its _id.
         """
-        return await self.collection.find_one_and_update(
-            {'_id': ObjectId(_id)},
-            {'$set': {'id': _id}},
-            return_document=ReturnDocument.AFTER,
-        )
+        return {'_id': ObjectId(message.get('id')), **message, 'chat_updated': False}
 
-    async def get_chat_messages(self, filters: dict) -> list:
+    @measure_stage(stage='stored_messages_lookup')
+    async def get_stored_messages(self, client_message_ids: list) -> list:
         """
-        Retrieve a limited number of chat messages using given filters,
-        sorted by newest first.
+        Retrieve the stored messages by their client_message_ids with a single query.
+
+        The messages that were stored before the 'chat_updated' flag was introduced
+        have already been applied to their chats, so the flag defaults to True.
 
         Args:
-            filters (dict): Query parameters used to filter messages.
+            client_message_ids (list): The client_message_ids of the messages.
 
         Returns:
-            list: A list of message documents.
+            list: The stored messages along with their 'chat_updated' flags.
         """
-        cursor = self.collection.find(filters).sort({'_id': -1}).limit(settings.messages_limit)
-        return await cursor.to_list(length=None)
-    
-    async def previous_messages_exist(self, _id: str) -> bool:
+        cursor = self.collection.find({'client_message_id': {'$in': client_message_ids}}, {'_id': 0})
+
+        return [
+            {**message, 'chat_updated': message.get('chat_updated', True)}
+            for message in await cursor.to_list(length=None)
+        ]
+
+    @measure_stage(stage='mark_chats_updated')
+    async def mark_chats_updated(self, ids: list) -> None:
         """
-        Check if older messages exist before the given message ID.
+        Mark the stored messages as applied to their chats with a single update_many.
 
         Args:
-            _id (str): The identifier used as the pagination reference.
+            ids (list): The identifiers of the messages.
+        """
+        if ids:
+            await self.collection.update_many(
+                {'_id': {'$in': [ObjectId(id) for id in ids]}},
+                {'$set': {'chat_updated': True}},
+            )
+
+    @measure_stage(stage='get_chat_messages')
+    async def get_chat_messages(
+        self,
+        filters: dict,
+        limit: int,
+        ascending: bool = False,
+        projection: dict | None = None,
+    ) -> list:
+        """
+        Retrieve a limited number of chat messages using given filters,
+        sorted by newest first unless ascending order is requested.
+
+        Args:
+            filters (dict): Query parameters used to filter messages.
+            limit (int): The maximum amount of messages to retrieve.
+            ascending (bool): Whether the messages should be sorted oldest first.
+            projection (dict | None): The fields of the messages to fetch, the whole documents if omitted.
 
         Returns:
-            bool: True if older messages exist, otherwise False.
+            list: A list of message documents.
         """
-        if await self.collection.find_one({'_id': {'$lt': ObjectId(_id)}}, projection={'_id': 1}) is not None:
-            return True
-        return False
+        cursor = self.collection.find(filters, projection).sort({'_id': 1 if ascending else -1}).limit(limit)
+        return await cursor.to_list(length=None)
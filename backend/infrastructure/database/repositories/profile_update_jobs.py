@@ -0,0 +1,143 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ReturnDocument
+
+from settings import settings
+
+from application.ports import ProfileUpdateJobsRepositoryPort
+from domain.value_objects import ProfileUpdateJobStatus
+
+
+UNFINISHED_STATUSES = [ProfileUpdateJobStatus.PENDING, ProfileUpdateJobStatus.RUNNING]
+
+
+class ProfileUpdateJobsRepository(ProfileUpdateJobsRepositoryPort):
+    """
+    MongoDB implementation of the ProfileUpdateJobsRepositoryPort.
+
+    A lease is held by the worker whose lease_owner token is stored on the job
+    until lease_expires_at. Every write of a worker is conditioned on its token,
+    so a worker that has lost its lease can not overwrite the progress of another one.
+    """
+
+    def __init__(self, collection: AsyncIOMotorCollection) -> None:
+        """
+        Initialize the repository with a MongoDB collection.
+
+        Args:
+            collection (AsyncIOMotorCollection): The MongoDB collection for profile update jobs.
+        """
+        self.collection = collection
+
+    def get_current_time(self) -> datetime:
+        return datetime.now(timezone.utc)
+
+    def get_lease_expiration_time(self) -> datetime:
+        return self.get_current_time() + timedelta(seconds=settings.profile_update_lease_duration)
+
+    async def create_job(self, user_id: int, user_data: dict, status: str = ProfileUpdateJobStatus.PENDING) -> dict:
+        """
+        Create a job and supersede the unfinished jobs of the same user.
+
+        A pending job is claimable right away.
+
+        Args:
+            user_id (int): The id of the user whose profile is propagated.
+            user_data (dict): The profile of the user.
+            status (str): The initial status, a job that needs no processing is created as completed.
+
+        Returns:
+            dict: The created job.
+        """
+        await self.collection.update_many(
+            {'user_id': user_id, 'status': {'$in': UNFINISHED_STATUSES}},
+            {'$set': {'status': ProfileUpdateJobStatus.SUPERSEDED, 'finished_at': self.get_current_time()}},
+        )
+
+        created_at = self.get_current_time()
+        job = {
+            'id': str(ObjectId()),
+            'user_id': user_id,
+            'user_data': user_data,
+            'status': status,
+            'last_chat_id': None,
+            'updated_chats_count': 0,
+            'created_at': created_at,
+            'finished_at': None if status == ProfileUpdateJobStatus.PENDING else created_at,
+            'lease_owner': None,
+            'lease_expires_at': created_at,
+        }
+
+        await self.collection.insert_one(document={'_id': ObjectId(job.get('id')), **job})
+
+        return job
+
+    async def get_job(self, id: str) -> dict | None:
+        """
+        Retrieve a job by its identifier.
+
+        Args:
+            id (str): The identifier of the job.
+
+        Returns:
+            dict | None: The job if found, otherwise None.
+        """
+        return await self.collection.find_one({'id': id}, {'_id': 0})
+
+    async def claim_job(self) -> dict | None:
+        """
+        Claim a pending job or a running job whose lease has expired with a single atomic update.
+
+        Returns:
+            dict | None: The claimed job with its lease_owner set, or None if there is nothing to claim.
+        """
+        return await self.collection.find_one_and_update(
+            {'status': {'$in': UNFINISHED_STATUSES}, 'lease_expires_at': {'$lte': self.get_current_time()}},
+            {
+                '$set': {
+                    'status': ProfileUpdateJobStatus.RUNNING,
+                    'lease_owner': str(uuid4()),
+                    'lease_expires_at': self.get_lease_expiration_time(),
+                },
+            },
+            projection={'_id': 0},
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def record_progress(self, job: dict, last_chat_id: str, updated_chats_count: int) -> bool:
+        """
+        Record a processed chunk of a claimed job and renew its lease.
+
+        Args:
+            job (dict): The claimed job.
+            last_chat_id (str): The identifier of the last processed chat.
+            updated_chats_count (int): The amount of chats that were updated in the chunk.
+
+        Returns:
+            bool: True if the lease is still held, False if the job was superseded or claimed by another worker.
+        """
+        result = await self.collection.update_one(
+            {'id': job.get('id'), 'status': ProfileUpdateJobStatus.RUNNING, 'lease_owner': job.get('lease_owner')},
+            {
+                '$set': {'last_chat_id': last_chat_id, 'lease_expires_at': self.get_lease_expiration_time()},
+                '$inc': {'updated_chats_count': updated_chats_count},
+            },
+        )
+
+        return result.modified_count == 1
+
+    async def finish_job(self, job: dict, status: str) -> None:
+        """
+        Mark a claimed job as finished unless the lease has been lost.
+
+        Args:
+            job (dict): The claimed job.
+            status (str): The final status of the job.
+        """
+        await self.collection.update_one(
+            {'id': job.get('id'), 'status': ProfileUpdateJobStatus.RUNNING, 'lease_owner': job.get('lease_owner')},
+            {'$set': {'status': status, 'finished_at': self.get_current_time(), 'lease_owner': None}},
+        )
@@ -0,0 +1,65 @@
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import UpdateOne
+
+from application.ports import UsersRepositoryPort
+from infrastructure.monitoring import measure_stage
+
+
+class UsersRepository(UsersRepositoryPort):
+    """
+    MongoDB implementation of the UsersRepositoryPort.
+
+    The profiles are stored as received from the authentication service
+    and are matched by the uniquely indexed 'id' field.
+    """
+
+    def __init__(self, collection: AsyncIOMotorCollection) -> None:
+        """
+        Initialize the repository with a MongoDB collection.
+
+        Args:
+            collection (AsyncIOMotorCollection): The MongoDB collection for users.
+        """
+        self.collection = collection
+
+    @measure_stage(stage='users_lookup')
+    async def get_users(self, ids: list) -> list:
+        """
+        Retrieve several profiles by the ids of their users with a single query.
+
+        Args:
+            ids (list): The ids of the users.
+
+        Returns:
+            list: The profiles that were found.
+        """
+        cursor = self.collection.find({'id': {'$in': ids}}, {'_id': 0})
+        return await cursor.to_list(length=None)
+
+    async def save_users(self, users: list) -> None:
+        """
+        Insert the profiles of the users that are not stored yet with a single bulk_write.
+
+        The stored profiles are left as they are, since they are kept up to date by
+        update_user and the profiles fetched from the authentication service may be cached.
+
+        Args:
+            users (list): The profiles of the users.
+        """
+        operations = [
+            UpdateOne({'id': user.get('id')}, {'$setOnInsert': user}, upsert=True)
+            for user in users
+        ]
+
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+
+    async def update_user(self, user_id: int, user_data: dict) -> None:
+        """
+        Update the profile of a user or store it if it is not stored yet.
+
+        Args:
+            user_id (int): The id of the user.
+            user_data (dict): The profile of the user.
+        """
+        await self.collection.update_one({'id': user_id}, {'$set': user_data}, upsert=True)
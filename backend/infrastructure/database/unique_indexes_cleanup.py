@@ -0,0 +1,160 @@
+from logging import getLogger
+
+from settings import settings
+
+from infrastructure.database.main import DatabaseManager
+
+
+class UniqueIndexesCleanup:
+    """
+    The pre-check and the cleanup of the documents that prevent the unique indexes from being created.
+
+    The messages were deduplicated with a racy existence check and the chats were
+    inserted before their 'id' was set with a follow-up write, so the data stored
+    before the unique indexes were introduced may contain:
+    - Messages that were stored several times with the same client_message_id.
+    - Messages without a client_message_id.
+    - Chats without an 'id'.
+    - Chats that share an 'id'.
+
+    Without fix the problems are only reported. With fix the later copies of every
+    duplicated message are deleted and the messages_count of their chats is decreased
+    accordingly, while the messages without a client_message_id and the chats without
+    an 'id' get the string form of their _id. The chats that share an 'id' are only
+    reported, since their messages have to be merged manually.
+    The cleanup can be interrupted and run again.
+    """
+
+    def __init__(self, database_manager: DatabaseManager) -> None:
+        """
+        Initialize the cleanup.
+
+        Args:
+            database_manager (DatabaseManager): A connected database manager, the indexes are not required.
+        """
+        self.database_manager = database_manager
+        self.logger = getLogger(settings.chats_logger_name)
+
+    async def find_duplicates(self, collection_name: str, field: str) -> list:
+        """
+        Find the groups of documents that share a value of a field.
+
+        Args:
+            collection_name (str): The name of the collection.
+            field (str): The field that is uniquely indexed.
+
+        Returns:
+            list: The groups with the shared value as '_id' and the _ids of the documents in ascending order.
+        """
+        collection = await self.database_manager.get_collection(collection_name=collection_name)
+
+        cursor = collection.aggregate(
+            [
+                {'$match': {field: {'$exists': True, '$ne': None}}},
+                {'$group': {'_id': f'${field}', 'ids': {'$push': '$_id'}, 'count': {'$sum': 1}}},
+                {'$match': {'count': {'$gt': 1}}},
+            ],
+            allowDiskUse=True,
+        )
+
+        return [
+            {'_id': group.get('_id'), 'ids': sorted(group.get('ids'))}
+            for group in await cursor.to_list(length=None)
+        ]
+
+    async def delete_duplicated_messages(self, groups: list) -> int:
+        """
+        Keep the first stored copy of every duplicated message and delete the rest.
+
+        Every deleted copy was counted by its chat, so the messages_count is decreased by one per copy.
+
+        Args:
+            groups (list): The groups of the duplicated messages.
+
+        Returns:
+            int: The amount of deleted messages.
+        """
+        collection = await self.database_manager.get_collection(collection_name=settings.messages_collection_name)
+        chats_collection = await self.database_manager.get_collection(collection_name=settings.chats_collection_name)
+
+        deleted_count = 0
+
+        for group in groups:
+            duplicated_ids = group.get('ids')[1:]
+            chat_ids = [
+                message.get('chat_id')
+                async for message in collection.find({'_id': {'$in': duplicated_ids}}, {'_id': 0, 'chat_id': 1})
+            ]
+
+            result = await collection.delete_many({'_id': {'$in': duplicated_ids}})
+            deleted_count += result.deleted_count
+
+            for chat_id in chat_ids:
+                await chats_collection.update_one({'id': chat_id}, {'$inc': {'messages_count': -1}})
+
+        return deleted_count
+
+    async def set_missing_values(self, collection_name: str, field: str, fix: bool) -> int:
+        """
+        Count the documents without a value of a uniquely indexed field and set it
+        to the string form of their _id if requested.
+
+        Args:
+            collection_name (str): The name of the collection.
+            field (str): The field that is uniquely indexed.
+            fix (bool): Whether the values should be set.
+
+        Returns:
+            int: The amount of documents without a value.
+        """
+        collection = await self.database_manager.get_collection(collection_name=collection_name)
+        filters = {'$or': [{field: {'$exists': False}}, {field: None}]}
+
+        if not fix:
+            return await collection.count_documents(filters)
+
+        result = await collection.update_many(filters, [{'$set': {field: {'$toString': '$_id'}}}])
+
+        return result.modified_count
+
+    async def execute(self, fix: bool = False) -> dict:
+        """
+        Report and optionally fix the documents that prevent the unique indexes from being created.
+
+        Args:
+            fix (bool): Whether the problems that can be fixed automatically should be fixed.
+
+        Returns:
+            dict: The amount of the found or fixed problems of every kind and the ids of the duplicated chats.
+        """
+        duplicated_messages = await self.find_duplicates(
+            collection_name=settings.messages_collection_name,
+            field='client_message_id',
+        )
+        duplicated_chats = await self.find_duplicates(collection_name=settings.chats_collection_name, field='id')
+
+        report = {
+            'duplicated_messages': sum(len(group.get('ids')) - 1 for group in duplicated_messages),
+            'messages_without_client_message_id': await self.set_missing_values(
+                collection_name=settings.messages_collection_name,
+                field='client_message_id',
+                fix=fix,
+            ),
+            'chats_without_id': await self.set_missing_values(
+                collection_name=settings.chats_collection_name,
+                field='id',
+                fix=fix,
+            ),
+            'duplicated_chat_ids': [group.get('_id') for group in duplicated_chats],
+        }
+
+        if fix and duplicated_messages:
+            report['duplicated_messages'] = await self.delete_duplicated_messages(groups=duplicated_messages)
+
+        for chat_id in report.get('duplicated_chat_ids'):
+            self.logger.error(
+                f'Several chats share the id {chat_id}.',
+                extra={'user_id': None, 'event_type': 'Duplicated chat found.'},
+            )
+
+        return report
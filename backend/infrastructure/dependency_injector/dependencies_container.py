@@ -1,12 +1,46 @@
 from dependency_injector.containers import DeclarativeContainer
 from dependency_injector.providers import Singleton
 
+from settings import settings
+
+from infrastructure.cache import LRUCache
 from infrastructure.database import DatabaseManager
+from infrastructure.http import HTTPSessionManager
 from infrastructure.transport import QueueManager
-from infrastructure.rabbitmq import RabbitMQManager
+from infrastructure.rabbitmq import PrefetchController, RabbitMQManager
 
 
 class DependenciesContainer(DeclarativeContainer):
     database_manager = Singleton(DatabaseManager)
     queue_manager = Singleton(QueueManager)
     rabbitmq_manager = Singleton(RabbitMQManager)
+    prefetch_controller = Singleton(
+        PrefetchController,
+        rabbitmq_manager=rabbitmq_manager,
+        queue_manager=queue_manager,
+    )
+    http_session_manager = Singleton(HTTPSessionManager)
+    chats_cache = Singleton(
+        LRUCache,
+        name='chats',
+        max_size=settings.chats_cache_max_size,
+        ttl=settings.chats_cache_ttl,
+    )
+    users_info_cache = Singleton(
+        LRUCache,
+        name='users_info',
+        max_size=settings.users_info_cache_max_size,
+        ttl=settings.users_info_cache_ttl,
+    )
+    user_profiles_cache = Singleton(
+        LRUCache,
+        name='user_profiles',
+        max_size=settings.user_profiles_cache_max_size,
+        ttl=settings.user_profiles_cache_ttl,
+    )
+    failed_deliveries_cache = Singleton(
+        LRUCache,
+        name='failed_deliveries',
+        max_size=settings.failed_deliveries_cache_max_size,
+        ttl=settings.failed_deliveries_cache_ttl,
+    )
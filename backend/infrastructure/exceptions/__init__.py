@@ -1 +1 @@
-from infrastructure.exceptions.exceptions import AuthenticationException
+from infrastructure.exceptions.exceptions import AuthenticationException, QueryPlanException
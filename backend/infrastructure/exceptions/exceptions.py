@@ -6,3 +6,10 @@ class AuthenticationException(BaseException):
     The exception to be raisen if something goes wrong while authentication process.
     """
     ...
+
+
+class QueryPlanException(BaseException):
+    """
+    The exception to be raisen if a database query is planned as a collection scan.
+    """
+    ...
@@ -1,39 +1,74 @@
 from http import HTTPStatus
 
 from dependency_injector.wiring import inject, Provide
-from fastapi import APIRouter, Depends, Response
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 
 from settings import settings
 
+from application.outgoing_dtos import OutgoingChatsDTO
+from infrastructure.cache import LRUCache
+from infrastructure.codecs import json_codec
 from infrastructure.database import DatabaseManager
-from infrastructure.database.repositories import ChatsRepository
+from infrastructure.database.repositories import (
+    CachedChatsRepository,
+    CachedUsersRepository,
+    ChatsRepository,
+    ProfileUpdateJobsRepository,
+    UsersRepository,
+)
 from infrastructure.dependencies import retrieve_user_id
 from infrastructure.dependency_injector import DependenciesContainer
-from infrastructure.http import GetUsersInfo
+from infrastructure.http import GetUsersInfo, HTTPSessionManager
 from infrastructure.incoming_dtos import CreateChatDataDTO, UpdateChatRelatedUser
-from interface_adapters.controllers import CreateChatController, GetChatsController, UpdateChatRelatedUserController
-from interface_adapters.outgoing_dtos import ChatOUTDTO
+from interface_adapters.controllers import (
+    CreateChatController,
+    GetChatsController,
+    GetProfileUpdateJobController,
+    UpdateChatRelatedUserController,
+)
+from interface_adapters.outgoing_dtos import ChatOUTDTO, ProfileUpdateJobOUTDTO
 
 
 chats_router = APIRouter(prefix='/chats')
 
+async def make_users_repo(database_manager: DatabaseManager, cache: LRUCache) -> CachedUsersRepository | None:
+    """
+    Make the repository of the profiles of users if the profiles are normalized.
+
+    Returns:
+        CachedUsersRepository | None: The repository or None if the profiles are embedded in the chats.
+    """
+    if not settings.normalized_user_profiles_enabled:
+        return None
+
+    collection = await database_manager.get_collection(collection_name=settings.users_collection_name)
+
+    return CachedUsersRepository(repository=UsersRepository(collection=collection), cache=cache)
+
 @chats_router.post('/')
 @inject
 async def create_chat(
     create_chat_data: CreateChatDataDTO,
     user_id: int = Depends(retrieve_user_id),
     database_manager: DatabaseManager = Depends(Provide[DependenciesContainer.database_manager]),
+    chats_cache: LRUCache = Depends(Provide[DependenciesContainer.chats_cache]),
+    http_session_manager: HTTPSessionManager = Depends(Provide[DependenciesContainer.http_session_manager]),
+    users_info_cache: LRUCache = Depends(Provide[DependenciesContainer.users_info_cache]),
+    user_profiles_cache: LRUCache = Depends(Provide[DependenciesContainer.user_profiles_cache]),
 ) -> ChatOUTDTO:
     """
     Create a chat.
     """
     collection = await database_manager.get_collection(collection_name=settings.chats_collection_name)
+    session = await http_session_manager.get_session()
 
     controller = CreateChatController(
         user_id=user_id,
         create_chat_data=create_chat_data.model_dump(),
-        database_repo=ChatsRepository(collection=collection),
-        users_info_port=GetUsersInfo(),
+        database_repo=CachedChatsRepository(repository=ChatsRepository(collection=collection), cache=chats_cache),
+        users_info_port=GetUsersInfo(session=session, cache=users_info_cache),
+        users_repo=await make_users_repo(database_manager=database_manager, cache=user_profiles_cache),
     )
 
     return await controller.create_chat()
@@ -41,37 +76,101 @@ async def create_chat(
 @chats_router.get('/get-chats')
 @inject
 async def get_chats(
+    cursor: str | None = None,
+    limit: int = Query(default=settings.chats_limit, ge=1, le=settings.max_chats_limit),
     user_id: int = Depends(retrieve_user_id),
-    database_manager: DatabaseManager = Depends(Provide[DependenciesContainer.database_manager])
-) -> list:
+    database_manager: DatabaseManager = Depends(Provide[DependenciesContainer.database_manager]),
+    chats_cache: LRUCache = Depends(Provide[DependenciesContainer.chats_cache]),
+    user_profiles_cache: LRUCache = Depends(Provide[DependenciesContainer.user_profiles_cache]),
+) -> OutgoingChatsDTO:
     """
     Get user's chats.
+
+    Returns up to limit chats after the cursor, the most recently active first.
+    Without a cursor the first page is returned.
     """
     collection = await database_manager.get_collection(collection_name=settings.chats_collection_name)
     controller = GetChatsController(
         user_id=user_id,
-        database_repo=ChatsRepository(collection=collection),
+        database_repo=CachedChatsRepository(repository=ChatsRepository(collection=collection), cache=chats_cache),
+        cursor=cursor,
+        limit=limit,
+        users_repo=await make_users_repo(database_manager=database_manager, cache=user_profiles_cache),
     )
 
     return await controller.get_chats()
 
-@chats_router.post('/update-chat-related-user')
+@chats_router.get('/stream-chats')
+@inject
+async def stream_chats(
+    cursor: str | None = None,
+    user_id: int = Depends(retrieve_user_id),
+    database_manager: DatabaseManager = Depends(Provide[DependenciesContainer.database_manager]),
+    chats_cache: LRUCache = Depends(Provide[DependenciesContainer.chats_cache]),
+    user_profiles_cache: LRUCache = Depends(Provide[DependenciesContainer.user_profiles_cache]),
+) -> StreamingResponse:
+    """
+    Stream all of user's chats after the cursor, if any, as newline delimited JSON.
+
+    Intended for internal consumers, the chats are fetched and sent in batches,
+    so the whole list is never held in memory. The cursor is validated before
+    the response is started.
+    """
+    collection = await database_manager.get_collection(collection_name=settings.chats_collection_name)
+    controller = GetChatsController(
+        user_id=user_id,
+        database_repo=CachedChatsRepository(repository=ChatsRepository(collection=collection), cache=chats_cache),
+        cursor=cursor,
+        users_repo=await make_users_repo(database_manager=database_manager, cache=user_profiles_cache),
+    )
+    chats = await controller.stream_chats()
+
+    async def encode_chats():
+        async for chat in chats:
+            yield json_codec.encode(chat) + b'\n'
+
+    return StreamingResponse(content=encode_chats(), media_type='application/x-ndjson')
+
+@chats_router.post('/update-chat-related-user', status_code=HTTPStatus.ACCEPTED)
 @inject
 async def update_chat_related_user(
     user: UpdateChatRelatedUser,
     user_id: int = Depends(retrieve_user_id),
-    database_manager: DatabaseManager = Depends(Provide(DependenciesContainer.database_manager))
-) -> Response:
+    database_manager: DatabaseManager = Depends(Provide[DependenciesContainer.database_manager]),
+    user_profiles_cache: LRUCache = Depends(Provide[DependenciesContainer.user_profiles_cache]),
+) -> ProfileUpdateJobOUTDTO:
     """
     Update chats that the requesting user is related to.
+
+    The chats are updated in the background, the returned job reports the progress
+    at /chats/profile-update-jobs/{job_id}. If the profiles are normalized the profile
+    is updated right away and the returned job is completed.
     """
-    collection = await database_manager.get_collection(collection_name=settings.chats_collection_name)
+    collection = await database_manager.get_collection(collection_name=settings.profile_update_jobs_collection_name)
     controller = UpdateChatRelatedUserController(
         user_data=user.model_dump(),
         user_id=user_id,
-        database_repo=ChatsRepository(collection=collection),
+        jobs_repo=ProfileUpdateJobsRepository(collection=collection),
+        users_repo=await make_users_repo(database_manager=database_manager, cache=user_profiles_cache),
     )
 
-    await controller.update_chat_related_user()
+    return await controller.update_chat_related_user()
+
+@chats_router.get('/profile-update-jobs/{job_id}')
+@inject
+async def get_profile_update_job(
+    job_id: str,
+    user_id: int = Depends(retrieve_user_id),
+    database_manager: DatabaseManager = Depends(Provide[DependenciesContainer.database_manager]),
+) -> ProfileUpdateJobOUTDTO:
+    """
+    Get the progress of a profile update job of the requesting user.
+    """
+    collection = await database_manager.get_collection(collection_name=settings.profile_update_jobs_collection_name)
+    controller = GetProfileUpdateJobController(
+        job_id=job_id,
+        user_id=user_id,
+        jobs_repo=ProfileUpdateJobsRepository(collection=collection),
+    )
 
-    return Response(status_code=HTTPStatus.NO_CONTENT)
+    return await controller.get_profile_update_job()
@@ -1,10 +1,12 @@
 from dependency_injector.wiring import inject, Provide
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
 from settings import settings
 
+from domain.value_objects import PaginationDirection
+from infrastructure.cache import LRUCache
 from infrastructure.database import DatabaseManager
-from infrastructure.database.repositories import ChatsRepository, MessagesRepository
+from infrastructure.database.repositories import CachedChatsRepository, ChatsRepository, MessagesRepository
 from infrastructure.dependencies.authentication import retrieve_user_id
 from infrastructure.dependency_injector import DependenciesContainer
 from interface_adapters.controllers import GetMessagesController
@@ -17,11 +19,18 @@ messages_router = APIRouter(prefix='/messages')
 async def get_messages(
     chat_id: str,
     cursor: str | None = None,
+    direction: PaginationDirection = PaginationDirection.BEFORE,
+    limit: int = Query(default=settings.messages_limit, ge=1, le=settings.max_messages_limit),
     user_id: int = Depends(retrieve_user_id),
     database_manager: DatabaseManager = Depends(Provide[DependenciesContainer.database_manager]),
+    chats_cache: LRUCache = Depends(Provide[DependenciesContainer.chats_cache]),
 ):
     """
     Get messages of a chat.
+
+    Returns up to limit messages older than the cursor, newest first, or newer than
+    the cursor, oldest first, depending on the direction. Without a cursor the newest
+    messages are returned for the before direction and the oldest ones for the after direction.
     """
     chats_collection = await database_manager.get_collection(collection_name=settings.chats_collection_name)
     messages_collection = await database_manager.get_collection(collection_name=settings.messages_collection_name)
@@ -30,7 +39,9 @@ async def get_messages(
         chat_id = chat_id,
         user_id=user_id,
         cursor=cursor,
-        chats_repo=ChatsRepository(collection=chats_collection),
+        limit=limit,
+        direction=direction,
+        chats_repo=CachedChatsRepository(repository=ChatsRepository(collection=chats_collection), cache=chats_cache),
         messages_repo=MessagesRepository(collection=messages_collection)
     )
 
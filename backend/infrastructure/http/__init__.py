@@ -1 +1,2 @@
 from infrastructure.http.get_users_info import GetUsersInfo
+from infrastructure.http.session_manager import HTTPSessionManager
@@ -7,19 +7,54 @@ from settings import settings
 
 from application.exceptions import UserInfoServiceUnavailableException, UserResponseInvalidException
 from application.ports import GetUsersInfoPort
+from infrastructure.cache import LRUCache
 
 
 class GetUsersInfo(GetUsersInfoPort):
     """
     The service that is responsible for the retrieval of users information
     that is required for the chat creation from the authentication service.
+
+    The information about every user is cached for a short time, so only
+    the users that are missing in the cache are requested.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, session: ClientSession, cache: LRUCache) -> None:
         """
         Initialize the service.
+
+        Args:
+            session (ClientSession): The shared HTTP client session.
+            cache (LRUCache): The cache of users information keyed by user ids.
         """
         self.url = f'{settings.auth_backend_base_url}/users/get-users-info'
+        self.session = session
+        self.cache = cache
+
+    async def execute(self, user_ids: list) -> list:
+        """
+        Execute the retrieval process.
+
+        Take the cached users information and request the rest of it.
+
+        Returns:
+            list: A list of dictionaries containing the info about requested users.
+        """
+        users = {}
+        missing_user_ids = []
+
+        for user_id in user_ids:
+            if (user := self.cache.get(key=user_id)) is not None:
+                users[user_id] = user
+            else:
+                missing_user_ids.append(user_id)
+
+        if missing_user_ids:
+            for user in await self.request_users_info(user_ids=missing_user_ids):
+                self.cache.put(key=user.get('id'), value=user)
+                users[user.get('id')] = user
+
+        return [users[user_id] for user_id in dict.fromkeys(user_ids) if user_id in users]
 
     @on_exception(
         expo,
@@ -27,10 +62,8 @@ class GetUsersInfo(GetUsersInfoPort):
         max_time=30,
         jitter=full_jitter,
     )
-    async def execute(self, user_ids: list) -> list | None:
+    async def request_users_info(self, user_ids: list) -> list:
         """
-        Execute the retrieval process.
-
         Request the endpoint. Retry for 30 seconds if request fails with the jitter.
 
         Returns:
@@ -41,22 +74,21 @@ class GetUsersInfo(GetUsersInfoPort):
             UserResponseInvalidException: Raisen if server responded with an invalid json.
         """
         try:
-            async with ClientSession() as session:
-                async with session.post(url=self.url, json={'user_ids': user_ids}) as response:
-                    try:
-                        response.raise_for_status()
-                    except ClientError:
-                        raise UserInfoServiceUnavailableException(
-                            title='Unprocessable response was returned.',
-                            details={'Unprocessable response code.': 'Returned response with unprocessable code.'},
-                        )
-                    try:
-                        return await response.json()
-                    except ContentTypeError:
-                        raise UserResponseInvalidException(
-                            title='Invalid response received.',
-                            details={'Invalid response.': 'Returned response is not a valid json.'},
-                        )
+            async with self.session.post(url=self.url, json={'user_ids': user_ids}) as response:
+                try:
+                    response.raise_for_status()
+                except ClientError:
+                    raise UserInfoServiceUnavailableException(
+                        title='Unprocessable response was returned.',
+                        details={'Unprocessable response code.': 'Returned response with unprocessable code.'},
+                    )
+                try:
+                    return await response.json()
+                except ContentTypeError:
+                    raise UserResponseInvalidException(
+                        title='Invalid response received.',
+                        details={'Invalid response.': 'Returned response is not a valid json.'},
+                    )
         except (ClientConnectionError, TimeoutError):
             raise UserInfoServiceUnavailableException(
                 title='External server is unavailable.',
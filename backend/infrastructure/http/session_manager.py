@@ -0,0 +1,50 @@
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+
+from settings import settings
+
+
+class HTTPSessionManager:
+    """
+    The manager of the HTTP client session shared by the outgoing HTTP services.
+
+    A single long-lived session keeps the connections to other services alive
+    and reuses them instead of opening a new connection pool for every request.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the manager.
+        """
+        self.session: ClientSession = None
+
+    async def start(self) -> None:
+        """
+        Create the session with a bounded keep-alive connection pool.
+        """
+        connector = TCPConnector(
+            limit=settings.http_connections_limit,
+            limit_per_host=settings.http_connections_limit_per_host,
+            keepalive_timeout=settings.http_keepalive_timeout,
+            ttl_dns_cache=settings.http_dns_cache_ttl,
+        )
+
+        self.session = ClientSession(
+            connector=connector,
+            timeout=ClientTimeout(total=settings.http_request_timeout),
+        )
+
+    async def stop(self) -> None:
+        """
+        Close the session and all of its connections.
+        """
+        if self.session is not None:
+            await self.session.close()
+
+    async def get_session(self) -> ClientSession:
+        """
+        Get the shared session.
+
+        Returns:
+            ClientSession: The shared aiohttp client session.
+        """
+        return self.session
@@ -1,10 +1,14 @@
-from pydantic import BaseModel
+from typing_extensions import TypedDict
 
 
-class IncomingMessageDTO(BaseModel):
+class IncomingMessageDTO(TypedDict):
     """
     The DTO used to validate the incoming data that is received from
     the RabbitMQ to create a Message.
+
+    It is a typed dictionary, so that the body of a message is parsed and
+    validated straight into a plain dictionary in a single pass, without
+    an intermediate model instance.
     """
     client_message_id: str
     chat_id: str
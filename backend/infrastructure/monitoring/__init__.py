@@ -1 +1,17 @@
 from infrastructure.monitoring.main import setup_metrics
+from infrastructure.monitoring.pipeline_metrics import (
+    consume_to_persist_histogram,
+    measure_stage,
+    processed_messages_counter,
+    publish_confirm_histogram,
+    rejected_messages_counter,
+)
+from infrastructure.monitoring.tracing import (
+    finish_consume_span,
+    inject_trace_context,
+    set_message_trace_contexts,
+    setup_tracing,
+    start_consume_span,
+    start_process_span,
+    start_publish_span,
+)
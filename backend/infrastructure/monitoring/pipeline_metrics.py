@@ -0,0 +1,88 @@
+from functools import wraps
+from inspect import iscoroutinefunction
+from time import perf_counter
+from typing import Callable
+
+from opentelemetry import metrics, trace
+
+from infrastructure.monitoring.tracing import tracer
+
+
+meter = metrics.get_meter(__name__)
+
+stage_duration_histogram = meter.create_histogram(
+    name='pipeline.stage.duration',
+    unit='s',
+    description='The duration of a stage of the messages pipeline.',
+)
+consume_to_persist_histogram = meter.create_histogram(
+    name='pipeline.consume_to_persist.duration',
+    unit='s',
+    description='The time from the consumption of a message till it is persisted and its outcome is published.',
+)
+publish_confirm_histogram = meter.create_histogram(
+    name='rabbitmq.publish_confirm.duration',
+    unit='s',
+    description='The time from the publication of a message till its confirmation by the broker.',
+)
+processed_messages_counter = meter.create_counter(
+    name='pipeline.messages.processed',
+    description='The amount of processed messages by their status.',
+)
+rejected_messages_counter = meter.create_counter(
+    name='pipeline.messages.rejected',
+    description='The amount of rejected messages by their reject reason.',
+)
+
+
+def measure_stage(stage: str) -> Callable:
+    """
+    The decorator that records the duration of every call of a function
+    to the pipeline.stage.duration histogram labeled with the stage.
+
+    If the call is made within a recorded span, a child span named after the
+    function is started for it, so unsampled calls cost no more than the timing.
+
+    Both regular and coroutine functions are supported. The duration is recorded
+    even if the function raises.
+
+    Args:
+        stage (str): The name of the stage, e.g. decode, chat_lookup, insert or publish.
+
+    Returns:
+        Callable: The decorator.
+    """
+    attributes = {'stage': stage}
+
+    def decorator(function: Callable) -> Callable:
+        span_name = function.__qualname__
+        span_attributes = {'pipeline.stage': stage}
+
+        if iscoroutinefunction(function):
+            @wraps(function)
+            async def wrapper(*args, **kwargs):
+                started_at = perf_counter()
+                try:
+                    if not trace.get_current_span().is_recording():
+                        return await function(*args, **kwargs)
+
+                    with tracer.start_as_current_span(name=span_name, attributes=span_attributes):
+                        return await function(*args, **kwargs)
+                finally:
+                    stage_duration_histogram.record(perf_counter() - started_at, attributes)
+        else:
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                started_at = perf_counter()
+                try:
+                    if not trace.get_current_span().is_recording():
+                        return function(*args, **kwargs)
+
+                    with tracer.start_as_current_span(name=span_name, attributes=span_attributes):
+                        return function(*args, **kwargs)
+                finally:
+                    stage_duration_histogram.record(perf_counter() - started_at, attributes)
+
+        return wrapper
+
+    return decorator
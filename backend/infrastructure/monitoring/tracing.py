@@ -0,0 +1,182 @@
+from contextvars import ContextVar
+from typing import Iterable
+
+from aio_pika.abc import AbstractIncomingMessage
+from opentelemetry import trace
+from opentelemetry.context import Context
+from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+from opentelemetry.propagate import extract, inject
+from opentelemetry.propagators.textmap import Getter
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import Link, Span, SpanKind, Status, StatusCode
+
+from settings import settings
+
+
+tracer = trace.get_tracer(__name__)
+
+message_trace_contexts: ContextVar[dict] = ContextVar('message_trace_contexts', default={})
+
+
+class AMQPHeadersGetter(Getter):
+    """
+    The getter that reads the trace context from the headers of an AMQP message.
+
+    The header values may arrive as bytes, they are decoded to strings.
+    """
+
+    def get(self, carrier: dict, key: str) -> list | None:
+        value = carrier.get(key)
+
+        if value is None:
+            return None
+
+        return [value.decode('utf-8') if isinstance(value, bytes) else str(value)]
+
+    def keys(self, carrier: dict) -> list:
+        return list(carrier.keys())
+
+
+amqp_headers_getter = AMQPHeadersGetter()
+
+
+def setup_tracing() -> None:
+    """
+    Setup opentelemetry tracing.
+
+    The traces that are started by the upstream services are always followed,
+    the new traces are sampled with the tracing_sample_ratio.
+    """
+    provider = TracerProvider(
+        sampler=ParentBased(root=TraceIdRatioBased(settings.tracing_sample_ratio)),
+        resource=Resource.create({'service_name': 'chat_messaging'}),
+    )
+    provider.add_span_processor(
+        BatchSpanProcessor(OTLPSpanExporter(endpoint=settings.opentelemetry_collector_url, insecure=True)),
+    )
+
+    trace.set_tracer_provider(provider)
+
+
+def start_consume_span(message: AbstractIncomingMessage) -> Span:
+    """
+    Start the span of a consumed message as a child of the trace context in its headers.
+
+    The span lasts until the message is acknowledged or returned to the broker.
+
+    Args:
+        message (AbstractIncomingMessage): The incoming RabbitMQ message.
+
+    Returns:
+        Span: The started span.
+    """
+    return tracer.start_span(
+        name=f'{settings.database_queue_name} receive',
+        context=extract(carrier=message.headers or {}, getter=amqp_headers_getter),
+        kind=SpanKind.CONSUMER,
+        attributes={'messaging.system': 'rabbitmq', 'messaging.destination.name': settings.database_queue_name},
+    )
+
+
+def finish_consume_span(span: Span, delivered: bool) -> None:
+    """
+    End the span of a consumed message.
+
+    Args:
+        span (Span): The span of the message.
+        delivered (bool): Whether the message was acknowledged.
+    """
+    if not delivered:
+        span.set_status(Status(StatusCode.ERROR, 'The message was returned to the broker.'))
+
+    span.end()
+
+
+def start_process_span(spans: list):
+    """
+    Start the span of the processing of a batch of messages and set it as the current one.
+
+    The span is a child of the first sampled message of the batch and is linked
+    to the rest of the sampled messages, so the database calls of a batch are
+    recorded once.
+
+    Args:
+        spans (list): The spans of the messages of the batch.
+
+    Returns:
+        The context manager of the span.
+    """
+    sampled_spans = [span for span in spans if span.get_span_context().trace_flags.sampled]
+    parent = (sampled_spans or spans)[0]
+
+    return tracer.start_as_current_span(
+        name='messages process',
+        context=trace.set_span_in_context(parent),
+        links=[Link(span.get_span_context()) for span in sampled_spans[1:]],
+        attributes={'messaging.batch.message_count': len(spans)},
+    )
+
+
+def set_message_trace_contexts(messages: Iterable[tuple]) -> None:
+    """
+    Remember the trace contexts of the messages that are being processed by the current task,
+    so that their outcomes are published within their own traces.
+
+    Args:
+        messages (Iterable[tuple]): The pairs of the client_message_id and the span of a message.
+    """
+    message_trace_contexts.set({
+        client_message_id: trace.set_span_in_context(span)
+        for client_message_id, span in messages
+    })
+
+
+def get_message_trace_context(client_message_id: str) -> Context | None:
+    """
+    Get the trace context of a message that is being processed by the current task.
+
+    Args:
+        client_message_id (str): The client_message_id of the message.
+
+    Returns:
+        Context | None: The trace context or None if the message is unknown.
+    """
+    return message_trace_contexts.get().get(client_message_id)
+
+
+def start_publish_span(message_data: dict):
+    """
+    Start the span of the publication of a message and set it as the current one.
+
+    The span belongs to the trace of the consumed message if it is known,
+    otherwise to the current trace.
+
+    Args:
+        message_data (dict): A message in the form of a dictionary.
+
+    Returns:
+        The context manager of the span.
+    """
+    return tracer.start_as_current_span(
+        name=f'{settings.delivery_exchange_name} publish',
+        context=get_message_trace_context(client_message_id=message_data.get('client_message_id')),
+        kind=SpanKind.PRODUCER,
+        attributes={'messaging.system': 'rabbitmq', 'messaging.destination.name': settings.delivery_exchange_name},
+    )
+
+
+def inject_trace_context(headers: dict) -> dict:
+    """
+    Inject the current trace context into the headers of an outgoing AMQP message.
+
+    Args:
+        headers (dict): The headers to inject into.
+
+    Returns:
+        dict: The same headers.
+    """
+    inject(carrier=headers)
+    return headers
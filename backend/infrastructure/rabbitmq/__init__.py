@@ -1,2 +1,3 @@
 from infrastructure.rabbitmq.rabbitmq_decoder import RabbitMQDecoder
 from infrastructure.rabbitmq.rabbitmq_manager import RabbitMQManager
+from infrastructure.rabbitmq.prefetch_controller import PrefetchController
@@ -0,0 +1,113 @@
+from asyncio import sleep
+from logging import getLogger
+
+from aio_pika.exceptions import AMQPError, ChannelInvalidStateError
+from opentelemetry import metrics
+from opentelemetry.metrics import CallbackOptions, Observation
+
+from settings import settings
+
+from infrastructure.rabbitmq.rabbitmq_manager import RabbitMQManager
+from infrastructure.transport import QueueManager
+
+
+meter = metrics.get_meter(__name__)
+
+
+class PrefetchController:
+    """
+    The controller that adjusts the prefetch count of the consumption channel at runtime.
+
+    The workers report how long it takes them to process a batch of messages and the
+    controller keeps an exponentially weighted moving average of it. Periodically the
+    target prefetch count is recalculated:
+    - If the internal messaging queue is saturated or the processing latency is above
+    the target latency, the prefetch count is decreased multiplicatively, so that the
+    unacknowledged messages stop piling up when the database is slow.
+    - If the internal messaging queue is relieved and the processing latency is within
+    the target latency, the prefetch count is increased additively, so that the
+    database is kept busy at peak traffic.
+    - Otherwise the prefetch count is kept.
+
+    The target always stays within the configured min and max bounds. The current and
+    the target prefetch counts are exposed as OpenTelemetry gauges.
+    """
+
+    def __init__(self, rabbitmq_manager: RabbitMQManager, queue_manager: QueueManager) -> None:
+        """
+        Initialize the controller.
+
+        Args:
+            rabbitmq_manager (RabbitMQManager): The RabbitMQ manager that owns the consumption channel.
+            queue_manager (QueueManager): The manager of the internal messaging queue.
+        """
+        self.rabbitmq_manager = rabbitmq_manager
+        self.queue_manager = queue_manager
+        self.latency = None
+        self.target_prefetch_count = settings.channel_prefetch_messages_count
+        self.logger = getLogger(settings.chats_logger_name)
+
+        meter.create_observable_gauge(
+            name='rabbitmq.prefetch.current',
+            callbacks=[self.observe_current_prefetch_count],
+            description='The prefetch count that is applied to the consumption channel.',
+        )
+        meter.create_observable_gauge(
+            name='rabbitmq.prefetch.target',
+            callbacks=[self.observe_target_prefetch_count],
+            description='The prefetch count that the controller aims at.',
+        )
+
+    def record_latency(self, latency: float) -> None:
+        """
+        Record the amount of seconds it took to process a batch of messages.
+
+        Args:
+            latency (float): The processing latency in seconds.
+        """
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += settings.prefetch_latency_smoothing * (latency - self.latency)
+
+    def calculate_target_prefetch_count(self) -> int:
+        """
+        Calculate the next target prefetch count.
+
+        Returns:
+            int: The target prefetch count within the configured bounds.
+        """
+        target_latency = settings.prefetch_target_latency_ms / 1000
+        latency_exceeded = self.latency is not None and self.latency > target_latency
+
+        if self.queue_manager.is_saturated() or latency_exceeded:
+            target = int(self.target_prefetch_count * settings.prefetch_decrease_factor)
+        elif self.queue_manager.is_relieved():
+            target = self.target_prefetch_count + settings.prefetch_increase_step
+        else:
+            target = self.target_prefetch_count
+
+        return max(settings.min_prefetch_messages_count, min(settings.max_prefetch_messages_count, target))
+
+    async def execute(self) -> None:
+        """
+        Adjust the prefetch count every prefetch_adjustment_interval seconds.
+        """
+        while True:
+            await sleep(settings.prefetch_adjustment_interval)
+
+            self.target_prefetch_count = self.calculate_target_prefetch_count()
+
+            try:
+                await self.rabbitmq_manager.set_prefetch_count(prefetch_count=self.target_prefetch_count)
+            except (AMQPError, ChannelInvalidStateError, ConnectionError) as exception:
+                self.logger.error(
+                    f'Problem with prefetch count adjustment: {exception!r}',
+                    extra={'user_id': None, 'event_type': 'Prefetch count adjustment error.'},
+                )
+
+    def observe_current_prefetch_count(self, options: CallbackOptions) -> list:
+        return [Observation(self.rabbitmq_manager.prefetch_count)]
+
+    def observe_target_prefetch_count(self, options: CallbackOptions) -> list:
+        return [Observation(self.target_prefetch_count)]
@@ -2,47 +2,44 @@ from logging import getLogger
 
 from settings import settings
 
-from json import JSONDecodeError, loads
+from infrastructure.codecs import json_codec
+from infrastructure.incoming_dtos import IncomingMessageDTO
+from infrastructure.monitoring import measure_stage
+
+
+logger = getLogger(settings.chats_logger_name)
 
 
 class RabbitMQDecoder:
     """
     A decoder for RabbitMQ messages.
+
+    A single decoder is shared by all the messages. The body of a message
+    is parsed directly from bytes and validated against the IncomingMessageDTO
+    in a single pass by the configured JSON codec.
     """
 
-    def __init__(self, message: bytes) -> None:
+    def __init__(self) -> None:
         """
         Initialize the decoder.
-
-        Args:
-            messages: A message from RabbitMQ in the bytes form.
         """
-        self.message = message
-        self.logger = getLogger(settings.chats_logger_name)
+        self.decode = json_codec.create_schema_decoder(schema=IncomingMessageDTO)
 
-    async def execute(self) -> dict:
+    @measure_stage(stage='decode')
+    def execute(self, message: bytes) -> dict | None:
         """
-        Decode message.
+        Decode and validate message.
 
-        Returns:
-            dict: A message in the form of a dictionary.
+        Args:
+            message (bytes): A message from RabbitMQ in the bytes form.
 
-        Raises:
-            ...
+        Returns:
+            dict | None: A message in the form of a dictionary or None if the message is not valid.
         """
         try:
-            self.message = self.message.decode('utf-8')
-        except AttributeError:
-            self.logger.error(
-                f'Problem with message decoding: {self.message}',
+            return self.decode(message)
+        except json_codec.schema_decode_errors as exception:
+            logger.error(
+                f'Problem with message decoding: {message!r}, {exception}',
                 extra={'user_id': None, 'event_type': 'Message decoding error.'},
             )
-        else:
-
-            try:
-                return loads(self.message)
-            except JSONDecodeError:
-                self.logger.error(
-                    f'Problem with message json parsing: {self.message}',
-                    extra={'user_id': None, 'event_type': 'Message json parsing error.'},
-                )
@@ -1,10 +1,21 @@
-from json import dumps
+from asyncio import create_task, gather, Semaphore, TimeoutError
+from logging import getLogger
+from time import perf_counter
 
 from aio_pika import connect_robust, Exchange, ExchangeType, Message, Queue
+from aio_pika.exceptions import AMQPError, ChannelInvalidStateError
+from pamqp.commands import Basic
 
 from settings import settings
 
 from application.ports import RabbitMQManagerPort
+from infrastructure.codecs import json_codec
+from infrastructure.monitoring import (
+    inject_trace_context,
+    measure_stage,
+    publish_confirm_histogram,
+    start_publish_span,
+)
 
 
 class RabbitMQManager(RabbitMQManagerPort):
@@ -25,6 +36,9 @@ class RabbitMQManager(RabbitMQManagerPort):
         self.delivery_exchange: Exchange = None
         self.database_exchange: Exchange = None
         self.queue: Queue = None
+        self.prefetch_count = settings.channel_prefetch_messages_count
+        self.publishing_window = Semaphore(settings.publisher_confirms_window)
+        self.logger = getLogger(settings.chats_logger_name)
 
     async def start(self) -> None:
         """
@@ -37,7 +51,7 @@ class RabbitMQManager(RabbitMQManagerPort):
         self.publishing_channel = await self.connection.channel(publisher_confirms=True)
         self.consumption_channel = await self.connection.channel()
 
-        await self.consumption_channel.set_qos(prefetch_count=settings.channel_prefetch_messages_count)
+        await self.consumption_channel.set_qos(prefetch_count=self.prefetch_count, global_=True)
 
         self.delivery_exchange = await self.publishing_channel.declare_exchange(
             name=settings.delivery_exchange_name,
@@ -60,6 +74,25 @@ class RabbitMQManager(RabbitMQManagerPort):
             passive=True,
         )
 
+    async def set_prefetch_count(self, prefetch_count: int) -> None:
+        """
+        Change the amount of unacknowledged messages the broker may deliver to the consumer.
+
+        The prefetch count is applied to the whole channel, since the broker applies a
+        per-consumer prefetch count only to the consumers that are started afterwards,
+        while the consumer of the channel is started once. Lowering the prefetch count
+        does not take back the messages that are already delivered, the broker just stops
+        delivering until enough of them are acknowledged.
+
+        Args:
+            prefetch_count (int): The new prefetch count.
+        """
+        if prefetch_count == self.prefetch_count:
+            return
+
+        await self.consumption_channel.set_qos(prefetch_count=prefetch_count, global_=True)
+        self.prefetch_count = prefetch_count
+
     async def get_queue(self) -> Queue:
         """
         Get the consumption queue.
@@ -69,25 +102,105 @@ class RabbitMQManager(RabbitMQManagerPort):
         """
         return self.queue
     
-    async def create_message(self, body: bytes) -> Message:
+    async def create_message(self, body: bytes, headers: dict | None = None) -> Message:
         """
         Get the instance of RabbitMQ Message to publish it to the broker.
 
         Args:
             body (bytes): The body of a message.
+            headers (dict | None): The headers of a message.
 
         Returns:
             Message: an instance of RabbitMQ Message.
         """
-        return Message(body=body, content_type='application/json', content_encoding='utf-8')
+        return Message(body=body, headers=headers, content_type='application/json', content_encoding='utf-8')
 
-    async def send_message(self, message_data: dict) -> None:
+    @measure_stage(stage='publish')
+    async def send_message(self, message_data: dict) -> bool:
         """
         Send a processed message to the delivery microservice.
 
         Args:
             message_data: A messages in the form of a dictionary.
+
+        Returns:
+            bool: True if the message was confirmed by the broker, otherwise False.
+        """
+        return await self.publish_confirmed(message_data=message_data)
+
+    @measure_stage(stage='publish')
+    async def send_messages(self, messages_data: list) -> list:
+        """
+        Send a batch of processed messages to the delivery microservice.
+
+        The messages are published without waiting for the confirmation of the
+        previous ones, so many confirmations are in flight at once. The amount of
+        unconfirmed messages is bounded by the publishing window that is shared by
+        all the callers. The publications are started in the provided order and the
+        channel writes them in the same order, so the order of the messages of a chat is kept.
+
+        Args:
+            messages_data (list): A list of messages in the form of dictionaries.
+
+        Returns:
+            list: A flag for every message that is True if the message was confirmed by the broker.
+        """
+        deliveries = [create_task(self.publish_confirmed(message_data=message_data)) for message_data in messages_data]
+
+        return list(await gather(*deliveries))
+
+    async def publish_confirmed(self, message_data: dict) -> bool:
+        """
+        Publish a message within the publishing window and wait for its confirmation.
+
+        The publication is traced within the trace of the consumed message and the
+        trace context is passed on in the headers of the published message.
+
+        Args:
+            message_data: A messages in the form of a dictionary.
+
+        Returns:
+            bool: True if the message was confirmed by the broker, otherwise False.
+        """
+        with start_publish_span(message_data=message_data):
+            return await self.publish_within_window(message_data=message_data)
+
+    async def publish_within_window(self, message_data: dict) -> bool:
+        """
+        Publish a message within the publishing window and wait for its confirmation.
+
+        Args:
+            message_data: A messages in the form of a dictionary.
+
+        Returns:
+            bool: True if the message was confirmed by the broker, otherwise False.
         """
-        body = dumps(message_data).encode('utf-8')
-        rabbitmq_message = await self.create_message(body=body)
-        await self.delivery_exchange.publish(message=rabbitmq_message, routing_key='')
+        body = json_codec.encode(message_data)
+        rabbitmq_message = await self.create_message(body=body, headers=inject_trace_context(headers={}))
+
+        async with self.publishing_window:
+            published_at = perf_counter()
+
+            try:
+                confirmation = await self.delivery_exchange.publish(
+                    message=rabbitmq_message,
+                    routing_key='',
+                    timeout=settings.publisher_confirm_timeout,
+                )
+            except (AMQPError, ChannelInvalidStateError, ConnectionError, TimeoutError) as exception:
+                self.logger.error(
+                    f'Message publishing failed: {exception!r}',
+                    extra={'user_id': message_data.get('sender_id'), 'event_type': 'Message publishing error.'},
+                )
+                return False
+
+        publish_confirm_histogram.record(perf_counter() - published_at)
+
+        if not isinstance(confirmation, Basic.Ack):
+            self.logger.error(
+                f'Message was not confirmed by the broker: {confirmation!r}',
+                extra={'user_id': message_data.get('sender_id'), 'event_type': 'Message publishing error.'},
+            )
+            return False
+
+        return True
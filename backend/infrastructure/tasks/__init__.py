@@ -1,2 +1,4 @@
 from infrastructure.tasks.consume_from_rabbitmq import consume_from_rabbitmq
+from infrastructure.tasks.dispatch_messages import dispatch_messages
 from infrastructure.tasks.process_messages import process_messages
+from infrastructure.tasks.run_profile_update_jobs import run_profile_update_jobs
@@ -1,13 +1,12 @@
-from asyncio import QueueFull
+from time import monotonic
 
 from dependency_injector.wiring import inject, Provide
-
-from settings import settings
+from opentelemetry.trace import use_span
 
 from infrastructure.dependency_injector import DependenciesContainer
-from infrastructure.incoming_dtos import IncomingMessageDTO
+from infrastructure.monitoring import finish_consume_span, start_consume_span
 from infrastructure.rabbitmq import RabbitMQDecoder, RabbitMQManager
-from infrastructure.transport import QueueManager
+from infrastructure.transport import QueuedMessage, QueueManager
 
 
 @inject
@@ -17,16 +16,33 @@ async def consume_from_rabbitmq(
 ) -> None:
     """
     The RabbitMQ consumer task that decodes, validates and forwards messages to an internal messaging queue.
+
+    The messages are not acknowledged here. Every message is forwarded along with its
+    RabbitMQ message and is acknowledged by a worker once it is persisted and published.
+    The messages that can not be decoded or validated are rejected without requeueing.
+
+    When the internal messaging queue is full the consumer waits for a free slot. The
+    amount of messages the broker delivers ahead is adjusted by the PrefetchController.
+
+    A span is started for every message within the trace found in its headers and
+    is carried along with the message until it is acknowledged.
     """
+    decoder = RabbitMQDecoder()
     external_queue = await rabbitmq_manager.get_queue()
-    messages_queue = await queue_manager.get_queue(collection_name=settings.messages_collection_name)
 
     async with external_queue.iterator() as queue_iterator:
         async for message in queue_iterator:
-            async with message.process(requeue=False):
-                decoded_message = await RabbitMQDecoder(message=message.body).execute()
-                validated_message = IncomingMessageDTO(**decoded_message).model_dump()
-                try:
-                    await messages_queue.put(validated_message)
-                except QueueFull:
-                    message.nack(requeue=True)
+            received_at = monotonic()
+            span = start_consume_span(message=message)
+
+            with use_span(span, end_on_exit=False):
+                validated_message = decoder.execute(message=message.body)
+
+            if validated_message is None:
+                await message.reject(requeue=False)
+                finish_consume_span(span=span, delivered=False)
+                continue
+
+            await queue_manager.put_message(
+                message=QueuedMessage(data=validated_message, delivery=message, received_at=received_at, span=span),
+            )
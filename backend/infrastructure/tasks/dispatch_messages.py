@@ -0,0 +1,21 @@
+from dependency_injector.wiring import inject, Provide
+
+from settings import settings
+
+from infrastructure.dependency_injector import DependenciesContainer
+from infrastructure.transport import QueueManager
+
+
+@inject
+async def dispatch_messages(
+    queue_manager: QueueManager = Provide[DependenciesContainer.queue_manager],
+) -> None:
+    """
+    The task that consumes messages from the internal messaging queue and routes
+    them to the partitions of their chats so that they can be processed by the workers.
+    """
+    messages_queue = await queue_manager.get_queue(collection_name=settings.messages_collection_name)
+
+    while True:
+        message = await messages_queue.get()
+        await queue_manager.put_partitioned(message=message)
@@ -1,13 +1,27 @@
+from logging import getLogger
+from time import monotonic
+
+from aio_pika.exceptions import AMQPError, ChannelInvalidStateError
 from dependency_injector.wiring import inject, Provide
 
 from settings import settings
 
+from application.ports import ChatRepositoryPort, MessagesRepositoryPort, RabbitMQManagerPort
 from infrastructure.database import DatabaseManager
-from infrastructure.database.repositories import ChatsRepository, MessagesRepository
+from infrastructure.cache import LRUCache
+from infrastructure.database.repositories import CachedChatsRepository, ChatsRepository, MessagesRepository
 from infrastructure.dependency_injector import DependenciesContainer
-from infrastructure.rabbitmq import RabbitMQManager
-from infrastructure.transport import QueueManager
-from interface_adapters.controllers import ProcessMessageController
+from infrastructure.monitoring import (
+    consume_to_persist_histogram,
+    finish_consume_span,
+    processed_messages_counter,
+    rejected_messages_counter,
+    set_message_trace_contexts,
+    start_process_span,
+)
+from infrastructure.rabbitmq import PrefetchController, RabbitMQManager
+from infrastructure.transport import QueuedMessage, QueueManager
+from interface_adapters.controllers import ProcessMessageController, ProcessMessagesBatchController
 
 
 @inject
@@ -15,24 +29,294 @@ async def process_messages(
     database_manager: DatabaseManager = Provide[DependenciesContainer.database_manager],
     queue_manager: QueueManager = Provide[DependenciesContainer.queue_manager],
     rabbitmq_manager: RabbitMQManager = Provide[DependenciesContainer.rabbitmq_manager],
+    chats_cache: LRUCache = Provide[DependenciesContainer.chats_cache],
+    prefetch_controller: PrefetchController = Provide[DependenciesContainer.prefetch_controller],
+    failed_deliveries: LRUCache = Provide[DependenciesContainer.failed_deliveries_cache],
 ) -> None:
     """
-    The task that consumes messages from the internal messaging queue and calls
-    the designated controller for further message processing.
+    The worker task that consumes messages from the partitions of the internal messaging
+    queue and calls the designated controller for further message processing.
+
+    The repositories are created on top of the database collections and the processing
+    itself is done by process_partitions.
     """
     chats_collection = await database_manager.get_collection(collection_name=settings.chats_collection_name)
     messages_collection = await database_manager.get_collection(collection_name=settings.messages_collection_name)
-    chats_repo = ChatsRepository(collection=chats_collection)
-    messages_repo = MessagesRepository(collection=messages_collection)
-    messages_queue = await queue_manager.get_queue(collection_name=settings.messages_collection_name)
+
+    await process_partitions(
+        queue_manager=queue_manager,
+        chats_repo=CachedChatsRepository(repository=ChatsRepository(collection=chats_collection), cache=chats_cache),
+        messages_repo=MessagesRepository(collection=messages_collection),
+        rabbitmq_manager=rabbitmq_manager,
+        prefetch_controller=prefetch_controller,
+        failed_deliveries=failed_deliveries,
+    )
+
+
+async def process_partitions(
+    queue_manager: QueueManager,
+    chats_repo: ChatRepositoryPort,
+    messages_repo: MessagesRepositoryPort,
+    rabbitmq_manager: RabbitMQManagerPort,
+    prefetch_controller: PrefetchController,
+    failed_deliveries: LRUCache,
+) -> None:
+    """
+    Process the messages of the partitions of the internal messaging queue forever.
+
+    Several workers run in parallel. A worker acquires the partitions that have messages
+    and owns them until the messages are processed, so the messages of a chat are never
+    processed by two workers at once.
+
+    If batching is enabled the messages are drained from all the ready partitions in batches
+    of up to messages_batch_size messages, waiting for at most messages_batch_timeout_ms for
+    a batch to fill up while no partition is ready, and every batch is processed at once.
+    Otherwise the messages are processed one by one.
+
+    A message is acknowledged only when its outcome is confirmed by the broker. Otherwise,
+    or if the processing fails, it is returned to the broker to be redelivered. A redelivered
+    message that has already been stored is completed and sent once more instead of being
+    rejected as a duplicate. If the processing of a batch fails its messages are processed
+    one by one, so a message that can not be processed does not hold back the other chats,
+    and once its processing has failed message_max_delivery_attempts times it is rejected
+    without being requeued, so that it is dead-lettered if the queue has a dead letter exchange.
+
+    The processing latency of every batch is reported to the PrefetchController. The time
+    from the consumption of every message and the outcomes of the messages are recorded
+    to the pipeline metrics. The processing of a batch is traced within the traces of its
+    messages and the span of every message is ended once it is acknowledged.
+
+    Args:
+        queue_manager (QueueManager): The manager of the internal messaging queue.
+        chats_repo (ChatRepositoryPort): The repository responsible for database actions with chats.
+        messages_repo (MessagesRepositoryPort): The repository responsible for actions with messages.
+        rabbitmq_manager (RabbitMQManagerPort): The RabbitMQ manager.
+        prefetch_controller (PrefetchController): The controller that receives the processing latencies.
+        failed_deliveries (LRUCache): The failed processing attempts of the messages counted by the instance.
+    """
+    logger = getLogger(settings.chats_logger_name)
 
     while True:
-        message = await messages_queue.get()
-        controller = ProcessMessageController(
-            message=message,
+        if settings.messages_batching_enabled:
+            indexes, queued_messages = await queue_manager.acquire_partitions_batch(
+                batch_size=settings.messages_batch_size,
+                timeout=settings.messages_batch_timeout_ms / 1000,
+            )
+        else:
+            indexes, queued_messages = await queue_manager.acquire_partitions_batch(batch_size=1, timeout=0)
+
+        started_at = monotonic()
+
+        try:
+            set_message_trace_contexts(messages=[
+                (queued_message.data.get('client_message_id'), queued_message.span)
+                for queued_message in queued_messages
+            ])
+
+            with start_process_span(spans=[queued_message.span for queued_message in queued_messages]):
+                processed_messages = await process_isolated(
+                    messages=[queued_message.data for queued_message in queued_messages],
+                    chats_repo=chats_repo,
+                    messages_repo=messages_repo,
+                    rabbitmq_manager=rabbitmq_manager,
+                )
+        except Exception as exception:
+            logger.exception(
+                f'Problem with messages processing: {exception!r}',
+                extra={'user_id': None, 'event_type': 'Messages processing error.'},
+            )
+            processed_messages = [None] * len(queued_messages)
+        finally:
+            await queue_manager.release_partitions(indexes=indexes)
+
+        prefetch_controller.record_latency(latency=monotonic() - started_at)
+
+        record_outcomes(queued_messages=queued_messages, processed_messages=processed_messages)
+
+        for queued_message, processed_message in zip(queued_messages, processed_messages):
+            message_delivered = processed_message is not None and processed_message.delivered
+
+            try:
+                if message_delivered:
+                    await queued_message.delivery.ack()
+                elif processed_message is None and count_delivery_attempts(
+                    queued_message=queued_message,
+                    failed_deliveries=failed_deliveries,
+                ) >= settings.message_max_delivery_attempts:
+                    logger.error(
+                        f'Message {queued_message.data.get("client_message_id")} is rejected '
+                        f'after {settings.message_max_delivery_attempts} failed processing attempts.',
+                        extra={
+                            'user_id': queued_message.data.get('sender_id'),
+                            'event_type': 'Message processing attempts exhausted.',
+                        },
+                    )
+                    await queued_message.delivery.reject(requeue=False)
+                else:
+                    await queued_message.delivery.nack(requeue=True)
+            except (AMQPError, ChannelInvalidStateError, ConnectionError) as exception:
+                logger.error(
+                    f'Problem with message acknowledgement: {exception!r}',
+                    extra={
+                        'user_id': queued_message.data.get('sender_id'),
+                        'event_type': 'Message acknowledgement error.',
+                    },
+                )
+
+            finish_consume_span(span=queued_message.span, delivered=message_delivered)
+
+        queue_manager.complete_messages(count=len(queued_messages))
+
+
+async def process_isolated(
+    messages: list,
+    chats_repo: ChatRepositoryPort,
+    messages_repo: MessagesRepositoryPort,
+    rabbitmq_manager: RabbitMQManagerPort,
+) -> list:
+    """
+    Process a batch of messages and if its processing fails process its messages one by one.
+
+    The stored messages of the failed batch are recovered by the processing of their
+    redeliveries. Once a message fails the following messages of its chat are not processed,
+    so that the messages of the chat are redelivered in their order.
+
+    Args:
+        messages (list): A list of messages data in the form of dictionaries.
+        chats_repo (ChatRepositoryPort): The repository responsible for database actions with chats.
+        messages_repo (MessagesRepositoryPort): The repository responsible for actions with messages.
+        rabbitmq_manager (RabbitMQManagerPort): The RabbitMQ manager.
+
+    Returns:
+        list: The outcomes of the processing of the messages as ProcessedMessageDTO in the order of the batch,
+            None for the messages that have not been processed.
+    """
+    logger = getLogger(settings.chats_logger_name)
+
+    try:
+        return await process_batch(
+            messages=messages,
             chats_repo=chats_repo,
             messages_repo=messages_repo,
             rabbitmq_manager=rabbitmq_manager,
         )
+    except Exception as exception:
+        if len(messages) == 1:
+            raise
+
+        logger.exception(
+            f'Problem with messages processing, processing the messages one by one: {exception!r}',
+            extra={'user_id': None, 'event_type': 'Messages processing error.'},
+        )
+
+    processed_messages = []
+    failed_chat_ids = set()
+
+    for message in messages:
+        if message.get('chat_id') in failed_chat_ids:
+            processed_messages.append(None)
+            continue
+
+        try:
+            processed_messages.extend(await process_batch(
+                messages=[message],
+                chats_repo=chats_repo,
+                messages_repo=messages_repo,
+                rabbitmq_manager=rabbitmq_manager,
+            ))
+        except Exception as exception:
+            logger.exception(
+                f'Problem with message processing: {exception!r}',
+                extra={'user_id': message.get('sender_id'), 'event_type': 'Message processing error.'},
+            )
+            processed_messages.append(None)
+            failed_chat_ids.add(message.get('chat_id'))
+
+    return processed_messages
+
+
+async def process_batch(
+    messages: list,
+    chats_repo: ChatRepositoryPort,
+    messages_repo: MessagesRepositoryPort,
+    rabbitmq_manager: RabbitMQManagerPort,
+) -> list:
+    """
+    Call the designated controller for a batch of messages.
+
+    If batching is disabled the batch consists of a single message.
+
+    Args:
+        messages (list): A list of messages data in the form of dictionaries.
+        chats_repo (ChatRepositoryPort): The repository responsible for database actions with chats.
+        messages_repo (MessagesRepositoryPort): The repository responsible for actions with messages.
+        rabbitmq_manager (RabbitMQManagerPort): The RabbitMQ manager.
+
+    Returns:
+        list: The outcomes of the processing of the messages as ProcessedMessageDTO in the order of the batch.
+    """
+    if settings.messages_batching_enabled:
+        controller = ProcessMessagesBatchController(
+            messages=messages,
+            chats_repo=chats_repo,
+            messages_repo=messages_repo,
+            rabbitmq_manager=rabbitmq_manager,
+        )
+
+        return await controller.process_messages()
+
+    controller = ProcessMessageController(
+        message=messages[0],
+        chats_repo=chats_repo,
+        messages_repo=messages_repo,
+        rabbitmq_manager=rabbitmq_manager,
+    )
+
+    return [await controller.process_message()]
+
+
+def count_delivery_attempts(queued_message: QueuedMessage, failed_deliveries: LRUCache) -> int:
+    """
+    Count the failed processing attempts of a message including the current one.
+
+    RabbitMQ counts the redeliveries of the messages of quorum queues in the x-delivery-count
+    header, the failed attempts of the messages of other queues are counted by the instance.
+
+    Args:
+        queued_message (QueuedMessage): The envelope of the message whose processing has failed.
+        failed_deliveries (LRUCache): The failed processing attempts of the messages counted by the instance.
+
+    Returns:
+        int: The amount of the failed processing attempts.
+    """
+    delivery_count = (queued_message.delivery.headers or {}).get('x-delivery-count')
+
+    if delivery_count is not None:
+        return delivery_count + 1
+
+    key = queued_message.data.get('client_message_id')
+    attempts = (failed_deliveries.get(key=key) or 0) + 1
+    failed_deliveries.put(key=key, value=attempts)
+
+    return attempts
+
+
+def record_outcomes(queued_messages: list, processed_messages: list) -> None:
+    """
+    Record the outcomes of the processed messages to the pipeline metrics.
+
+    Args:
+        queued_messages (list): The envelopes of the messages.
+        processed_messages (list): The outcomes of the messages as ProcessedMessageDTO, None if not processed.
+    """
+    processed_at = monotonic()
+
+    for queued_message, processed_message in zip(queued_messages, processed_messages):
+        if processed_message is None:
+            continue
+
+        consume_to_persist_histogram.record(processed_at - queued_message.received_at)
+        processed_messages_counter.add(1, {'status': processed_message.status.value})
 
-        await controller.process_message()
+        if processed_message.reject_reason is not None:
+            rejected_messages_counter.add(1, {'reason': processed_message.reject_reason.name})
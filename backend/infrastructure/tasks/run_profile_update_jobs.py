@@ -0,0 +1,70 @@
+from asyncio import sleep
+from logging import getLogger
+
+from dependency_injector.wiring import inject, Provide
+
+from settings import settings
+
+from domain.value_objects import ProfileUpdateJobStatus
+from infrastructure.cache import LRUCache
+from infrastructure.database import DatabaseManager
+from infrastructure.database.repositories import CachedChatsRepository, ChatsRepository, ProfileUpdateJobsRepository
+from infrastructure.dependency_injector import DependenciesContainer
+from interface_adapters.controllers import RunProfileUpdateJobController
+
+
+logger = getLogger(settings.chats_logger_name)
+
+
+@inject
+async def run_profile_update_jobs(
+    database_manager: DatabaseManager = Provide[DependenciesContainer.database_manager],
+    chats_cache: LRUCache = Provide[DependenciesContainer.chats_cache],
+) -> None:
+    """
+    The task that claims the profile update jobs one by one and runs them.
+
+    If there is no job to claim the task waits for profile_update_poll_interval seconds.
+    A job that fails is marked as failed, a job whose worker was stopped or that could
+    not be marked as failed is claimed again by any instance of the service once its
+    lease expires. The task itself survives the errors of the database.
+    """
+    chats_collection = await database_manager.get_collection(collection_name=settings.chats_collection_name)
+    jobs_collection = await database_manager.get_collection(
+        collection_name=settings.profile_update_jobs_collection_name,
+    )
+
+    chats_repo = CachedChatsRepository(repository=ChatsRepository(collection=chats_collection), cache=chats_cache)
+    jobs_repo = ProfileUpdateJobsRepository(collection=jobs_collection)
+
+    while True:
+        try:
+            job = await jobs_repo.claim_job()
+        except Exception as exception:
+            logger.error(
+                f'Problem with profile update job claiming: {exception!r}',
+                extra={'user_id': None, 'event_type': 'Profile update job claiming error.'},
+            )
+            job = None
+
+        if job is None:
+            await sleep(settings.profile_update_poll_interval)
+            continue
+
+        controller = RunProfileUpdateJobController(job=job, jobs_repo=jobs_repo, chats_repo=chats_repo)
+
+        try:
+            await controller.run_profile_update_job()
+        except Exception as exception:
+            logger.error(
+                f'Problem with profile update job processing: {exception!r}',
+                extra={'user_id': job.get('user_id'), 'event_type': 'Profile update job processing error.'},
+            )
+
+            try:
+                await jobs_repo.finish_job(job=job, status=ProfileUpdateJobStatus.FAILED)
+            except Exception as exception:
+                logger.error(
+                    f'Problem with profile update job finishing: {exception!r}',
+                    extra={'user_id': job.get('user_id'), 'event_type': 'Profile update job finishing error.'},
+                )
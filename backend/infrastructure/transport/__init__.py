@@ -1 +1,2 @@
 from infrastructure.transport.queue_manager import QueueManager
+from infrastructure.transport.queued_message import QueuedMessage
@@ -1,4 +1,15 @@
-from asyncio import Queue
+from asyncio import Event, get_running_loop, Queue, Semaphore, TimeoutError, wait_for
+from zlib import crc32
+
+from opentelemetry import metrics
+from opentelemetry.metrics import CallbackOptions, Observation
+
+from settings import settings
+
+from infrastructure.transport.queued_message import QueuedMessage
+
+
+meter = metrics.get_meter(__name__)
 
 
 class QueueManager:
@@ -8,6 +19,15 @@ class QueueManager:
     This component is used inside the application layer to route different
     asynchronous tasks (e.g., storing messages, delivering messages, etc.)
     through named queues.
+
+    Besides the named queues the manager holds the partitions of the messages
+    queue. Every message is routed to a partition by its chat_id, and a partition
+    is handed out to a single worker at a time, so that the messages of the same
+    chat are processed in order while different chats are processed in parallel.
+
+    The amount of messages that are inside the manager at once, either queued or
+    being processed, is bounded by internal_queue_max_size. A message occupies its
+    slot from the moment it is put until it is completed by a worker.
     """
 
     def __init__(self) -> None:
@@ -15,8 +35,20 @@ class QueueManager:
         Initialize the manager and create predefined queues.
         """
         self.queues = {
-            'messages': Queue(),
+            'messages': Queue(maxsize=settings.internal_queue_max_size),
         }
+        self.capacity = Semaphore(settings.internal_queue_max_size)
+        self.pending_messages_count = 0
+        self.partitions = [Queue() for _ in range(settings.processing_partitions_count)]
+        self.ready_partitions = Queue()
+        self.scheduled_partitions = set()
+        self.partitioned_message_put = Event()
+
+        meter.create_observable_gauge(
+            name='pipeline.queue.depth',
+            callbacks=[self.observe_pending_messages_count],
+            description='The amount of messages that are queued or being processed.',
+        )
 
     async def get_queue(self, collection_name: str) -> Queue:
         """
@@ -30,3 +62,159 @@ class QueueManager:
         """
         return self.queues.get(collection_name)
 
+    async def put_message(self, message: QueuedMessage) -> None:
+        """
+        Put a message to the internal messaging queue.
+
+        Wait until there is a free slot if the manager is full.
+
+        Args:
+            message (QueuedMessage): An envelope of a message.
+        """
+        await self.capacity.acquire()
+        self.pending_messages_count += 1
+
+        self.queues.get('messages').put_nowait(message)
+
+    def complete_messages(self, count: int) -> None:
+        """
+        Free the slots of the messages that have been processed.
+
+        Args:
+            count (int): The amount of processed messages.
+        """
+        self.pending_messages_count -= count
+
+        for _ in range(count):
+            self.capacity.release()
+
+    def is_saturated(self) -> bool:
+        """
+        Check whether the amount of pending messages has reached the high-water mark.
+
+        Returns:
+            bool: True if the manager is saturated.
+        """
+        return self.pending_messages_count >= settings.internal_queue_high_water_mark
+
+    def is_relieved(self) -> bool:
+        """
+        Check whether the amount of pending messages has fallen to the low-water mark.
+
+        Returns:
+            bool: True if the manager is relieved.
+        """
+        return self.pending_messages_count <= settings.internal_queue_low_water_mark
+
+    def observe_pending_messages_count(self, options: CallbackOptions) -> list:
+        return [Observation(self.pending_messages_count)]
+
+    def get_partition_index(self, chat_id: str) -> int:
+        """
+        Get the index of the partition that the messages of a chat are routed to.
+
+        Args:
+            chat_id (str): The id of a chat.
+
+        Returns:
+            int: The index of the partition.
+        """
+        return crc32(str(chat_id).encode('utf-8')) % len(self.partitions)
+
+    async def put_partitioned(self, message: QueuedMessage) -> None:
+        """
+        Put a message to the partition of its chat and schedule the partition
+        for processing unless it is already scheduled.
+
+        Args:
+            message (QueuedMessage): An envelope of a message.
+        """
+        index = self.get_partition_index(chat_id=message.data.get('chat_id'))
+
+        self.partitions[index].put_nowait(message)
+        self.partitioned_message_put.set()
+
+        if index not in self.scheduled_partitions:
+            self.scheduled_partitions.add(index)
+            self.ready_partitions.put_nowait(index)
+
+    async def acquire_partitions_batch(self, batch_size: int, timeout: float) -> tuple:
+        """
+        Acquire the partitions that have messages to process and drain a batch from them.
+
+        Wait until a partition is ready, then keep acquiring the ready partitions and
+        draining both them and the already acquired ones until either the batch is full
+        or the timeout has passed. The timeout is only waited for while there are no
+        messages to take, so the messages that are spread over many chats are batched together.
+
+        The acquired partitions are owned by the caller until they are released.
+
+        Args:
+            batch_size (int): The maximum amount of messages in a batch.
+            timeout (float): The maximum amount of seconds to wait for the batch to fill up.
+
+        Returns:
+            tuple: The indexes of the acquired partitions and a list of at least one
+                and at most batch_size messages.
+        """
+        loop = get_running_loop()
+
+        indexes = [await self.ready_partitions.get()]
+        batch = []
+        deadline = loop.time() + timeout
+
+        while True:
+            for index in indexes:
+                batch += self.drain_partition(index=index, batch_size=batch_size - len(batch))
+
+            while len(batch) < batch_size and not self.ready_partitions.empty():
+                indexes.append(self.ready_partitions.get_nowait())
+                batch += self.drain_partition(index=indexes[-1], batch_size=batch_size - len(batch))
+
+            if len(batch) >= batch_size or (remaining := deadline - loop.time()) <= 0:
+                break
+
+            self.partitioned_message_put.clear()
+
+            try:
+                await wait_for(self.partitioned_message_put.wait(), timeout=remaining)
+            except TimeoutError:
+                break
+
+        return indexes, batch
+
+    def drain_partition(self, index: int, batch_size: int) -> list:
+        """
+        Take the messages of an acquired partition without waiting.
+
+        Args:
+            index (int): The index of the partition.
+            batch_size (int): The maximum amount of messages to take.
+
+        Returns:
+            list: Up to batch_size messages in the order they were put.
+        """
+        partition = self.partitions[index]
+        batch = []
+
+        while len(batch) < batch_size and not partition.empty():
+            batch.append(partition.get_nowait())
+
+        return batch
+
+    async def release_partitions(self, indexes: list) -> None:
+        """
+        Release previously acquired partitions.
+
+        If a partition received new messages while it was owned, or was not drained
+        completely, it is scheduled again, otherwise it is unscheduled until the next
+        message arrives.
+
+        Args:
+            indexes (list): The indexes of the partitions.
+        """
+        for index in indexes:
+            if self.partitions[index].empty():
+                self.scheduled_partitions.discard(index)
+            else:
+                self.ready_partitions.put_nowait(index)
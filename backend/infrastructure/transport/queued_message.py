@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+
+from aio_pika.abc import AbstractIncomingMessage
+from opentelemetry.trace import Span
+
+
+@dataclass
+class QueuedMessage:
+    """
+    An envelope of a message that travels through the internal messaging queue.
+
+    The incoming RabbitMQ message is carried along with the validated data, so
+    that it is acknowledged only after the message is persisted and its outcome
+    is published, and never while the message lives in memory only.
+
+    Attributes:
+        data (dict): The validated message data in the form of a dictionary.
+        delivery (AbstractIncomingMessage): The incoming RabbitMQ message that is to be acknowledged.
+        received_at (float): The monotonic time when the message was received from the broker.
+        span (Span): The span of the message that lasts until the message is acknowledged.
+    """
+    data: dict
+    delivery: AbstractIncomingMessage
+    received_at: float
+    span: Span
@@ -1,5 +1,8 @@
 from interface_adapters.controllers.create_chat import CreateChatController
 from interface_adapters.controllers.get_chats import GetChatsController
 from interface_adapters.controllers.get_messages import GetMessagesController
+from interface_adapters.controllers.get_profile_update_job import GetProfileUpdateJobController
 from interface_adapters.controllers.process_message import ProcessMessageController
+from interface_adapters.controllers.process_messages_batch import ProcessMessagesBatchController
+from interface_adapters.controllers.run_profile_update_job import RunProfileUpdateJobController
 from interface_adapters.controllers.update_chat_related_user import UpdateChatRelatedUserController
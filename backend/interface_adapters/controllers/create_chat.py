@@ -1,5 +1,5 @@
-from application.ports import ChatRepositoryPort, GetUsersInfoPort
-from application.use_cases import CreateChatUseCase
+from application.ports import ChatRepositoryPort, GetUsersInfoPort, UsersRepositoryPort
+from application.use_cases import CreateChatUseCase, HydrateRelatedUsersUseCase
 from interface_adapters.outgoing_dtos import ChatOUTDTO
 
 
@@ -18,6 +18,7 @@ class CreateChatController:
         create_chat_data: dict,
         database_repo: ChatRepositoryPort,
         users_info_port: GetUsersInfoPort,
+        users_repo: UsersRepositoryPort | None = None,
     ) -> None:
         """
         Initialize the controller.
@@ -27,11 +28,13 @@ class CreateChatController:
             create_chat_data (dict): Required data for chat creation.
             database_repo (ChatRepositoryPort): The port for the repository that operates with chats collection.
             users_info_port (GetUsersInfoPort): The port for the service that fetches information about users.
+            users_repo (UsersRepositoryPort | None): The port for the profiles of users, None if the profiles are embedded.
         """
         self.user_id = user_id
         self.create_chat_data = create_chat_data
         self.database_repo = database_repo
         self.users_info_port = users_info_port
+        self.users_repo = users_repo
 
     async def create_chat(self) -> ChatOUTDTO:
         """
@@ -46,8 +49,13 @@ class CreateChatController:
             create_chat_data=self.create_chat_data,
             database_repo=self.database_repo,
             users_info_port=self.users_info_port,
+            users_repo=self.users_repo,
         )
 
         chat = await use_case.execute()
 
+        if self.users_repo is not None:
+            chats = await HydrateRelatedUsersUseCase(chats=[chat], users_repo=self.users_repo).execute()
+            chat = chats[0]
+
         return ChatOUTDTO.from_dict(chat)
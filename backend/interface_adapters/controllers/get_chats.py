@@ -1,5 +1,11 @@
-from application.ports import ChatRepositoryPort
-from application.use_cases import GetChatsUseCase
+from dataclasses import asdict
+from typing import AsyncIterator
+
+from settings import settings
+
+from application.outgoing_dtos import OutgoingChatsDTO
+from application.ports import ChatRepositoryPort, UsersRepositoryPort
+from application.use_cases import GetChatsUseCase, HydrateRelatedUsersUseCase
 
 from interface_adapters.outgoing_dtos import ChatOUTDTO
 
@@ -9,29 +15,93 @@ class GetChatsController:
     The controller that is responsible for retrieving a user's chats.
 
     Calls the respectful use case and adapts the data to the
-    outgoing format.
+    outgoing format. Only the fields of the outgoing DTO are fetched.
+    If the profiles are normalized the related users are hydrated from
+    the users repository before the adaptation.
     """
 
-    def __init__(self, user_id: int, database_repo: ChatRepositoryPort) -> None:
+    def __init__(
+        self,
+        user_id: int,
+        database_repo: ChatRepositoryPort,
+        cursor: str | None,
+        limit: int = settings.chats_limit,
+        users_repo: UsersRepositoryPort | None = None,
+    ) -> None:
         """
         Initialize the controller.
 
         Args:
             user_id (int): The id of requesting user.
             database_repo (ChatRepositoryPort): The port for chats collection database repository.
+            cursor (str | None): The cursor of the previous page.
+            limit (int): The maximum amount of chats in a page, not used by streaming.
+            users_repo (UsersRepositoryPort | None): The port for the profiles of users, None if the profiles are embedded.
         """
         self.user_id = user_id
         self.database_repo = database_repo
+        self.cursor = cursor
+        self.limit = limit
+        self.users_repo = users_repo
 
-    async def get_chats(self) -> list:
-        """
-        Get chats.
-        """
-        use_case = GetChatsUseCase(
+    def make_use_case(self) -> GetChatsUseCase:
+        return GetChatsUseCase(
             user_id=self.user_id,
             database_repo=self.database_repo,
+            cursor=self.cursor,
+            limit=self.limit,
+            projection=ChatOUTDTO.projection,
         )
 
-        chats = await use_case.execute()
+    async def hydrate_chats(self, chats: list) -> list:
+        """
+        Hydrate the related users of the chats if the profiles are normalized.
+        """
+        if self.users_repo is None:
+            return chats
+
+        return await HydrateRelatedUsersUseCase(chats=chats, users_repo=self.users_repo).execute()
+
+    async def get_chats(self) -> OutgoingChatsDTO:
+        """
+        Get a page of chats.
+        """
+        chats_data = await self.make_use_case().execute()
+        chats = await self.hydrate_chats(chats=chats_data.chats)
+        chats_data.chats = [asdict(ChatOUTDTO.from_dict(chat)) for chat in chats]
+
+        return chats_data
+
+    async def stream_chats(self) -> AsyncIterator[dict]:
+        """
+        Stream all the chats without pagination.
+
+        The cursor is validated before the iterator is returned.
+        The chats are hydrated in batches of chats_stream_batch_size.
+
+        Returns:
+            AsyncIterator[dict]: The chats in the outgoing format.
+        """
+        chats = await self.make_use_case().stream()
+
+        return self.adapt_chats(chats=chats)
+
+    async def adapt_chats(self, chats: AsyncIterator[dict]) -> AsyncIterator[dict]:
+        """
+        Adapt the streamed chats to the outgoing format.
+
+        Yields:
+            dict: A chat in the outgoing format.
+        """
+        batch = []
+
+        async for chat in chats:
+            batch.append(chat)
+
+            if len(batch) == settings.chats_stream_batch_size:
+                for hydrated_chat in await self.hydrate_chats(chats=batch):
+                    yield asdict(ChatOUTDTO.from_dict(hydrated_chat))
+                batch = []
 
-        return [ChatOUTDTO.from_dict(chat) for chat in chats]
+        for hydrated_chat in await self.hydrate_chats(chats=batch):
+            yield asdict(ChatOUTDTO.from_dict(hydrated_chat))
@@ -2,6 +2,7 @@ from dataclasses import asdict
 
 from application.ports import ChatRepositoryPort, MessagesRepositoryPort
 from application.use_cases import GetMessagesUseCase
+from domain.value_objects import PaginationDirection
 from interface_adapters.outgoing_dtos import OutgoingMessageDTO
 
 
@@ -18,6 +19,8 @@ class GetMessagesController:
         cursor: str | None,
         chats_repo: ChatRepositoryPort,
         messages_repo: MessagesRepositoryPort,
+        limit: int,
+        direction: PaginationDirection,
     ) -> None:
         """
         Initialize the controller.
@@ -28,12 +31,16 @@ class GetMessagesController:
             cursor (str | None): An id of a messaget that is used as a filter.
             chats_repo (ChatRepositoryPort): The port for chats collection database repository.
             messages_repo (MessagesRepositoryPort): The port for messages collection database repository.
+            limit (int): The maximum amount of messages in a page.
+            direction (PaginationDirection): Whether the messages older or newer than the cursor are requested.
         """
         self.chat_id = chat_id
         self.user_id = user_id
         self.cursor = cursor
         self.chats_repo = chats_repo
         self.messages_repo = messages_repo
+        self.limit = limit
+        self.direction = direction
 
     def transform_messages(self, messages: list) -> list:
         """
@@ -46,6 +53,8 @@ class GetMessagesController:
     async def get_messages(self) -> dict:
         """
         Call the respectful use case and prepare the outgoing data.
+
+        Only the fields of the outgoing DTO are fetched.
         """
         use_case = GetMessagesUseCase(
             chat_id=self.chat_id,
@@ -53,6 +62,9 @@ class GetMessagesController:
             cursor=self.cursor,
             chats_repo=self.chats_repo,
             messages_repo=self.messages_repo,
+            limit=self.limit,
+            direction=self.direction,
+            projection=OutgoingMessageDTO.projection,
         )
 
         messages_data = await use_case.execute()
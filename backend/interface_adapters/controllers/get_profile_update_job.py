@@ -0,0 +1,39 @@
+from application.ports import ProfileUpdateJobsRepositoryPort
+from application.use_cases import GetProfileUpdateJobUseCase
+from interface_adapters.outgoing_dtos import ProfileUpdateJobOUTDTO
+
+
+class GetProfileUpdateJobController:
+    """
+    This controller is responsible for retrieving the progress of a profile update job.
+    """
+
+    def __init__(self, job_id: str, user_id: int, jobs_repo: ProfileUpdateJobsRepositoryPort) -> None:
+        """
+        Initialize the controller.
+
+        Args:
+            job_id (str): The id of the job.
+            user_id (int): The id of requesting user.
+            jobs_repo (ProfileUpdateJobsRepositoryPort): The port that defines operations with the profile update jobs.
+        """
+        self.job_id = job_id
+        self.user_id = user_id
+        self.jobs_repo = jobs_repo
+
+    async def get_profile_update_job(self) -> ProfileUpdateJobOUTDTO:
+        """
+        Get the progress of a profile update job.
+
+        Returns:
+            ProfileUpdateJobOUTDTO: The job in the appropriate format.
+        """
+        use_case = GetProfileUpdateJobUseCase(
+            job_id=self.job_id,
+            user_id=self.user_id,
+            jobs_repo=self.jobs_repo,
+        )
+
+        job = await use_case.execute()
+
+        return ProfileUpdateJobOUTDTO.from_dict(job)
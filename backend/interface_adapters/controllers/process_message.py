@@ -1,3 +1,4 @@
+from application.outgoing_dtos import ProcessedMessageDTO
 from application.ports import ChatRepositoryPort, MessagesRepositoryPort, RabbitMQManagerPort
 from application.use_cases import ProcessMessageUseCase
 
@@ -29,11 +30,14 @@ class ProcessMessageController:
         self.messages_repo = messages_repo
         self.rabbitmq_manager = rabbitmq_manager
 
-    async def process_message(self) -> None:
+    async def process_message(self) -> ProcessedMessageDTO:
         """
         Process a message.
 
         Just call the designated use case in order to process a message.
+
+        Returns:
+            ProcessedMessageDTO: The outcome of the processing of the message.
         """
         use_case = ProcessMessageUseCase(
             message=self.message,
@@ -42,4 +46,4 @@ class ProcessMessageController:
             rabbitmq_manager=self.rabbitmq_manager,
         )
 
-        await use_case.execute()
+        return await use_case.execute()
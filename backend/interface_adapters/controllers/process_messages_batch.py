@@ -0,0 +1,48 @@
+from application.ports import ChatRepositoryPort, MessagesRepositoryPort, RabbitMQManagerPort
+from application.use_cases import ProcessMessagesBatchUseCase
+
+
+class ProcessMessagesBatchController:
+    """
+    The controller that receives a batch of messages drained from the internal
+    messages queue and calls the designated use case.
+    """
+
+    def __init__(
+        self,
+        messages: list,
+        chats_repo: ChatRepositoryPort,
+        messages_repo: MessagesRepositoryPort,
+        rabbitmq_manager: RabbitMQManagerPort,
+    ) -> None:
+        """
+        Initialize the controller.
+
+        Args:
+            messages (list): A list of messages data in the form of dictionaries.
+            chats_repo (ChatRepositoryPort): The port for a repository responsible for database actions with chats.
+            messages_repo (MessagesRepositoryPort): The port for a repository responsible for actions with messages.
+            rabbitmq_manager (RabbitMQManagerPort): The port for RabbitMQ manager.
+        """
+        self.messages = messages
+        self.chats_repo = chats_repo
+        self.messages_repo = messages_repo
+        self.rabbitmq_manager = rabbitmq_manager
+
+    async def process_messages(self) -> list:
+        """
+        Process a batch of messages.
+
+        Just call the designated use case in order to process the batch.
+
+        Returns:
+            list: The outcomes of the processing of the messages as ProcessedMessageDTO in the order of the batch.
+        """
+        use_case = ProcessMessagesBatchUseCase(
+            messages=self.messages,
+            chats_repo=self.chats_repo,
+            messages_repo=self.messages_repo,
+            rabbitmq_manager=self.rabbitmq_manager,
+        )
+
+        return await use_case.execute()
@@ -0,0 +1,29 @@
+from application.ports import ChatRepositoryPort, ProfileUpdateJobsRepositoryPort
+from application.use_cases import RunProfileUpdateJobUseCase
+
+
+class RunProfileUpdateJobController:
+    """
+    This controller is responsible for running a claimed profile update job.
+    """
+
+    def __init__(self, job: dict, jobs_repo: ProfileUpdateJobsRepositoryPort, chats_repo: ChatRepositoryPort) -> None:
+        """
+        Initialize the controller.
+
+        Args:
+            job (dict): A claimed profile update job.
+            jobs_repo (ProfileUpdateJobsRepositoryPort): The port that defines operations with the profile update jobs.
+            chats_repo (ChatRepositoryPort): The port that defines operations with the chats.
+        """
+        self.job = job
+        self.jobs_repo = jobs_repo
+        self.chats_repo = chats_repo
+
+    async def run_profile_update_job(self) -> None:
+        """
+        Run the job until it is completed or its lease is lost.
+        """
+        use_case = RunProfileUpdateJobUseCase(job=self.job, jobs_repo=self.jobs_repo, chats_repo=self.chats_repo)
+
+        await use_case.execute()
@@ -1,5 +1,6 @@
-from application.ports import ChatRepositoryPort
+from application.ports import ProfileUpdateJobsRepositoryPort, UsersRepositoryPort
 from application.use_cases import UpdateChatUserUseCase
+from interface_adapters.outgoing_dtos import ProfileUpdateJobOUTDTO
 
 
 class UpdateChatRelatedUserController:
@@ -8,27 +9,41 @@ class UpdateChatRelatedUserController:
     related users upon update information about users by themselves.
     """
 
-    def __init__(self, user_data: dict, user_id: int, database_repo: ChatRepositoryPort) -> None:
+    def __init__(
+        self,
+        user_data: dict,
+        user_id: int,
+        jobs_repo: ProfileUpdateJobsRepositoryPort,
+        users_repo: UsersRepositoryPort | None = None,
+    ) -> None:
         """
         Initialize the controller.
 
         Args:
             user_data (dict): A dictionary containing the data that is needed to update chats.
             user_id (int): The id of requesting user.
-            database_repo (ChatRepositoryPort): The port that defines operations with the chats.
+            jobs_repo (ProfileUpdateJobsRepositoryPort): The port that defines operations with the profile update jobs.
+            users_repo (UsersRepositoryPort | None): The port for the profiles of users, None if the profiles are embedded.
         """
         self.user_data = user_data
         self.user_id = user_id
-        self.database_repo = database_repo
+        self.jobs_repo = jobs_repo
+        self.users_repo = users_repo
 
-    async def update_chat_related_user(self) -> None:
+    async def update_chat_related_user(self) -> ProfileUpdateJobOUTDTO:
         """
-        Update chtas related user.
+        Request the update of chats related user.
+
+        Returns:
+            ProfileUpdateJobOUTDTO: The job that updates the chats in the background.
         """
         use_case = UpdateChatUserUseCase(
             user_data=self.user_data,
             user_id=self.user_id,
-            database_repo=self.database_repo,
+            jobs_repo=self.jobs_repo,
+            users_repo=self.users_repo,
         )
 
-        await use_case.execute()
+        job = await use_case.execute()
+
+        return ProfileUpdateJobOUTDTO.from_dict(job)
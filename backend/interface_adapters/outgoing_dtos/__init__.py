@@ -1,2 +1,3 @@
 from interface_adapters.outgoing_dtos.chat import ChatOUTDTO
 from interface_adapters.outgoing_dtos.message import OutgoingMessageDTO
+from interface_adapters.outgoing_dtos.profile_update_job import ProfileUpdateJobOUTDTO
@@ -1,7 +1,8 @@
 from dataclasses import dataclass
-from interface_adapters.shared_utils import add_from_dict
+from interface_adapters.shared_utils import add_from_dict, add_projection
 
 
+@add_projection
 @dataclass
 @add_from_dict
 class ChatOUTDTO:
@@ -10,3 +11,5 @@ class ChatOUTDTO:
     """
     id: str
     related_users: list
+    last_message: dict | None = None
+    last_activity_at: str | None = None
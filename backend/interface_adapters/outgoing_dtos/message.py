@@ -1,8 +1,9 @@
 from dataclasses import dataclass
 
-from interface_adapters.shared_utils import add_from_dict
+from interface_adapters.shared_utils import add_from_dict, add_projection
 
 
+@add_projection
 @dataclass
 @add_from_dict
 class OutgoingMessageDTO:
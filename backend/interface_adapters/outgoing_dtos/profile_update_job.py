@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from interface_adapters.shared_utils import add_from_dict
+
+
+@dataclass
+@add_from_dict
+class ProfileUpdateJobOUTDTO:
+    """
+    The DTO that is used to represent the progress of a profile update job in responses.
+    """
+    id: str
+    status: str
+    updated_chats_count: int
+    created_at: datetime
+    finished_at: datetime | None
@@ -1 +1,2 @@
 from interface_adapters.shared_utils.add_from_dict import add_from_dict
+from interface_adapters.shared_utils.add_projection import add_projection
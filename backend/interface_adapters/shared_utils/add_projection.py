@@ -0,0 +1,17 @@
+from dataclasses import fields
+from typing import Type, TypeVar
+
+
+T = TypeVar('T')
+
+def add_projection(cls: Type[T]) -> Type[T]:
+    """
+    The decorator that adds the projection attribute to a dataclass
+    in order to fetch only the fields of the dataclass from the database.
+
+    The _id of the documents is excluded from the projection.
+    """
+    projection = {'_id': 0, **{field.name: 1 for field in fields(cls)}}
+
+    setattr(cls, 'projection', projection)
+    return cls
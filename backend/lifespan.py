@@ -6,13 +6,16 @@
 
 
 
-from asyncio import create_task
+from asyncio import create_task, gather
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from settings import settings
+
+from infrastructure.database import QueryPlanVerifier
 from infrastructure.dependency_injector import DependenciesContainer
-from infrastructure.tasks import consume_from_rabbitmq, process_messages
+from infrastructure.tasks import consume_from_rabbitmq, dispatch_messages, process_messages, run_profile_update_jobs
 
 
 @asynccontextmanager
@@ -23,21 +26,39 @@ async def lifespan(application: FastAPI):
             'infrastructure.handlers.chats',
             'infrastructure.handlers.messages',
             'infrastructure.tasks.consume_from_rabbitmq',
+            'infrastructure.tasks.dispatch_messages',
             'infrastructure.tasks.process_messages',
+            'infrastructure.tasks.run_profile_update_jobs',
         ]
     )
 
     database_manager = dependencies_container.database_manager()
     rabbitmq_manager = dependencies_container.rabbitmq_manager()
+    prefetch_controller = dependencies_container.prefetch_controller()
+    http_session_manager = dependencies_container.http_session_manager()
 
     await database_manager.start()
+
+    if settings.verify_query_plans_on_startup:
+        await QueryPlanVerifier(database_manager=database_manager).execute()
+
     await rabbitmq_manager.start()
+    await http_session_manager.start()
 
-    consumption_task = create_task(consume_from_rabbitmq())
-    processing_task = create_task(process_messages())
+    tasks = [
+        create_task(consume_from_rabbitmq()),
+        create_task(dispatch_messages()),
+        create_task(prefetch_controller.execute()),
+        create_task(run_profile_update_jobs()),
+        *[create_task(process_messages()) for _ in range(settings.processing_workers_count)],
+    ]
 
     try:
         yield
     finally:
-        await consumption_task.cancel()
-        await processing_task.cancel()
+        for task in tasks:
+            task.cancel()
+
+        await gather(*tasks, return_exceptions=True)
+
+        await http_session_manager.stop()
@@ -5,6 +5,9 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     #BASE
     messages_limit: int = 10
+    max_messages_limit: int = 100
+    chats_limit: int = 50
+    max_chats_limit: int = 200
     auth_backend_base_url: str = 'http://auth_backend:8000'
     default_datetime_format: str = '%Y-%m-%dT%H:%M:%S.%fZ'
     min_username_length: int = 4
@@ -18,19 +21,70 @@ class Settings(BaseSettings):
     mongo_database_name: str = Field(validation_alias='MONGO_DATABASE_NAME')
     messages_collection_name: str = 'messages'
     chats_collection_name: str = 'chats'
+    profile_update_jobs_collection_name: str = 'profile_update_jobs'
+    users_collection_name: str = 'users'
+    verify_query_plans_on_startup: bool = False
+    chats_stream_batch_size: int = 100
 
     #RABBITMQ
     rabbitmq_url: str = Field(validation_alias='RABBITMQ_URL')
     delivery_exchange_name: str = Field(validation_alias='DELIVERY_EXCHANGE_NAME')
     database_exchange_name: str = Field(validation_alias='DATABASE_EXCHANGE_NAME')
     database_queue_name: str = Field(validation_alias='DATABASE_QUEUE_NAME')
-    channel_prefetch_messages_count: int = 16
+    channel_prefetch_messages_count: int = 256
+    min_prefetch_messages_count: int = 16
+    max_prefetch_messages_count: int = 512
+    prefetch_adjustment_interval: float = 1
+    prefetch_target_latency_ms: int = 250
+    prefetch_latency_smoothing: float = 0.2
+    prefetch_increase_step: int = 32
+    prefetch_decrease_factor: float = 0.5
+    publisher_confirms_window: int = 256
+    publisher_confirm_timeout: float = 10
+    json_codec: str = 'orjson'
+
+    #PROCESSING
+    messages_batching_enabled: bool = True
+    messages_batch_size: int = 100
+    messages_batch_timeout_ms: int = 50
+    processing_workers_count: int = 4
+    processing_partitions_count: int = 64
+    message_max_delivery_attempts: int = 5
+    internal_queue_max_size: int = 512
+    internal_queue_high_water_mark: int = 384
+    internal_queue_low_water_mark: int = 128
+    last_message_snippet_length: int = 100
+
+    #PROFILE UPDATES
+    profile_update_chunk_size: int = 500
+    profile_update_chunks_per_second: float = 2
+    profile_update_lease_duration: float = 60
+    profile_update_poll_interval: float = 1
+    normalized_user_profiles_enabled: bool = False
+
+    #CACHE
+    chats_cache_max_size: int = 10000
+    chats_cache_ttl: int = 300
+    users_info_cache_max_size: int = 10000
+    users_info_cache_ttl: int = 30
+    user_profiles_cache_max_size: int = 10000
+    user_profiles_cache_ttl: int = 60
+    failed_deliveries_cache_max_size: int = 10000
+    failed_deliveries_cache_ttl: int = 3600
+
+    #HTTP
+    http_connections_limit: int = 100
+    http_connections_limit_per_host: int = 20
+    http_keepalive_timeout: float = 30
+    http_dns_cache_ttl: int = 300
+    http_request_timeout: float = 10
 
     #CORS
     cors_origins: list = ['http://localhost:3000']
 
     #METRICS
     opentelemetry_collector_url: str = Field(validation_alias='OPENTELEMETRY_COLLECTOR_URL')
+    tracing_sample_ratio: float = 0.01
 
     #LOGGING
     chats_logger_name: str = 'application.chats'
@@ -0,0 +1,25 @@
+from asyncio import run
+
+from infrastructure.database import DatabaseManager, QueryPlanVerifier
+
+
+async def verify_query_plans() -> None:
+    """
+    Create the required indexes and verify that none of the repositories
+    queries is planned as a collection scan.
+
+    Usage: python verify_query_plans.py
+
+    Raises:
+        QueryPlanException: Raisen if at least a single query is planned as a collection scan.
+    """
+    database_manager = DatabaseManager()
+
+    await database_manager.start()
+    await QueryPlanVerifier(database_manager=database_manager).execute()
+
+    print('All the queries are served by indexes.')
+
+
+if __name__ == '__main__':
+    run(verify_query_plans())